@@ -2,10 +2,11 @@
 Solana blockchain endpoints
 """
 from typing import Optional, Dict, List
-from pydantic import Field
+from pydantic import BaseModel, Field
 from app.api import app
 from app.services.solana import (
     get_solana_balance, 
+    get_solana_balances,
     get_account_info,
     get_block,
     get_block_commitment,
@@ -13,10 +14,18 @@ from app.services.solana import (
     get_block_production,
     get_blocks,
     get_blocks_with_limit,
+    is_slot_skipped,
+    get_skip_rate,
     get_block_time,
+    check_blockhash_validity,
     get_cluster_nodes,
+    find_cluster_nodes,
+    get_cluster_node_versions,
+    get_cluster_node_changes,
+    get_epoch_for_slot,
     get_epoch_info,
     get_epoch_schedule,
+    get_epoch_slot_range,
     get_fee_for_message,
     get_first_available_block,
     get_genesis_hash,
@@ -29,14 +38,33 @@ from app.services.solana import (
     get_largest_accounts,
     get_latest_blockhash,
     get_leader_schedule,
+    get_slot_leaders,
     get_max_retransmit_slot,
     get_max_shred_insert_slot,
     get_minimum_balance_for_rent_exemption,
     get_multiple_accounts,
     get_program_accounts,
     get_recent_performance_samples,
-    get_recent_prioritization_fees
+    get_recent_prioritization_fees,
+    get_rent_exempt_minimums,
+    get_rpc_stats,
+    scan_blocks,
+    stream_program_accounts
 )
+from app.services.streaming import (
+    ACCOUNT_FIELDS,
+    BLOCK_FIELDS,
+    AggregateSink,
+    BlockAggregateSink,
+    FileSink,
+    ResponseSink,
+    account_predicate,
+    project_block,
+    is_failed_transaction,
+    unknown_fields,
+    untouched_by
+)
+from app.services.nodes import NODE_FIELDS
 from app.models.solana import (
     SolanaBalanceResponse, 
     SolanaAccountInfoResponse,
@@ -66,17 +94,31 @@ from app.models.solana import (
     SolanaMinimumBalanceForRentExemptionResponse,
     SolanaMultipleAccountsResponse,
     SolanaProgramAccountsResponse,
+    SolanaProgramAccountsStreamResponse,
+    SolanaBlockScanResponse,
     SolanaRecentPerformanceSamplesResponse,
-    SolanaRecentPrioritizationFeesResponse
+    SolanaRecentPrioritizationFeesResponse,
+    SolanaRpcStatsResponse
 )
 
 
+def _json_text(response: BaseModel) -> str:
+    """
+    Serialize a large response to JSON text with the model's compiled serializer
+
+    FastMCP sends text results as they are. A dict result is first converted to
+    plain Python objects and then encoded again with json.dumps, which costs
+    several times more than this for big blocks, slot lists and account lists.
+    """
+    return response.model_dump_json(exclude_none=True)
+
+
 @app.tool(
     name="get_solana_balance",
     description="Get the SOL balance for a Solana wallet address.",
     tags={"solana", "balance", "crypto"}
 )
-def get_solana_balance_endpoint(
+async def get_solana_balance_endpoint(
     address: str = Field(description="The Solana wallet address to check")
 ) -> dict:
     """
@@ -85,8 +127,35 @@ def get_solana_balance_endpoint(
     This tool will query the Solana blockchain via RPC to retrieve the current
     balance of the specified wallet address.
     """
-    response = get_solana_balance(address)
-    return response.dict(exclude_none=True)
+    response = await get_solana_balance(address)
+    return response.model_dump(exclude_none=True)
+
+
+@app.tool(
+    name="get_solana_balances",
+    description="Get the SOL balances of any number of Solana addresses in one call.",
+    tags={"solana", "balance", "crypto"}
+)
+async def get_solana_balances_endpoint(
+    addresses: List[str] = Field(description="The Solana wallet addresses to check"),
+    commitment: Optional[str] = Field(
+        default=None,
+        description="The level of commitment (processed, confirmed, finalized)"
+    ),
+    min_context_slot: Optional[int] = Field(
+        default=None,
+        description="Lowest slot the balances may be read at"
+    )
+) -> dict:
+    """
+    Get the balances of many Solana addresses at once.
+    
+    Balances are read with getMultipleAccounts in concurrent chunks of 100
+    addresses and a zero-length data slice, so no account data is transferred.
+    Use this instead of calling get_solana_balance for each address.
+    """
+    response = await get_solana_balances(addresses, commitment, min_context_slot)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -94,7 +163,7 @@ def get_solana_balance_endpoint(
     description="Get all information associated with a Solana account by its address.",
     tags={"solana", "account", "crypto"}
 )
-def get_account_info_endpoint(
+async def get_account_info_endpoint(
     address: str = Field(description="The Solana account address to query, as base-58 encoded string"),
     encoding: str = Field(
         default="base58", 
@@ -123,8 +192,8 @@ def get_account_info_endpoint(
     if data_slice_offset is not None and data_slice_length is not None:
         data_slice = {"offset": data_slice_offset, "length": data_slice_length}
     
-    response = get_account_info(address, encoding, data_slice)
-    return response.dict(exclude_none=True)
+    response = await get_account_info(address, encoding, data_slice)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -132,7 +201,7 @@ def get_account_info_endpoint(
     description="Get information about a confirmed block by slot number.",
     tags={"solana", "block", "crypto"}
 )
-def get_block_endpoint(
+async def get_block_endpoint(
     slot: int = Field(description="The slot of the block to query"),
     encoding: str = Field(
         default="json", 
@@ -149,8 +218,20 @@ def get_block_endpoint(
     max_supported_transaction_version: Optional[int] = Field(
         default=None, 
         description="Filter for max transaction version"
+    ),
+    exclude_votes: bool = Field(
+        default=False,
+        description="Drop validator vote transactions (most of a typical block)"
+    ),
+    exclude_failed: bool = Field(
+        default=False,
+        description="Drop transactions that failed"
+    ),
+    program_ids: Optional[List[str]] = Field(
+        default=None,
+        description="Keep only transactions involving at least one of these program IDs or accounts"
     )
-) -> dict:
+) -> str:
     """
     Get information about a confirmed block.
     
@@ -159,15 +240,25 @@ def get_block_endpoint(
     
     Use 'accounts' for transaction_details to get a faster response with account balance changes.
     Set rewards to False if you don't need validator rewards information.
+    Set exclude_votes to drop vote transactions while the block is streamed,
+    before they are parsed into the response.
     """
-    response = get_block(
+    exclude = []
+    if exclude_failed:
+        exclude.append(is_failed_transaction)
+    if program_ids:
+        exclude.append(untouched_by(program_ids))
+
+    response = await get_block(
         slot, 
         encoding, 
         transaction_details, 
         rewards, 
-        max_supported_transaction_version
+        max_supported_transaction_version,
+        exclude_votes=exclude_votes,
+        exclude=exclude
     )
-    return response.dict(exclude_none=True)
+    return _json_text(response)
 
 
 @app.tool(
@@ -175,7 +266,7 @@ def get_block_endpoint(
     description="Get commitment (confirmation status) information for a block.",
     tags={"solana", "block", "crypto"}
 )
-def get_block_commitment_endpoint(
+async def get_block_commitment_endpoint(
     slot: int = Field(description="The slot to query commitment information for")
 ) -> dict:
     """
@@ -184,8 +275,8 @@ def get_block_commitment_endpoint(
     This tool queries the Solana blockchain via RPC to retrieve information about
     how much stake has voted for a block at the specified slot.
     """
-    response = get_block_commitment(slot)
-    return response.dict(exclude_none=True)
+    response = await get_block_commitment(slot)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -193,7 +284,7 @@ def get_block_commitment_endpoint(
     description="Get the current block height of the Solana node.",
     tags={"solana", "block", "crypto"}
 )
-def get_block_height_endpoint(
+async def get_block_height_endpoint(
     commitment: Optional[str] = Field(
         default=None, 
         description="The level of commitment (processed, confirmed, finalized)"
@@ -210,8 +301,8 @@ def get_block_height_endpoint(
     - 'confirmed': The block has received a supermajority of votes
     - 'finalized': The block has been confirmed as final and won't be rolled back (slowest, most certain)
     """
-    response = get_block_height(commitment)
-    return response.dict(exclude_none=True)
+    response = await get_block_height(commitment)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -219,7 +310,7 @@ def get_block_height_endpoint(
     description="Get recent block production information from the Solana network.",
     tags={"solana", "block", "crypto", "validator"}
 )
-def get_block_production_endpoint(
+async def get_block_production_endpoint(
     identity: Optional[str] = Field(
         default=None, 
         description="Only return results for this validator identity (base-58 encoded)"
@@ -247,8 +338,8 @@ def get_block_production_endpoint(
     You can filter results to a specific validator identity, specify a range of slots,
     and choose the commitment level for confirmation status.
     """
-    response = get_block_production(identity, first_slot, last_slot, commitment)
-    return response.dict(exclude_none=True)
+    response = await get_block_production(identity, first_slot, last_slot, commitment)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -256,7 +347,7 @@ def get_block_production_endpoint(
     description="Get a list of confirmed blocks between two slots.",
     tags={"solana", "block", "crypto"}
 )
-def get_blocks_endpoint(
+async def get_blocks_endpoint(
     start_slot: int = Field(description="Start slot (inclusive)"),
     end_slot: Optional[int] = Field(
         default=None, 
@@ -265,19 +356,27 @@ def get_blocks_endpoint(
     commitment: Optional[str] = Field(
         default=None, 
         description="The level of commitment (processed, confirmed, finalized)"
+    ),
+    compact: bool = Field(
+        default=False,
+        description="Return runs of consecutive blocks and the skipped slots between them instead of every slot"
     )
-) -> dict:
+) -> str:
     """
     Get a list of confirmed blocks between two slots.
     
     This tool queries the Solana blockchain via RPC to retrieve a list of confirmed
-    blocks between the specified start and end slots.
+    blocks between the specified start and end slots. Spans longer than the RPC
+    limit of 500,000 slots are split into ranges that are fetched in parallel.
+    Finalized slots are kept in a local index, so ranges that have been asked
+    for before are answered without RPC calls.
     
     Note that not every slot produces a block, so there may be gaps in the sequence
-    of block numbers returned.
+    of block numbers returned. For long ranges, compact output describes the
+    blocks as runs and skipped slots, which is far smaller than the full list.
     """
-    response = get_blocks(start_slot, end_slot, commitment)
-    return response.dict(exclude_none=True)
+    response = await get_blocks(start_slot, end_slot, commitment, compact)
+    return _json_text(response)
 
 
 @app.tool(
@@ -285,27 +384,75 @@ def get_blocks_endpoint(
     description="Get a list of confirmed blocks starting at a slot with a limit.",
     tags={"solana", "block", "crypto"}
 )
-def get_blocks_with_limit_endpoint(
+async def get_blocks_with_limit_endpoint(
     start_slot: int = Field(description="Start slot (inclusive)"),
     limit: int = Field(
-        description="Maximum number of blocks to return (must be no more than 500,000)"
+        description="Maximum number of blocks to return"
     ),
     commitment: Optional[str] = Field(
         default=None, 
         description="The level of commitment (processed, confirmed, finalized)"
+    ),
+    compact: bool = Field(
+        default=False,
+        description="Return runs of consecutive blocks and the skipped slots between them instead of every slot"
     )
-) -> dict:
+) -> str:
     """
     Get a list of confirmed blocks starting at a slot with a limit.
     
     This tool queries the Solana blockchain via RPC to retrieve a list of confirmed
-    blocks starting at the specified slot, up to the specified limit.
+    blocks starting at the specified slot, up to the specified limit. Limits
+    above the RPC maximum of 500,000 are served from slot ranges fetched in parallel.
+    Blocks held in the local index of finalized slots are answered without RPC calls.
     
     Note that not every slot produces a block, so there may be gaps in the sequence
     of block numbers returned.
     """
-    response = get_blocks_with_limit(start_slot, limit, commitment)
-    return response.dict(exclude_none=True)
+    response = await get_blocks_with_limit(start_slot, limit, commitment, compact)
+    return _json_text(response)
+
+
+@app.tool(
+    name="is_slot_skipped",
+    description="Check whether a finalized slot was skipped (has no block).",
+    tags={"solana", "block", "crypto"}
+)
+async def is_slot_skipped_endpoint(
+    slot: int = Field(description="The slot to check")
+) -> dict:
+    """
+    Check whether a finalized slot was skipped.
+    
+    This tool answers from a local index of finalized slots; slots that are not
+    indexed yet are resolved with one getBlocks call and kept for later lookups.
+    Slots that are not finalized yet have no answer.
+    """
+    response = await is_slot_skipped(slot)
+    return response.model_dump(exclude_none=True)
+
+
+@app.tool(
+    name="get_skip_rate",
+    description="Count the blocks and skipped slots of a finalized slot range.",
+    tags={"solana", "block", "crypto"}
+)
+async def get_skip_rate_endpoint(
+    start_slot: int = Field(description="Start slot (inclusive)"),
+    end_slot: Optional[int] = Field(
+        default=None,
+        description="End slot (inclusive), if not provided, the finalized slot will be used"
+    )
+) -> dict:
+    """
+    Count the blocks and skipped slots of a finalized slot range.
+    
+    This tool counts from a local index of finalized slots, fetching only the
+    parts of the range that are not indexed yet. Ranges that reach past the
+    finalized slot are counted up to it.
+    """
+    response = await get_skip_rate(start_slot, end_slot)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -313,7 +460,7 @@ def get_blocks_with_limit_endpoint(
     description="Get the estimated production time of a block.",
     tags={"solana", "block", "crypto"}
 )
-def get_block_time_endpoint(
+async def get_block_time_endpoint(
     slot: int = Field(description="The slot of the block to get the time for")
 ) -> dict:
     """
@@ -325,8 +472,8 @@ def get_block_time_endpoint(
     
     Returns null if the block is not available or not yet confirmed.
     """
-    response = get_block_time(slot)
-    return response.dict(exclude_none=True)
+    response = await get_block_time(slot)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -334,7 +481,7 @@ def get_block_time_endpoint(
     description="Get information about the nodes in the Solana cluster.",
     tags={"solana", "network", "validator", "crypto"}
 )
-def get_cluster_nodes_endpoint() -> dict:
+async def get_cluster_nodes_endpoint() -> str:
     """
     Get information about all the nodes participating in the cluster.
     
@@ -342,8 +489,70 @@ def get_cluster_nodes_endpoint() -> dict:
     the nodes in the cluster, including their public keys, gossip and RPC addresses,
     and software versions.
     """
-    response = get_cluster_nodes()
-    return response.dict(exclude_none=True)
+    response = await get_cluster_nodes()
+    return _json_text(response)
+
+
+@app.tool(
+    name="find_cluster_nodes",
+    description="Look up cluster nodes by pubkey, software version or feature set, returning only the requested fields",
+    tags={"solana", "network", "validator", "crypto"}
+)
+async def find_cluster_nodes_endpoint(
+    pubkeys: Optional[List[str]] = Field(default=None, description="Only nodes with these public keys, as base-58 encoded strings"),
+    version: Optional[str] = Field(default=None, description="Only nodes running this software version"),
+    feature_set: Optional[int] = Field(default=None, description="Only nodes with this feature set identifier"),
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=f"Node fields to return besides pubkey ({', '.join(NODE_FIELDS)}); all fields if omitted"
+    ),
+    limit: int = Field(default=100, description="Maximum number of nodes to return")
+) -> dict:
+    """
+    Look up nodes in the cached cluster node directory.
+
+    The directory is indexed by pubkey, version and feature set and refreshed
+    in the background, so looking up one validator's RPC or TPU address does
+    not fetch or return the whole node list.
+    """
+    response = await find_cluster_nodes(pubkeys, version, feature_set, fields, limit)
+    return response.model_dump(exclude_none=True)
+
+
+@app.tool(
+    name="get_cluster_node_versions",
+    description="Count the nodes in the Solana cluster per software version or feature set",
+    tags={"solana", "network", "validator", "crypto"}
+)
+async def get_cluster_node_versions_endpoint(
+    group_by: str = Field(default="version", description="Group nodes by version or featureSet")
+) -> dict:
+    """
+    Count the nodes in the cluster per software version or feature set.
+
+    The counts are read from the indexes of the cached node directory.
+    """
+    response = await get_cluster_node_versions(group_by)
+    return response.model_dump(exclude_none=True)
+
+
+@app.tool(
+    name="get_cluster_node_changes",
+    description="Get the cluster nodes that joined, left or changed since a revision of the node directory",
+    tags={"solana", "network", "validator", "crypto"}
+)
+async def get_cluster_node_changes_endpoint(
+    since_revision: int = Field(default=0, description="Revision returned by an earlier call; 0 returns the full directory")
+) -> dict:
+    """
+    Get only the changes to the cluster node directory since a revision.
+
+    Pass the returned revision to the next call to keep a copy of the node
+    list up to date. If the revision is no longer kept, the full directory is
+    returned with resync set.
+    """
+    response = await get_cluster_node_changes(since_revision)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -351,7 +560,7 @@ def get_cluster_nodes_endpoint() -> dict:
     description="Get information about the current epoch.",
     tags={"solana", "epoch", "crypto"}
 )
-def get_epoch_info_endpoint(
+async def get_epoch_info_endpoint(
     commitment: Optional[str] = Field(
         default=None, 
         description="The level of commitment (processed, confirmed, finalized)"
@@ -365,8 +574,8 @@ def get_epoch_info_endpoint(
     
     You can specify the commitment level to determine the confirmation status of the data.
     """
-    response = get_epoch_info(commitment)
-    return response.dict(exclude_none=True)
+    response = await get_epoch_info(commitment)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -374,7 +583,7 @@ def get_epoch_info_endpoint(
     description="Get epoch schedule information from the Solana cluster.",
     tags={"solana", "epoch", "crypto"}
 )
-def get_epoch_schedule_endpoint() -> dict:
+async def get_epoch_schedule_endpoint() -> dict:
     """
     Get epoch schedule information from the Solana cluster.
     
@@ -382,8 +591,46 @@ def get_epoch_schedule_endpoint() -> dict:
     the epoch schedule, including the number of slots in each epoch and other
     schedule-related parameters.
     """
-    response = get_epoch_schedule()
-    return response.dict(exclude_none=True)
+    response = await get_epoch_schedule()
+    return response.model_dump(exclude_none=True)
+
+
+@app.tool(
+    name="get_epoch_for_slot",
+    description="Convert a slot to its epoch and its index within the epoch, computed locally from the epoch schedule.",
+    tags={"solana", "epoch", "crypto"}
+)
+async def get_epoch_for_slot_endpoint(
+    slot: int = Field(description="The slot to convert")
+) -> dict:
+    """
+    Convert a slot to its epoch and its index within the epoch.
+
+    The conversion is computed locally from the cluster's epoch schedule,
+    which is fetched once, so no per-call RPC request is needed. Warmup epochs
+    are handled.
+    """
+    response = await get_epoch_for_slot(slot)
+    return response.model_dump(exclude_none=True)
+
+
+@app.tool(
+    name="get_epoch_slot_range",
+    description="Get the first and last slot of an epoch, computed locally from the epoch schedule.",
+    tags={"solana", "epoch", "crypto"}
+)
+async def get_epoch_slot_range_endpoint(
+    epoch: int = Field(description="The epoch to convert")
+) -> dict:
+    """
+    Get the first and last slot of an epoch and its number of slots.
+
+    The range is computed locally from the cluster's epoch schedule, which is
+    fetched once, so no per-call RPC request is needed. Warmup epochs are
+    handled.
+    """
+    response = await get_epoch_slot_range(epoch)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -391,7 +638,7 @@ def get_epoch_schedule_endpoint() -> dict:
     description="Get the fee in lamports for a message.",
     tags={"solana", "fee", "transaction", "crypto"}
 )
-def get_fee_for_message_endpoint(
+async def get_fee_for_message_endpoint(
     message: str = Field(description="Base-64 encoded message to get the fee for"),
     commitment: Optional[str] = Field(
         default=None, 
@@ -409,8 +656,8 @@ def get_fee_for_message_endpoint(
     
     Returns null if the blockhash in the message has expired or is invalid.
     """
-    response = get_fee_for_message(message, commitment)
-    return response.dict(exclude_none=True)
+    response = await get_fee_for_message(message, commitment)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -418,7 +665,7 @@ def get_fee_for_message_endpoint(
     description="Get the first available block in the Solana ledger.",
     tags={"solana", "block", "crypto"}
 )
-def get_first_available_block_endpoint() -> dict:
+async def get_first_available_block_endpoint() -> dict:
     """
     Get the first available block in the Solana ledger.
     
@@ -426,8 +673,8 @@ def get_first_available_block_endpoint() -> dict:
     of the first available block in the ledger. This can be useful for determining
     the earliest point from which historical data can be retrieved.
     """
-    response = get_first_available_block()
-    return response.dict(exclude_none=True)
+    response = await get_first_available_block()
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -435,7 +682,7 @@ def get_first_available_block_endpoint() -> dict:
     description="Get the genesis hash of the Solana cluster.",
     tags={"solana", "genesis", "crypto"}
 )
-def get_genesis_hash_endpoint() -> dict:
+async def get_genesis_hash_endpoint() -> dict:
     """
     Get the genesis hash of the Solana cluster.
     
@@ -445,8 +692,8 @@ def get_genesis_hash_endpoint() -> dict:
     
     This can be useful for verifying that you are connected to the expected network.
     """
-    response = get_genesis_hash()
-    return response.dict(exclude_none=True)
+    response = await get_genesis_hash()
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -454,7 +701,7 @@ def get_genesis_hash_endpoint() -> dict:
     description="Check the health of the connected Solana node.",
     tags={"solana", "health", "network", "crypto"}
 )
-def get_health_endpoint() -> dict:
+async def get_health_endpoint() -> dict:
     """
     Check the health of the connected Solana node.
     
@@ -465,8 +712,8 @@ def get_health_endpoint() -> dict:
     Returns a boolean indicating whether the node is healthy, and a message if the
     node is unhealthy.
     """
-    response = get_health()
-    return response.dict(exclude_none=True)
+    response = await get_health()
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -474,7 +721,7 @@ def get_health_endpoint() -> dict:
     description="Get the highest snapshot slots available on the Solana node.",
     tags={"solana", "snapshot", "block", "crypto"}
 )
-def get_highest_snapshot_slot_endpoint() -> dict:
+async def get_highest_snapshot_slot_endpoint() -> dict:
     """
     Get the highest snapshot slots available on the Solana node.
     
@@ -484,8 +731,8 @@ def get_highest_snapshot_slot_endpoint() -> dict:
     
     Returns information about both full and incremental snapshots.
     """
-    response = get_highest_snapshot_slot()
-    return response.dict(exclude_none=True)
+    response = await get_highest_snapshot_slot()
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -493,7 +740,7 @@ def get_highest_snapshot_slot_endpoint() -> dict:
     description="Get the identity public key of the current Solana node.",
     tags={"solana", "node", "identity", "crypto"}
 )
-def get_identity_endpoint() -> dict:
+async def get_identity_endpoint() -> dict:
     """
     Get the identity public key of the current Solana node.
     
@@ -501,8 +748,8 @@ def get_identity_endpoint() -> dict:
     public key of the node you are connected to. This is useful for verifying
     which validator you are communicating with.
     """
-    response = get_identity()
-    return response.dict(exclude_none=True)
+    response = await get_identity()
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -510,7 +757,7 @@ def get_identity_endpoint() -> dict:
     description="Get the inflation governor parameters from the Solana cluster.",
     tags={"solana", "inflation", "economics", "crypto"}
 )
-def get_inflation_governor_endpoint(
+async def get_inflation_governor_endpoint(
     commitment: Optional[str] = Field(
         default=None, 
         description="The level of commitment (processed, confirmed, finalized)"
@@ -525,8 +772,8 @@ def get_inflation_governor_endpoint(
     These parameters include the initial inflation rate, terminal inflation rate,
     rate of inflation reduction (taper), foundation inflation rate, and foundation term.
     """
-    response = get_inflation_governor(commitment)
-    return response.dict(exclude_none=True)
+    response = await get_inflation_governor(commitment)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -534,7 +781,7 @@ def get_inflation_governor_endpoint(
     description="Get the current inflation rate of the Solana network.",
     tags={"solana", "inflation", "economics", "crypto"}
 )
-def get_inflation_rate_endpoint() -> dict:
+async def get_inflation_rate_endpoint() -> dict:
     """
     Get the current inflation rate of the Solana network.
     
@@ -544,8 +791,8 @@ def get_inflation_rate_endpoint() -> dict:
     
     This is useful for understanding the current tokenomics of the Solana network.
     """
-    response = get_inflation_rate()
-    return response.dict(exclude_none=True)
+    response = await get_inflation_rate()
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -553,7 +800,7 @@ def get_inflation_rate_endpoint() -> dict:
     description="Get inflation rewards for a list of Solana accounts.",
     tags={"solana", "inflation", "rewards", "staking", "crypto"}
 )
-def get_inflation_reward_endpoint(
+async def get_inflation_reward_endpoint(
     addresses: List[str] = Field(description="List of account addresses to query rewards for"),
     epoch: Optional[int] = Field(
         default=None, 
@@ -579,8 +826,8 @@ def get_inflation_reward_endpoint(
     
     Returns null for addresses that are not found or did not receive rewards.
     """
-    response = get_inflation_reward(addresses, epoch, commitment)
-    return response.dict(exclude_none=True)
+    response = await get_inflation_reward(addresses, epoch, commitment)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -588,7 +835,7 @@ def get_inflation_reward_endpoint(
     description="Get the largest accounts on the Solana network.",
     tags={"solana", "accounts", "balance", "crypto"}
 )
-def get_largest_accounts_endpoint(
+async def get_largest_accounts_endpoint(
     filter_opt: Optional[str] = Field(
         default=None, 
         description="Filter by account type: 'circulating' or 'nonCirculating'"
@@ -607,8 +854,8 @@ def get_largest_accounts_endpoint(
     
     This is useful for analyzing wealth distribution on the Solana network.
     """
-    response = get_largest_accounts(filter_opt, commitment)
-    return response.dict(exclude_none=True)
+    response = await get_largest_accounts(filter_opt, commitment)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -616,7 +863,7 @@ def get_largest_accounts_endpoint(
     description="Get the latest blockhash",
     tags={"solana", "block", "crypto"}
 )
-def get_latest_blockhash_endpoint(
+async def get_latest_blockhash_endpoint(
     commitment: Optional[str] = Field(
         default=None, 
         description="The level of commitment (processed, confirmed, finalized)"
@@ -625,8 +872,28 @@ def get_latest_blockhash_endpoint(
     """
     Get the latest blockhash
     """
-    response = get_latest_blockhash(commitment)
-    return response.dict(exclude_none=True)
+    response = await get_latest_blockhash(commitment)
+    return response.model_dump(exclude_none=True)
+
+
+@app.tool(
+    name="check_blockhash_validity",
+    description="Check whether a blockhash returned by get_latest_blockhash can still be used, without an RPC request",
+    tags={"solana", "block", "transaction", "crypto"}
+)
+async def check_blockhash_validity_endpoint(
+    blockhash: str = Field(description="The blockhash to check, as base-58 encoded string")
+) -> dict:
+    """
+    Check whether a blockhash can still be used in a transaction.
+
+    The blockhash's lastValidBlockHeight is compared against a locally tracked
+    estimate of the current block height, so no RPC request is made. The
+    estimate runs slightly ahead of the real height, so a blockhash is
+    reported expired early rather than late.
+    """
+    response = await check_blockhash_validity(blockhash)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -634,7 +901,7 @@ def get_latest_blockhash_endpoint(
     description="Get the leader schedule for the current or a specific epoch",
     tags={"solana", "block", "crypto"}
 )
-def get_leader_schedule_endpoint(
+async def get_leader_schedule_endpoint(
     slot: Optional[int] = Field(
         default=None, 
         description="Slot to get leader schedule for (defaults to current slot)"
@@ -647,12 +914,41 @@ def get_leader_schedule_endpoint(
         default=None, 
         description="The level of commitment (processed, confirmed, finalized)"
     )
-) -> dict:
+) -> str:
     """
     Get the leader schedule for the current or a specific epoch
     """
-    response = get_leader_schedule(slot, identity, commitment)
-    return response.dict(exclude_none=True)
+    response = await get_leader_schedule(slot, identity, commitment)
+    return _json_text(response)
+
+
+@app.tool(
+    name="get_slot_leaders",
+    description="Get the leaders of the current or given slot and the slots after it",
+    tags={"solana", "block", "crypto"}
+)
+async def get_slot_leaders_endpoint(
+    start_slot: Optional[int] = Field(
+        default=None,
+        description="First slot to look up (defaults to the current slot)"
+    ),
+    limit: int = Field(
+        default=1,
+        description="Number of consecutive slots to look up (at most 5000)"
+    ),
+    commitment: Optional[str] = Field(
+        default=None,
+        description="The level of commitment used to get the current slot (processed, confirmed, finalized)"
+    )
+) -> dict:
+    """
+    Get the leaders of the current or given slot and the slots after it
+
+    Leaders are looked up in the leader schedule, which is fetched once per
+    epoch and kept indexed by slot, so repeated lookups need no RPC calls.
+    """
+    response = await get_slot_leaders(start_slot, limit, commitment)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -660,12 +956,12 @@ def get_leader_schedule_endpoint(
     description="Get the max slot that has been retransmitted by the node",
     tags={"solana", "block", "crypto"}
 )
-def get_max_retransmit_slot_endpoint() -> dict:
+async def get_max_retransmit_slot_endpoint() -> dict:
     """
     Get the max slot that has been retransmitted by the node
     """
-    response = get_max_retransmit_slot()
-    return response.dict(exclude_none=True)
+    response = await get_max_retransmit_slot()
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -673,12 +969,12 @@ def get_max_retransmit_slot_endpoint() -> dict:
     description="Get the highest slot where shreds have been inserted by the node",
     tags={"solana", "block", "crypto"}
 )
-def get_max_shred_insert_slot_endpoint() -> dict:
+async def get_max_shred_insert_slot_endpoint() -> dict:
     """
     Get the highest slot where shreds have been inserted by the node
     """
-    response = get_max_shred_insert_slot()
-    return response.dict(exclude_none=True)
+    response = await get_max_shred_insert_slot()
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -686,7 +982,7 @@ def get_max_shred_insert_slot_endpoint() -> dict:
     description="Get the minimum balance required for rent exemption for a data size",
     tags={"solana", "block", "crypto"}
 )
-def get_minimum_balance_for_rent_exemption_endpoint(
+async def get_minimum_balance_for_rent_exemption_endpoint(
     data_size: int = Field(description="Size of data in bytes"),
     commitment: Optional[str] = Field(
         default=None, 
@@ -695,18 +991,38 @@ def get_minimum_balance_for_rent_exemption_endpoint(
 ) -> dict:
     """
     Get the minimum balance required for rent exemption for a data size
+
+    The minimum is computed locally from the cached Rent sysvar parameters.
     """
-    response = get_minimum_balance_for_rent_exemption(data_size, commitment)
-    return response.dict(exclude_none=True)
+    response = await get_minimum_balance_for_rent_exemption(data_size, commitment)
+    return response.model_dump(exclude_none=True)
+
+
+@app.tool(
+    name="get_rent_exempt_minimums",
+    description="Get the minimum balance required for rent exemption for many data sizes at once",
+    tags={"solana", "account", "crypto"}
+)
+async def get_rent_exempt_minimums_endpoint(
+    data_sizes: List[int] = Field(description="Sizes of account data in bytes")
+) -> dict:
+    """
+    Get the minimum balance required for rent exemption for many data sizes at once
+
+    The Rent sysvar is read once per epoch and every minimum is computed
+    locally, so any number of sizes costs at most one RPC request.
+    """
+    response = await get_rent_exempt_minimums(data_sizes)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
     name="get_multiple_accounts",
-    description="Get information for multiple Solana accounts at once.",
+    description="Get information for any number of Solana accounts at once.",
     tags={"solana", "account", "crypto"}
 )
-def get_multiple_accounts_endpoint(
-    addresses: List[str] = Field(description="List of account addresses to query (max 100)"),
+async def get_multiple_accounts_endpoint(
+    addresses: List[str] = Field(description="List of account addresses to query; lists longer than 100 are fetched in parallel chunks"),
     encoding: str = Field(
         default="base58", 
         description="Encoding format for Account data (base58, base64, base64+zstd, jsonParsed)"
@@ -722,13 +1038,20 @@ def get_multiple_accounts_endpoint(
     commitment: Optional[str] = Field(
         default=None, 
         description="The level of commitment (processed, confirmed, finalized)"
+    ),
+    min_context_slot: Optional[int] = Field(
+        default=None,
+        description="Lowest slot the accounts may be read at; defaults to the slot the first chunk is answered at"
     )
-) -> dict:
+) -> str:
     """
     Get information for multiple accounts at once.
     
     This tool queries the Solana blockchain via RPC to retrieve detailed account information
-    for multiple accounts in a single request, which is more efficient than multiple individual calls.
+    for multiple accounts, which is more efficient than multiple individual calls.
+    Lists of any length are split into chunks of 100 addresses that are fetched
+    concurrently, all pinned to the same minimum context slot; the range of slots
+    the chunks were answered at is returned as contextSlotRange.
     
     For token accounts, program accounts, and other specialized account types, 
     use 'jsonParsed' encoding to receive structured data.
@@ -738,8 +1061,8 @@ def get_multiple_accounts_endpoint(
     if data_slice_offset is not None and data_slice_length is not None:
         data_slice = {"offset": data_slice_offset, "length": data_slice_length}
     
-    response = get_multiple_accounts(addresses, encoding, data_slice, commitment)
-    return response.dict(exclude_none=True)
+    response = await get_multiple_accounts(addresses, encoding, data_slice, commitment, min_context_slot)
+    return _json_text(response)
 
 
 @app.tool(
@@ -747,7 +1070,7 @@ def get_multiple_accounts_endpoint(
     description="Get all accounts owned by a specific Solana program.",
     tags={"solana", "program", "account", "crypto"}
 )
-def get_program_accounts_endpoint(
+async def get_program_accounts_endpoint(
     program_id: str = Field(description="Program ID to query accounts for, as base-58 encoded string"),
     encoding: str = Field(
         default="base58", 
@@ -773,7 +1096,7 @@ def get_program_accounts_endpoint(
         default=None, 
         description="The level of commitment (processed, confirmed, finalized)"
     )
-) -> dict:
+) -> str:
     """
     Get all accounts owned by a specific program.
     
@@ -788,8 +1111,194 @@ def get_program_accounts_endpoint(
     if data_slice_offset is not None and data_slice_length is not None:
         data_slice = {"offset": data_slice_offset, "length": data_slice_length}
     
-    response = get_program_accounts(program_id, encoding, data_slice, filters, with_context, commitment)
-    return response.dict(exclude_none=True)
+    response = await get_program_accounts(program_id, encoding, data_slice, filters, with_context, commitment)
+    return _json_text(response)
+
+
+@app.tool(
+    name="stream_program_accounts",
+    description="Scan all accounts owned by a Solana program with bounded memory, filtering and projecting each account as it arrives.",
+    tags={"solana", "program", "account", "crypto"}
+)
+async def stream_program_accounts_endpoint(
+    program_id: str = Field(description="Program ID to query accounts for, as base-58 encoded string"),
+    sink: str = Field(
+        default="response",
+        description="Where matching accounts go: response (returned, up to limit), file (JSON Lines in the export directory) or aggregate (totals only)"
+    ),
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=f"Account fields to keep ({', '.join(ACCOUNT_FIELDS)}); all fields if omitted"
+    ),
+    min_lamports: Optional[int] = Field(default=None, description="Keep only accounts holding at least this many lamports"),
+    max_lamports: Optional[int] = Field(default=None, description="Keep only accounts holding at most this many lamports"),
+    limit: int = Field(default=100, description="Maximum number of accounts returned by the response sink"),
+    output_file: Optional[str] = Field(default=None, description="File name for the file sink"),
+    encoding: str = Field(
+        default="base64",
+        description="Encoding format for Account data (base58, base64, base64+zstd, jsonParsed)"
+    ),
+    data_slice_offset: Optional[int] = Field(
+        default=None,
+        description="Byte offset to start reading account data (only for base58, base64, or base64+zstd encodings)"
+    ),
+    data_slice_length: Optional[int] = Field(
+        default=None,
+        description="Number of bytes to return (only for base58, base64, or base64+zstd encodings)"
+    ),
+    filters: Optional[List[Dict]] = Field(
+        default=None,
+        description="Optional filters applied by the RPC node (memcmp or dataSize filters)"
+    ),
+    commitment: Optional[str] = Field(
+        default=None,
+        description="The level of commitment (processed, confirmed, finalized)"
+    )
+) -> dict:
+    """
+    Scan all accounts owned by a program without loading them all into memory.
+
+    The RPC response is parsed one account at a time. Each account is checked
+    against the lamport filter, reduced to the requested fields and handed to
+    the chosen sink, so programs with millions of accounts (such as SPL Token)
+    can be scanned, exported to a file or summarized.
+    """
+    message = unknown_fields(fields, ACCOUNT_FIELDS, "account")
+    if message:
+        return SolanaProgramAccountsStreamResponse(
+            status="error",
+            message=message
+        ).model_dump(exclude_none=True)
+
+    if sink == "response":
+        target = ResponseSink(limit, fields)
+    elif sink == "file":
+        if not output_file:
+            return SolanaProgramAccountsStreamResponse(
+                status="error",
+                message="output_file is required for the file sink"
+            ).model_dump(exclude_none=True)
+        target = FileSink(output_file, fields)
+    elif sink == "aggregate":
+        target = AggregateSink()
+    else:
+        return SolanaProgramAccountsStreamResponse(
+            status="error",
+            message=f"Unknown sink: {sink} (expected response, file or aggregate)"
+        ).model_dump(exclude_none=True)
+
+    data_slice = None
+    if data_slice_offset is not None and data_slice_length is not None:
+        data_slice = {"offset": data_slice_offset, "length": data_slice_length}
+
+    response = await stream_program_accounts(
+        program_id,
+        target,
+        encoding=encoding,
+        data_slice=data_slice,
+        filters=filters,
+        commitment=commitment,
+        predicate=account_predicate(min_lamports, max_lamports)
+    )
+    return response.model_dump(exclude_none=True)
+
+
+# Fields returned by the response sink of scan_blocks when none are requested
+BLOCK_SUMMARY_FIELDS = ["slot", "blockhash", "parentSlot", "blockTime", "blockHeight", "transactionCount"]
+
+
+@app.tool(
+    name="scan_blocks",
+    description="Fetch every block in a slot range in parallel and in slot order into a response, file or aggregate, resumable with a checkpoint.",
+    tags={"solana", "block", "crypto"}
+)
+async def scan_blocks_endpoint(
+    start_slot: int = Field(description="First slot of the range"),
+    end_slot: int = Field(description="Last slot of the range"),
+    sink: str = Field(
+        default="response",
+        description="Where blocks go: response (returned, up to limit), file (JSON Lines in the export directory) or aggregate (totals only)"
+    ),
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=f"Block fields to keep ({', '.join(BLOCK_FIELDS)}); a summary for the response sink and all fields for the file sink if omitted"
+    ),
+    limit: int = Field(default=100, description="Maximum number of blocks returned by the response sink"),
+    output_file: Optional[str] = Field(default=None, description="File name for the file sink"),
+    checkpoint: Optional[str] = Field(
+        default=None,
+        description="Checkpoint file name; a later call with the same name and parameters continues an interrupted scan"
+    ),
+    max_blocks: Optional[int] = Field(default=None, description="Stop after this many blocks; continue later with the checkpoint"),
+    encoding: str = Field(
+        default="json",
+        description="Encoding format for transaction data (json, jsonParsed, base58, base64)"
+    ),
+    transaction_details: str = Field(
+        default="full",
+        description="Level of transaction detail to return (full, accounts, signatures, none)"
+    ),
+    rewards: bool = Field(default=False, description="Whether to include rewards in the blocks"),
+    max_supported_transaction_version: Optional[int] = Field(
+        default=0,
+        description="Max transaction version to return"
+    ),
+    commitment: Optional[str] = Field(
+        default=None,
+        description="The level of commitment (confirmed, finalized)"
+    ),
+    concurrency: Optional[int] = Field(
+        default=None,
+        description="Blocks fetched at once (defaults to SOLANA_BLOCK_SCAN_CONCURRENCY)"
+    )
+) -> dict:
+    """
+    Fetch every confirmed block in a slot range.
+
+    Confirmed slots are resolved with getBlocks and the blocks are fetched
+    concurrently, then handed to the chosen sink in slot order. Large ranges,
+    such as a whole epoch, can be exported to a file or summarized in one
+    call. With a checkpoint, an interrupted or max_blocks-limited scan is
+    continued by calling the tool again with the same parameters.
+    """
+    message = unknown_fields(fields, BLOCK_FIELDS, "block")
+    if message:
+        return SolanaBlockScanResponse(
+            status="error",
+            message=message
+        ).model_dump(exclude_none=True)
+
+    if sink == "response":
+        target = ResponseSink(limit, fields or BLOCK_SUMMARY_FIELDS, project_block, "blocks")
+    elif sink == "file":
+        if not output_file:
+            return SolanaBlockScanResponse(
+                status="error",
+                message="output_file is required for the file sink"
+            ).model_dump(exclude_none=True)
+        target = FileSink(output_file, fields, project=project_block)
+    elif sink == "aggregate":
+        target = BlockAggregateSink()
+    else:
+        return SolanaBlockScanResponse(
+            status="error",
+            message=f"Unknown sink: {sink} (expected response, file or aggregate)"
+        ).model_dump(exclude_none=True)
+
+    response = await scan_blocks(
+        start_slot,
+        end_slot,
+        target,
+        encoding=encoding,
+        transaction_details=transaction_details,
+        rewards=rewards,
+        max_supported_transaction_version=max_supported_transaction_version,
+        commitment=commitment,
+        concurrency=concurrency,
+        max_blocks=max_blocks,
+        checkpoint=checkpoint
+    )
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -797,7 +1306,7 @@ def get_program_accounts_endpoint(
     description="Get recent performance samples from the Solana network.",
     tags={"solana", "performance", "network", "crypto"}
 )
-def get_recent_performance_samples_endpoint(
+async def get_recent_performance_samples_endpoint(
     limit: Optional[int] = Field(
         default=None, 
         description="Number of samples to return (max 720, default 720)"
@@ -811,8 +1320,8 @@ def get_recent_performance_samples_endpoint(
     
     Performance samples provide insights into network health and transaction processing rates.
     """
-    response = get_recent_performance_samples(limit)
-    return response.dict(exclude_none=True)
+    response = await get_recent_performance_samples(limit)
+    return response.model_dump(exclude_none=True)
 
 
 @app.tool(
@@ -820,7 +1329,7 @@ def get_recent_performance_samples_endpoint(
     description="Get recent prioritization fees from the Solana network.",
     tags={"solana", "fee", "prioritization", "transaction", "crypto"}
 )
-def get_recent_prioritization_fees_endpoint(
+async def get_recent_prioritization_fees_endpoint(
     addresses: Optional[List[str]] = Field(
         default=None, 
         description="Optional list of account addresses to get prioritization fees for"
@@ -835,8 +1344,24 @@ def get_recent_prioritization_fees_endpoint(
     Prioritization fees help transactions get processed faster during network congestion.
     If addresses are provided, returns fees for transactions that write-lock those accounts.
     """
-    response = get_recent_prioritization_fees(addresses)
-    return response.dict(exclude_none=True)
+    response = await get_recent_prioritization_fees(addresses)
+    return response.model_dump(exclude_none=True)
+
+
+@app.tool(
+    name="get_rpc_stats",
+    description="Get statistics for the server's connection to the Solana RPC node.",
+    tags={"solana", "rpc", "stats"}
+)
+async def get_rpc_stats_endpoint() -> dict:
+    """
+    Get statistics for the shared RPC transport.
+    
+    Reports how many calls were combined into JSON-RPC batches and how many
+    upstream requests were saved by sharing identical in-flight calls.
+    """
+    response = await get_rpc_stats()
+    return response.model_dump(exclude_none=True)
 
 
 # Create router for organization purposes
@@ -0,0 +1,137 @@
+"""
+JSON-RPC micro-batching
+
+Calls to cheap RPC methods that arrive within a short window are collected and
+sent to the RPC node as a single JSON-RPC batch array. Each response is routed
+back to its caller by request id.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+# Methods with small, bounded responses that are safe to combine into one
+# HTTP request. Heavy methods such as getBlock or getProgramAccounts are sent
+# on their own so one large response does not delay the rest of a batch.
+DEFAULT_BATCH_METHODS: FrozenSet[str] = frozenset({
+    "getAccountInfo",
+    "getBalance",
+    "getBlockCommitment",
+    "getBlockHeight",
+    "getBlockTime",
+    "getEpochInfo",
+    "getFeeForMessage",
+    "getFirstAvailableBlock",
+    "getGenesisHash",
+    "getIdentity",
+    "getInflationRate",
+    "getLatestBlockhash",
+    "getMaxRetransmitSlot",
+    "getMaxShredInsertSlot",
+    "getMinimumBalanceForRentExemption",
+    "getSlot",
+})
+
+
+class RpcBatchError(Exception):
+    """Raised when a batch response does not contain an answer for a request"""
+
+
+class RpcBatcher:
+    """Collects JSON-RPC requests for a short window and sends them as one batch"""
+
+    def __init__(
+        self,
+        send: Callable[[List[Dict[str, Any]]], Awaitable[Any]],
+        window: float,
+        max_size: int,
+        methods: FrozenSet[str] = DEFAULT_BATCH_METHODS
+    ):
+        """
+        Create a batcher
+
+        Args:
+            send: Coroutine function that posts a list of request payloads and returns the decoded response
+            window: Seconds to wait for more requests after the first one of a batch arrives
+            max_size: Maximum number of requests per batch; a full batch is sent immediately
+            methods: RPC methods that may be batched
+        """
+        self.window = window
+        self.max_size = max_size
+        self.methods = methods
+        self._send = send
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._inflight: Set[asyncio.Task] = set()
+        self.batches_sent = 0
+        self.requests_batched = 0
+
+    def accepts(self, method: str) -> bool:
+        """Whether requests for this method are batched"""
+        return method in self.methods
+
+    async def submit(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queue a request payload for the next batch
+
+        Args:
+            payload: A complete JSON-RPC request object with a unique id
+
+        Returns:
+            Dict[str, Any]: The JSON-RPC response object for this request
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((payload, future))
+
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._dispatch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        self.batches_sent += 1
+        self.requests_batched += len(batch)
+
+        try:
+            responses = await self._send([payload for payload, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # A node that rejects the whole batch answers with a single error object
+        if isinstance(responses, dict):
+            responses = [dict(responses, id=payload["id"]) for payload, _ in batch]
+
+        by_id = {response.get("id"): response for response in responses}
+        for payload, future in batch:
+            if future.done():
+                continue
+            response = by_id.get(payload["id"])
+            if response is None:
+                future.set_exception(RpcBatchError(f"No response for request id {payload['id']} in batch"))
+            else:
+                future.set_result(response)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batching counters"""
+        return {
+            "batches": self.batches_sent,
+            "requests": self.requests_batched,
+            "pending": len(self._pending)
+        }
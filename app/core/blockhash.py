@@ -0,0 +1,181 @@
+"""
+Background latest-blockhash refresher
+
+Transaction-building flows ask for the latest blockhash before every
+transaction. Once a commitment level has been asked for, BlockhashTracker
+refreshes its latest blockhash in the background at a fixed cadence and serves
+reads from memory. A commitment that has not been read for a while stops
+being refreshed.
+
+Every blockhash handed out is remembered with its lastValidBlockHeight. The
+block height is tracked locally as well: getLatestBlockhash sets
+lastValidBlockHeight to the current block height plus MAX_PROCESSING_AGE,
+and between refreshes the height is extrapolated at one block per slot time.
+That height is the one of the requested commitment, which trails the
+processed tip that leaders check blockhashes against, so COMMITMENT_LAG
+blocks are added to it. Slots take at least SLOT_SECONDS, so the estimate
+runs ahead of the real height and a blockhash is reported expired early
+rather than late.
+"""
+import asyncio
+import collections
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, OrderedDict, Tuple
+
+if TYPE_CHECKING:
+    from app.core.rpc import SolanaRpcClient
+
+# Blocks after which a blockhash can no longer be used in a transaction
+MAX_PROCESSING_AGE = 150
+
+# Lower bound for the time a slot takes
+SLOT_SECONDS = 0.4
+
+# Blocks by which each commitment level trails the processed tip, at least
+COMMITMENT_LAG = {"processed": 0, "confirmed": 4, "finalized": 32}
+
+
+class BlockhashTracker:
+    """Keeps the latest blockhash of each requested commitment fresh in memory"""
+
+    def __init__(self, client: "SolanaRpcClient", interval: float, idle_seconds: float = 60.0, max_tracked: int = 1024):
+        """
+        Create a tracker
+
+        Args:
+            client: The RPC client used to refresh blockhashes
+            interval: Seconds between background refreshes
+            idle_seconds: Stop refreshing a commitment that has not been read for this long
+            max_tracked: Number of handed-out blockhashes remembered for validity checks
+        """
+        self.client = client
+        self.interval = interval
+        self.idle_seconds = idle_seconds
+        self.max_tracked = max_tracked
+        # commitment -> (fetched at, last read at, getLatestBlockhash result)
+        self._latest: Dict[str, Tuple[float, float, Dict[str, Any]]] = {}
+        self._valid_until: OrderedDict[str, int] = collections.OrderedDict()
+        # commitment -> (observed at, block height)
+        self._heights: Dict[str, Tuple[float, int]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.refreshes = 0
+
+    def start(self) -> None:
+        """Start refreshing in the background if not already running"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop background refreshing"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            for commitment, (_, read_at, _) in list(self._latest.items()):
+                if now - read_at > self.idle_seconds:
+                    del self._latest[commitment]
+                    continue
+                try:
+                    await self.refresh(commitment)
+                except Exception:
+                    # Reads fall back to a direct request once the value is stale
+                    pass
+
+    async def refresh(self, commitment: str) -> Dict[str, Any]:
+        """
+        Fetch the latest blockhash of a commitment level
+
+        Returns:
+            Dict[str, Any]: The getLatestBlockhash response
+        """
+        params = [{"commitment": commitment}] if commitment != "finalized" else []
+        response = await self.client.request("getLatestBlockhash", params)
+        if "error" in response:
+            return response
+        result = response["result"]
+        value = result["value"]
+        now = time.monotonic()
+        previous = self._latest.get(commitment)
+        self._latest[commitment] = (now, previous[1] if previous else now, result)
+        tip = value["lastValidBlockHeight"] - MAX_PROCESSING_AGE + COMMITMENT_LAG.get(commitment, 0)
+        self._heights[commitment] = (now, tip)
+        self._valid_until[value["blockhash"]] = value["lastValidBlockHeight"]
+        self._valid_until.move_to_end(value["blockhash"])
+        while len(self._valid_until) > self.max_tracked:
+            self._valid_until.popitem(last=False)
+        self.refreshes += 1
+        return response
+
+    async def latest(self, commitment: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return the latest blockhash, from memory when the background refresh is keeping it fresh
+
+        Args:
+            commitment: The level of commitment (processed, confirmed, finalized)
+
+        Returns:
+            Dict[str, Any]: A getLatestBlockhash response
+        """
+        commitment = commitment or "finalized"
+        self.start()
+        now = time.monotonic()
+        entry = self._latest.get(commitment)
+        if entry is not None and now - entry[0] <= 2 * self.interval:
+            self._latest[commitment] = (entry[0], now, entry[2])
+            self.hits += 1
+            return {"jsonrpc": "2.0", "result": entry[2], "id": None}
+        response = await self.refresh(commitment)
+        if commitment in self._latest:
+            fetched_at, _, value = self._latest[commitment]
+            self._latest[commitment] = (fetched_at, now, value)
+        return response
+
+    def block_height(self, now: Optional[float] = None) -> Optional[int]:
+        """Estimated block height of the processed tip, or None before the first refresh"""
+        if not self._heights:
+            return None
+        now = time.monotonic() if now is None else now
+        # Each commitment's last observation is extrapolated; the highest is used
+        return max(height + int((now - observed_at) / SLOT_SECONDS) for observed_at, height in self._heights.values())
+
+    def validity(self, blockhash: str) -> Dict[str, Any]:
+        """
+        Check whether a blockhash handed out earlier can still be used
+
+        Returns:
+            Dict[str, Any]: known, valid, lastValidBlockHeight, estimatedBlockHeight and blocksRemaining;
+                valid is None for blockhashes that were not handed out by this tracker
+        """
+        height = self.block_height()
+        last_valid = self._valid_until.get(blockhash)
+        if last_valid is None or height is None:
+            return {"known": False, "valid": None, "estimatedBlockHeight": height}
+        return {
+            "known": True,
+            "valid": height <= last_valid,
+            "lastValidBlockHeight": last_valid,
+            "estimatedBlockHeight": height,
+            "blocksRemaining": max(0, last_valid - height)
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "commitments": {
+                commitment: round((now - fetched_at) * 1000, 1)
+                for commitment, (fetched_at, _, _) in self._latest.items()
+            },
+            "tracked": len(self._valid_until),
+            "block_height": self.block_height(now),
+            "hits": self.hits,
+            "refreshes": self.refreshes
+        }
@@ -0,0 +1,167 @@
+"""
+Response cache for RPC requests
+
+Successful responses are cached under the canonical (method, params) key,
+which includes the commitment. How long an entry lives depends on the method
+and the commitment: data that never changes (genesis hash, epoch schedule) is
+kept until evicted, slow-moving data for minutes, and account or slot state
+for a few hundred milliseconds at processed commitment up to several seconds
+at finalized. The cache is an LRU bounded by the approximate size of the
+cached JSON.
+"""
+import collections
+import json
+import math
+import time
+from typing import Any, Dict, Hashable, List, Optional, OrderedDict, Tuple
+
+NEVER_EXPIRES = math.inf
+
+# TTL in seconds by commitment for methods without an entry in METHOD_TTLS
+COMMITMENT_TTLS = {
+    "processed": 0.4,
+    "confirmed": 2.0,
+    "finalized": 10.0,
+}
+
+# Per-method TTL in seconds; 0 disables caching. A dict maps commitment to TTL.
+METHOD_TTLS: Dict[str, Any] = {
+    "getGenesisHash": NEVER_EXPIRES,
+    "getEpochSchedule": NEVER_EXPIRES,
+    "getInflationGovernor": 3600.0,
+    "getIdentity": 3600.0,
+    "getMinimumBalanceForRentExemption": 3600.0,
+    "getInflationReward": 3600.0,
+    "getInflationRate": 60.0,
+    "getLargestAccounts": 60.0,
+    "getFirstAvailableBlock": 60.0,
+    "getRecentPerformanceSamples": 60.0,
+    "getHighestSnapshotSlot": 30.0,
+    "getRecentPrioritizationFees": 2.0,
+    # Finalized blocks never change; confirmed blocks almost never do
+    "getBlock": {"processed": 0.0, "confirmed": 60.0, "finalized": NEVER_EXPIRES},
+    # getBlockTime has no commitment and also answers for confirmed blocks that
+    # may still be dropped; times of rooted slots are kept for good (see ttl)
+    "getBlockTime": 60.0,
+    "getBlocks": {"processed": 0.0, "confirmed": 2.0, "finalized": 10.0},
+    "getBlocksWithLimit": {"processed": 0.0, "confirmed": 2.0, "finalized": 10.0},
+    # Always live
+    "getHealth": 0.0,
+    "getBlockCommitment": 0.0,
+    "getProgramAccounts": 0.0,
+    # Indexed per epoch by app.services.leaders instead
+    "getLeaderSchedule": 0.0,
+    # Kept fresh by the background refresher in app.core.blockhash instead
+    "getLatestBlockhash": 0.0,
+    # Kept in the indexed node directory in app.services.nodes instead
+    "getClusterNodes": 0.0,
+}
+
+
+def commitment_of(params: Optional[List[Any]]) -> str:
+    """Return the commitment a request asks for (finalized if none is given)"""
+    for param in params or []:
+        if isinstance(param, dict) and "commitment" in param:
+            return param["commitment"]
+    return "finalized"
+
+
+class ResponseCache:
+    """LRU cache of JSON-RPC responses bounded by approximate size in bytes"""
+
+    def __init__(self, max_bytes: int, ttls: Optional[Dict[str, Any]] = None):
+        """
+        Create a response cache
+
+        Args:
+            max_bytes: Upper bound for the total size of cached responses
+            ttls: Per-method TTL overrides in seconds, merged over METHOD_TTLS
+        """
+        self.max_bytes = max_bytes
+        self.ttls = {**METHOD_TTLS, **(ttls or {})}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: OrderedDict[Hashable, Tuple[float, int, Dict[str, Any]]] = collections.OrderedDict()
+
+    def ttl(self, method: str, params: Optional[List[Any]], rooted_slot: Optional[int] = None) -> float:
+        """
+        Seconds a response to this request may be served from the cache (0 for never)
+
+        Args:
+            method: The JSON-RPC method name
+            params: The method parameters
+            rooted_slot: The highest slot known to be rooted, if any
+        """
+        commitment = commitment_of(params)
+        ttl = self.ttls.get(method)
+        if isinstance(ttl, dict):
+            ttl = ttl.get(commitment)
+        if ttl is None:
+            ttl = COMMITMENT_TTLS.get(commitment, 0.0)
+        if (
+            method == "getBlockTime" and ttl > 0 and rooted_slot is not None
+            and params and isinstance(params[0], int) and params[0] <= rooted_slot
+        ):
+            # The time of a rooted block never changes
+            return NEVER_EXPIRES
+        return ttl
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Return a cached response, or None on a miss"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def put(self, key: Hashable, response: Dict[str, Any], ttl: float) -> None:
+        """
+        Cache a successful response
+
+        Error responses, null results and responses larger than an eighth of
+        the cache are not stored.
+        """
+        if ttl <= 0 or "error" in response or response.get("result") is None:
+            return
+        size = len(json.dumps(response, separators=(",", ":")))
+        if size > self.max_bytes // 8:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, size, response)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def clear(self) -> None:
+        """Drop every cached response"""
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
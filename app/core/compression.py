@@ -0,0 +1,71 @@
+"""
+Compressed RPC responses and transfer-size accounting
+
+Large responses such as getBlock with full transaction details or
+getProgramAccounts with base64 data compress several-fold. The transport asks
+for gzip and deflate, and brotli when the optional brotli package is installed;
+httpx decodes the body chunk by chunk as it is read. Wire bytes and decoded
+bytes are counted per method so the savings are visible in get_rpc_stats.
+"""
+from typing import Any, Dict, List
+
+
+def _brotli_available() -> bool:
+    """Check whether a brotli package that httpx can decode with is installed"""
+    for module in ("brotli", "brotlicffi"):
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        return True
+    return False
+
+
+def accept_encoding(enabled: bool = True) -> str:
+    """
+    Return the Accept-Encoding header value for RPC requests
+
+    Args:
+        enabled: Whether compressed responses are requested at all
+    """
+    if not enabled:
+        return "identity"
+    encodings = ["gzip", "deflate"]
+    if _brotli_available():
+        encodings.append("br")
+    return ", ".join(encodings)
+
+
+class TransferStats:
+    """Counts wire and decoded response bytes per RPC method"""
+
+    def __init__(self):
+        self._methods: Dict[str, Dict[str, int]] = {}
+
+    def record(self, methods: List[str], wire_bytes: int, decoded_bytes: int) -> None:
+        """
+        Record one HTTP response
+
+        Args:
+            methods: Methods carried by the request (several for a batch, sharing the bytes evenly)
+            wire_bytes: Bytes received on the connection, before decompression
+            decoded_bytes: Bytes of the decoded JSON body
+        """
+        share = 1 / len(methods)
+        for method in methods:
+            entry = self._methods.get(method)
+            if entry is None:
+                entry = self._methods[method] = {"responses": 0, "wire_bytes": 0, "decoded_bytes": 0}
+            entry["responses"] += 1
+            entry["wire_bytes"] += round(wire_bytes * share)
+            entry["decoded_bytes"] += round(decoded_bytes * share)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return byte counters and compression ratio per method"""
+        return {
+            method: {
+                **entry,
+                "ratio": round(entry["decoded_bytes"] / entry["wire_bytes"], 2) if entry["wire_bytes"] else None
+            }
+            for method, entry in sorted(self._methods.items())
+        }
@@ -15,4 +15,106 @@ SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
 SERVER_PORT = int(os.getenv("SERVER_PORT", "3000"))
 
 # Solana configuration
-SOLANA_RPC_URL = os.getenv("SOLANA_RPC_URL", "https://api.mainnet-beta.solana.com") 
\ No newline at end of file
+SOLANA_RPC_URL = os.getenv("SOLANA_RPC_URL", "https://api.mainnet-beta.solana.com") 
+
+# Directory that streamed results are written to by file sinks
+SOLANA_EXPORT_DIR = os.getenv("SOLANA_EXPORT_DIR", "exports")
+
+# Pool of RPC endpoints (comma separated); defaults to SOLANA_RPC_URL alone
+SOLANA_RPC_URLS = [url.strip() for url in os.getenv("SOLANA_RPC_URLS", SOLANA_RPC_URL).split(",") if url.strip()]
+SOLANA_RPC_EJECT_AFTER_FAILURES = int(os.getenv("SOLANA_RPC_EJECT_AFTER_FAILURES", "3"))
+SOLANA_RPC_EJECT_SECONDS = float(os.getenv("SOLANA_RPC_EJECT_SECONDS", "30"))
+
+# Background health probing (getHealth + getSlot); an interval of 0 disables it
+SOLANA_RPC_HEALTH_INTERVAL = float(os.getenv("SOLANA_RPC_HEALTH_INTERVAL", "10"))
+SOLANA_RPC_MAX_SLOT_LAG = int(os.getenv("SOLANA_RPC_MAX_SLOT_LAG", "50"))
+SOLANA_RPC_BREAKER_COOLDOWN = float(os.getenv("SOLANA_RPC_BREAKER_COOLDOWN", "30"))
+
+# RPC transport configuration
+SOLANA_RPC_TIMEOUT = float(os.getenv("SOLANA_RPC_TIMEOUT", "30"))
+SOLANA_RPC_MAX_CONNECTIONS = int(os.getenv("SOLANA_RPC_MAX_CONNECTIONS", "100"))
+SOLANA_RPC_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("SOLANA_RPC_MAX_KEEPALIVE_CONNECTIONS", "20"))
+SOLANA_RPC_KEEPALIVE_EXPIRY = float(os.getenv("SOLANA_RPC_KEEPALIVE_EXPIRY", "60"))
+SOLANA_RPC_HTTP2 = os.getenv("SOLANA_RPC_HTTP2", "true").lower() in ("1", "true", "yes")
+# Ask for gzip/deflate compressed responses (brotli when the brotli package is installed)
+SOLANA_RPC_COMPRESSION = os.getenv("SOLANA_RPC_COMPRESSION", "true").lower() in ("1", "true", "yes")
+
+# JSON-RPC micro-batching (a window of 0 disables batching)
+SOLANA_RPC_BATCH_WINDOW_MS = float(os.getenv("SOLANA_RPC_BATCH_WINDOW_MS", "2"))
+SOLANA_RPC_BATCH_MAX_SIZE = int(os.getenv("SOLANA_RPC_BATCH_MAX_SIZE", "100"))
+
+# Share one upstream request among concurrent identical calls
+SOLANA_RPC_SINGLEFLIGHT = os.getenv("SOLANA_RPC_SINGLEFLIGHT", "true").lower() in ("1", "true", "yes")
+
+# Response cache bounded by size in bytes (0 disables) with per-method TTL
+# overrides in seconds ("method=seconds", comma separated; "inf" never expires)
+SOLANA_RPC_CACHE_MAX_BYTES = int(os.getenv("SOLANA_RPC_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+SOLANA_RPC_CACHE_TTLS = {
+    method.strip(): float(seconds)
+    for method, _, seconds in (
+        item.partition("=") for item in os.getenv("SOLANA_RPC_CACHE_TTLS", "").split(",") if item.strip()
+    )
+}
+
+# SQLite file that finalized blocks, rooted block times and completed-epoch
+# inflation rewards are stored in permanently (empty disables)
+SOLANA_RPC_DISK_CACHE = os.getenv("SOLANA_RPC_DISK_CACHE", "cache/rpc.sqlite3")
+
+# Background refresh of the latest blockhash in seconds (0 disables); a
+# commitment level that has not been read for the idle time stops being refreshed
+SOLANA_BLOCKHASH_REFRESH_INTERVAL = float(os.getenv("SOLANA_BLOCKHASH_REFRESH_INTERVAL", "2"))
+SOLANA_BLOCKHASH_IDLE_SECONDS = float(os.getenv("SOLANA_BLOCKHASH_IDLE_SECONDS", "60"))
+
+# Leader schedules: epochs kept indexed in memory, and how many slots before
+# the end of an epoch the next epoch's schedule is prefetched
+SOLANA_LEADER_SCHEDULE_EPOCHS = int(os.getenv("SOLANA_LEADER_SCHEDULE_EPOCHS", "3"))
+SOLANA_LEADER_PREFETCH_SLOTS = int(os.getenv("SOLANA_LEADER_PREFETCH_SLOTS", "4500"))
+
+# Cluster-node directory: background refresh in seconds (0 refreshes on every
+# read), idle time after which refreshing stops, and revisions of changes kept
+SOLANA_CLUSTER_NODES_REFRESH_INTERVAL = float(os.getenv("SOLANA_CLUSTER_NODES_REFRESH_INTERVAL", "60"))
+SOLANA_CLUSTER_NODES_IDLE_SECONDS = float(os.getenv("SOLANA_CLUSTER_NODES_IDLE_SECONDS", "600"))
+SOLANA_CLUSTER_NODES_HISTORY = int(os.getenv("SOLANA_CLUSTER_NODES_HISTORY", "64"))
+
+# get_multiple_accounts splits address lists into chunks of 100 and fetches
+# this many chunks at once
+SOLANA_MULTIPLE_ACCOUNTS_CONCURRENCY = int(os.getenv("SOLANA_MULTIPLE_ACCOUNTS_CONCURRENCY", "8"))
+
+# getBlock requests scan_blocks keeps in flight at once
+SOLANA_BLOCK_SCAN_CONCURRENCY = int(os.getenv("SOLANA_BLOCK_SCAN_CONCURRENCY", "8"))
+
+# SQLite file that the bitset of slots with a finalized block is kept in
+# (empty keeps it in memory only)
+SOLANA_SLOT_INDEX = os.getenv("SOLANA_SLOT_INDEX", "cache/slots.sqlite3")
+
+# Hedged requests: if the first endpoint is slower than the given latency
+# percentile, a duplicate is sent to a second endpoint (empty list disables)
+SOLANA_RPC_HEDGE_METHODS = [m.strip() for m in os.getenv("SOLANA_RPC_HEDGE_METHODS", "getLatestBlockhash,getAccountInfo,getBlockHeight").split(",") if m.strip()]
+SOLANA_RPC_HEDGE_PERCENTILE = float(os.getenv("SOLANA_RPC_HEDGE_PERCENTILE", "95"))
+SOLANA_RPC_HEDGE_BUDGET = float(os.getenv("SOLANA_RPC_HEDGE_BUDGET", "0.05"))
+
+# Client-side rate limits per endpoint in requests per second (0 disables);
+# heavy methods such as getProgramAccounts and getBlock have their own budget
+SOLANA_RPC_RATE_LIMIT = float(os.getenv("SOLANA_RPC_RATE_LIMIT", "0"))
+SOLANA_RPC_HEAVY_RATE_LIMIT = float(os.getenv("SOLANA_RPC_HEAVY_RATE_LIMIT", "0"))
+
+# Adaptive (AIMD) concurrency limit per endpoint and method class
+SOLANA_RPC_INITIAL_CONCURRENCY = int(os.getenv("SOLANA_RPC_INITIAL_CONCURRENCY", "32"))
+SOLANA_RPC_MAX_CONCURRENCY = int(os.getenv("SOLANA_RPC_MAX_CONCURRENCY", "256"))
+
+# Per-method request timeouts in seconds ("method=seconds", comma separated);
+# other methods use SOLANA_RPC_TIMEOUT
+SOLANA_RPC_METHOD_TIMEOUTS = {
+    method.strip(): float(seconds)
+    for method, _, seconds in (
+        item.partition("=") for item in os.getenv(
+            "SOLANA_RPC_METHOD_TIMEOUTS", "getBlock=60,getProgramAccounts=120"
+        ).split(",") if item.strip()
+    )
+}
+
+# Retries of connection resets, 429, 5xx and node-behind errors with
+# exponential backoff and jitter
+SOLANA_RPC_MAX_RETRIES = int(os.getenv("SOLANA_RPC_MAX_RETRIES", "3"))
+SOLANA_RPC_RETRY_BASE_DELAY = float(os.getenv("SOLANA_RPC_RETRY_BASE_DELAY", "0.1"))
+SOLANA_RPC_RETRY_MAX_DELAY = float(os.getenv("SOLANA_RPC_RETRY_MAX_DELAY", "2"))
@@ -0,0 +1,186 @@
+"""
+Permanent on-disk store for immutable RPC results
+
+Some results never change once they exist: a finalized block, the time of a
+rooted block and the inflation rewards of a completed epoch. DiskStore keeps
+them in a SQLite database so historical lookups are answered locally, across
+restarts, instead of paying for the RPC call again.
+
+Results are content-addressed: each distinct result is stored once, keyed by
+its SHA-256 digest, and requests map to digests. The database is opened with
+memory-mapped I/O so reads of stored results come straight from the page cache.
+
+Block times are only stored for slots at or below the highest rooted slot
+seen so far: the highest finalized block stored, or the finalized slot
+reported by the endpoints' health probes. getBlockTime also answers for
+confirmed blocks that may still be dropped.
+
+The methods of DiskStore block. SolanaRpcClient calls get and put from
+worker threads, so that reading or writing a large block does not stall the
+event loop. A lock serializes the threads' use of the shared connection.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.core.cache import commitment_of
+
+# Methods whose results may be stored permanently
+PERMANENT_METHODS = frozenset({"getBlock", "getBlockTime", "getInflationReward"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (digest BLOB PRIMARY KEY, body BLOB NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS requests (
+    method TEXT NOT NULL,
+    params TEXT NOT NULL,
+    digest BLOB NOT NULL,
+    PRIMARY KEY (method, params)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL) WITHOUT ROWID;
+"""
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+class DiskStore:
+    """SQLite store of results that can never change"""
+
+    def __init__(self, path: str, mmap_bytes: int = 256 * 1024 * 1024):
+        """
+        Create a disk store, creating the database file if needed
+
+        Args:
+            path: Path of the SQLite database file
+            mmap_bytes: Size of the memory-mapped window over the database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(f"PRAGMA mmap_size={int(mmap_bytes)}")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        row = self._db.execute("SELECT value FROM meta WHERE name = 'rooted_slot'").fetchone()
+        self.rooted_slot: Optional[int] = row[0] if row else None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def observe_rooted_slot(self, slot: Optional[int]) -> None:
+        """Raise the highest slot known to be rooted"""
+        if slot is None or (self.rooted_slot is not None and slot <= self.rooted_slot):
+            return
+        self.rooted_slot = slot
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO meta (name, value) VALUES ('rooted_slot', ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                (slot,)
+            )
+
+    def permanent(self, method: str, params: Optional[List[Any]], response: Dict[str, Any]) -> bool:
+        """
+        Whether a response can never change
+
+        Args:
+            method: The JSON-RPC method name
+            params: The method parameters
+            response: The decoded JSON-RPC response
+
+        Returns:
+            bool: True for finalized blocks, times of rooted blocks and rewards of a given completed epoch
+        """
+        result = response.get("result")
+        if "error" in response or result is None or not params:
+            return False
+        if method == "getBlock":
+            return commitment_of(params) == "finalized"
+        if method == "getBlockTime":
+            return self.rooted_slot is not None and params[0] <= self.rooted_slot
+        if method == "getInflationReward":
+            # Without an explicit epoch the answer moves on every epoch. A null
+            # entry may be a reward that has not been distributed yet.
+            config = params[1] if len(params) > 1 and isinstance(params[1], dict) else {}
+            return (
+                config.get("epoch") is not None
+                and commitment_of(params) == "finalized"
+                and all(reward is not None for reward in result)
+            )
+        return False
+
+    def get(self, method: str, params: Optional[List[Any]]) -> Optional[Any]:
+        """
+        Return the stored result of a request, or None if there is none
+
+        Args:
+            method: The JSON-RPC method name
+            params: The method parameters
+        """
+        if method not in PERMANENT_METHODS:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body FROM requests JOIN blobs USING (digest) WHERE method = ? AND params = ?",
+                (method, _encode(params or []))
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, method: str, params: Optional[List[Any]], response: Dict[str, Any]) -> bool:
+        """
+        Store the result of a response if it can never change
+
+        Returns:
+            bool: Whether the result was stored
+        """
+        if method not in PERMANENT_METHODS or not self.permanent(method, params, response):
+            return False
+        body = _encode(response["result"]).encode()
+        digest = hashlib.sha256(body).digest()
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute("INSERT OR IGNORE INTO blobs (digest, body) VALUES (?, ?)", (digest, body))
+                self._db.execute(
+                    "INSERT OR REPLACE INTO requests (method, params, digest) VALUES (?, ?, ?)",
+                    (method, _encode(params or []), digest)
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self.writes += 1
+        if method == "getBlock":
+            self.observe_rooted_slot(params[0])
+        return True
+
+    def close(self) -> None:
+        """Close the database"""
+        with self._lock:
+            self._db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = self._db.execute("SELECT COUNT(*) FROM requests").fetchone()[0]
+            blobs, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM blobs").fetchone()
+        return {
+            "path": self.path,
+            "requests": requests,
+            "results": blobs,
+            "bytes": size,
+            "rooted_slot": self.rooted_slot,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes
+        }
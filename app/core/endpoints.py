@@ -0,0 +1,204 @@
+"""
+Pool of Solana RPC endpoints with latency-aware routing
+
+Each endpoint keeps an exponentially weighted moving average (EWMA) of its
+response latency and error rate. Requests are routed with power-of-two-choices:
+two available endpoints are picked at random and the one with the lower cost
+wins. Endpoints that fail repeatedly are ejected for a while and re-admitted
+automatically once the ejection period ends. Endpoints whose circuit breaker
+is open (see app.core.health) are skipped entirely.
+"""
+import math
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.health import CircuitBreaker, NoHealthyEndpointError
+
+
+class RpcEndpoint:
+    """Live latency and error statistics for one RPC endpoint"""
+
+    def __init__(self, url: str, decay: float = 10.0, breaker_cooldown: float = 30.0):
+        """
+        Args:
+            url: The RPC endpoint URL
+            decay: Seconds for an idle endpoint's latency estimate to decay by a factor of e
+            breaker_cooldown: Seconds before an open circuit breaker lets a trial request through
+        """
+        self.url = url
+        self.breaker = CircuitBreaker(breaker_cooldown)
+        self.slot: Optional[int] = None
+        self.decay = decay
+        self.latency_ewma = 0.0
+        self.error_ewma = 0.0
+        self.last_sample = 0.0
+        self.inflight = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+
+    def is_available(self, now: float) -> bool:
+        """Whether the endpoint may receive requests"""
+        return now >= self.ejected_until and self.breaker.allows(now)
+
+    def latency(self, now: float) -> float:
+        """
+        Current latency estimate in seconds
+
+        The estimate decays while an endpoint receives no traffic, so a node that
+        was slow once is tried again eventually instead of being starved forever.
+        """
+        if self.last_sample == 0.0:
+            return 0.0
+        return self.latency_ewma * math.exp(-(now - self.last_sample) / self.decay)
+
+    def cost(self, now: float) -> float:
+        """Routing cost: latency weighted by outstanding requests and recent errors"""
+        return self.latency(now) * (self.inflight + 1) / max(0.05, 1.0 - self.error_ewma)
+
+    def record_success(self, latency: float, alpha: float, now: float) -> None:
+        self._sample(latency, 0.0, alpha, now)
+        self.consecutive_failures = 0
+        self.breaker.record_success()
+
+    def record_failure(self, latency: float, alpha: float, now: float) -> None:
+        self._sample(latency, 1.0, alpha, now)
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.breaker.record_failure()
+
+    def record_latency(self, latency: float, alpha: float, now: float) -> None:
+        self._sample(latency, None, alpha, now)
+
+    def _sample(self, latency: float, error: Optional[float], alpha: float, now: float) -> None:
+        self.requests += 1
+        if self.last_sample == 0.0:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma = alpha * latency + (1 - alpha) * self.latency(now)
+        if error is not None:
+            self.error_ewma = alpha * error + (1 - alpha) * self.error_ewma
+        self.last_sample = now
+
+    def stats(self, now: float) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "available": self.is_available(now),
+            "latency_ms": round(self.latency(now) * 1000, 3),
+            "error_rate": round(self.error_ewma, 4),
+            "inflight": self.inflight,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.ejections,
+            "slot": self.slot,
+            "breaker": self.breaker.stats()
+        }
+
+
+class EndpointPool:
+    """Chooses the best RPC endpoint for each request"""
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        alpha: float = 0.3,
+        decay: float = 10.0,
+        eject_after_failures: int = 3,
+        eject_seconds: float = 30.0,
+        max_eject_seconds: float = 300.0,
+        breaker_cooldown: float = 30.0
+    ):
+        """
+        Create an endpoint pool
+
+        Args:
+            urls: The RPC endpoint URLs
+            alpha: EWMA smoothing factor for latency and error rate
+            decay: Seconds for an idle endpoint's latency estimate to decay by a factor of e
+            eject_after_failures: Consecutive failures after which an endpoint is ejected
+            eject_seconds: Base ejection period; it doubles on each repeated ejection
+            max_eject_seconds: Upper bound for the ejection period
+            breaker_cooldown: Seconds before an open circuit breaker lets a trial request through
+        """
+        self.endpoints: List[RpcEndpoint] = [RpcEndpoint(url, decay, breaker_cooldown) for url in urls]
+        if not self.endpoints:
+            raise ValueError("At least one RPC endpoint URL is required")
+        self.alpha = alpha
+        self.eject_after_failures = eject_after_failures
+        self.eject_seconds = eject_seconds
+        self.max_eject_seconds = max_eject_seconds
+
+    def choose(self, exclude: Iterable[RpcEndpoint] = ()) -> RpcEndpoint:
+        """
+        Pick an endpoint for the next request
+
+        Args:
+            exclude: Endpoints that should not be used (e.g. already tried for this request)
+
+        Returns:
+            RpcEndpoint: The chosen endpoint
+
+        Raises:
+            NoHealthyEndpointError: If every endpoint has an open circuit breaker
+        """
+        now = time.monotonic()
+        excluded = set(exclude)
+        candidates = [e for e in self.endpoints if e not in excluded and e.is_available(now)]
+        if not candidates:
+            # Known-unhealthy endpoints fail fast instead of making callers wait on them
+            remaining = [e for e in self.endpoints if e.breaker.allows(now)]
+            if not remaining:
+                reasons = "; ".join(f"{e.url}: {e.breaker.reason}" for e in self.endpoints)
+                raise NoHealthyEndpointError(f"No healthy RPC endpoint ({reasons})")
+            # Everything else is ejected: use the endpoint that will be re-admitted
+            # first rather than failing outright
+            candidates = [e for e in remaining if e not in excluded] or remaining
+            return min(candidates, key=lambda e: e.ejected_until)
+        if len(candidates) == 1:
+            return candidates[0]
+        first, second = random.sample(candidates, 2)
+        return first if first.cost(now) <= second.cost(now) else second
+
+    def record_success(self, endpoint: RpcEndpoint, latency: float) -> None:
+        """Record a successful request"""
+        now = time.monotonic()
+        endpoint.record_success(latency, self.alpha, now)
+        if endpoint.ejections and endpoint.is_available(now):
+            # A successful request after re-admission resets the ejection backoff
+            endpoint.ejections = 0
+
+    def record_failure(self, endpoint: RpcEndpoint, latency: float) -> None:
+        """Record a failed request, ejecting the endpoint after repeated failures"""
+        now = time.monotonic()
+        endpoint.record_failure(latency, self.alpha, now)
+        if endpoint.consecutive_failures >= self.eject_after_failures:
+            self.eject(endpoint)
+
+    def record_cancelled(self, endpoint: RpcEndpoint, latency: float) -> None:
+        """
+        Record a request that was abandoned before it was answered
+
+        The elapsed time is a lower bound of the endpoint's latency, so it still
+        counts towards the latency estimate, but not as an error.
+        """
+        endpoint.record_latency(latency, self.alpha, time.monotonic())
+
+    def eject(self, endpoint: RpcEndpoint, seconds: Optional[float] = None) -> None:
+        """Take an endpoint out of rotation for a while"""
+        if seconds is None:
+            seconds = min(self.max_eject_seconds, self.eject_seconds * (2 ** endpoint.ejections))
+        endpoint.ejections += 1
+        endpoint.consecutive_failures = 0
+        endpoint.ejected_until = time.monotonic() + seconds
+
+    def readmit(self, endpoint: RpcEndpoint) -> None:
+        """Put an ejected endpoint back into rotation"""
+        endpoint.ejected_until = 0.0
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Return per-endpoint statistics"""
+        now = time.monotonic()
+        return [endpoint.stats(now) for endpoint in self.endpoints]
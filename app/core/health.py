@@ -0,0 +1,201 @@
+"""
+Background health probing and per-endpoint circuit breakers
+
+A prober periodically sends getHealth and getSlot to every configured
+endpoint. An endpoint whose node reports itself unhealthy, does not answer,
+or lags too many slots behind the best endpoint has its circuit breaker
+tripped and stops receiving requests until a later probe finds it healthy
+again.
+
+Both probe requests are sent as one JSON-RPC batch. Endpoints whose provider
+rejects batch requests are probed with two single requests instead. When no
+endpoint passes a probe round, the breakers of endpoints whose probe got no
+answer at all are only tripped after LAST_ENDPOINT_PROBE_FAILURES such probes
+in a row, so one lost probe does not take every endpoint out.
+"""
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+
+if TYPE_CHECKING:
+    from app.core.endpoints import RpcEndpoint
+    from app.core.rpc import SolanaRpcClient
+
+
+# Probes in a row without an answer after which an endpoint is taken out even when no other endpoint is healthy
+LAST_ENDPOINT_PROBE_FAILURES = 3
+
+PROBE_REQUESTS: List[Dict[str, Any]] = [
+    {"jsonrpc": "2.0", "id": 1, "method": "getHealth", "params": []},
+    {"jsonrpc": "2.0", "id": 2, "method": "getSlot", "params": []}
+]
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one endpoint
+
+    closed: requests flow normally. open: the endpoint is skipped. After the
+    cooldown an open breaker becomes half-open and lets requests through; the
+    next success or healthy probe closes it, a failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, cooldown: float = 30.0):
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.reason: Optional[str] = None
+        self.opened_at = 0.0
+        self.trips = 0
+
+    def allows(self, now: float) -> bool:
+        """Whether requests may be sent through this breaker"""
+        if self.state == self.OPEN and now - self.opened_at >= self.cooldown:
+            self.state = self.HALF_OPEN
+        return self.state != self.OPEN
+
+    def trip(self, reason: str) -> None:
+        """Open the breaker"""
+        if self.state != self.OPEN:
+            self.trips += 1
+        self.state = self.OPEN
+        self.reason = reason
+        self.opened_at = time.monotonic()
+
+    def close(self) -> None:
+        """Close the breaker"""
+        self.state = self.CLOSED
+        self.reason = None
+
+    def record_success(self) -> None:
+        if self.state == self.HALF_OPEN:
+            self.close()
+
+    def record_failure(self) -> None:
+        if self.state == self.HALF_OPEN:
+            self.trip(self.reason or "Request failed while half-open")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "reason": self.reason,
+            "trips": self.trips
+        }
+
+
+class NoHealthyEndpointError(Exception):
+    """Raised when every RPC endpoint has an open circuit breaker"""
+
+
+class HealthProber:
+    """Probes every endpoint of a client in the background"""
+
+    def __init__(self, client: "SolanaRpcClient", interval: float, max_slot_lag: int, timeout: float = 5.0):
+        """
+        Create a prober
+
+        Args:
+            client: The RPC client whose endpoints are probed
+            interval: Seconds between probe rounds
+            max_slot_lag: Slots an endpoint may lag behind the best endpoint before its breaker trips
+            timeout: Timeout for each probe in seconds
+        """
+        self.client = client
+        self.interval = interval
+        self.max_slot_lag = max_slot_lag
+        self.timeout = timeout
+        self.rounds = 0
+        self._task: Optional[asyncio.Task] = None
+        # URLs of endpoints that reject batch requests
+        self._unbatched: Set[str] = set()
+        # Probes in a row that got no answer, by URL
+        self._failed_probes: Dict[str, int] = {}
+
+    def start(self) -> None:
+        """Start probing in the background if not already running"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop background probing"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.probe_all()
+            await asyncio.sleep(self.interval)
+
+    async def _query(self, endpoint: "RpcEndpoint") -> Dict[Any, Dict[str, Any]]:
+        """Send the probe requests in one batch, or one by one to endpoints that reject batches"""
+        if endpoint.url not in self._unbatched:
+            response = await self.client.client.post(endpoint.url, json=PROBE_REQUESTS, timeout=self.timeout)
+            try:
+                answer = response.json() if response.is_success else None
+            except ValueError:
+                answer = None
+            if isinstance(answer, list):
+                return {item.get("id"): item for item in answer}
+
+        async def send(request: Dict[str, Any]) -> Dict[str, Any]:
+            response = await self.client.client.post(endpoint.url, json=request, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+
+        items = await asyncio.gather(*(send(request) for request in PROBE_REQUESTS))
+        # The single requests were answered, so it was the batch that was rejected
+        self._unbatched.add(endpoint.url)
+        return {item.get("id"): item for item in items}
+
+    async def probe(self, endpoint: "RpcEndpoint") -> Optional[str]:
+        """
+        Probe one endpoint with getHealth and getSlot
+
+        Returns:
+            Optional[str]: None if the node is healthy, otherwise the reason it is not
+        """
+        try:
+            results = await self._query(endpoint)
+        except Exception as e:
+            endpoint.slot = None
+            self._failed_probes[endpoint.url] = self._failed_probes.get(endpoint.url, 0) + 1
+            return f"Health probe failed: {str(e) or type(e).__name__}"
+        self._failed_probes[endpoint.url] = 0
+
+        health = results.get(1, {})
+        slot = results.get(2, {})
+        endpoint.slot = slot.get("result") if isinstance(slot.get("result"), int) else None
+        if "error" in health:
+            return f"Node is unhealthy: {health['error'].get('message')}"
+        if endpoint.slot is None:
+            return "Health probe returned no slot"
+        return None
+
+    async def probe_all(self) -> None:
+        """Probe every endpoint and trip or close their circuit breakers"""
+        endpoints = self.client.pool.endpoints
+        reasons = await asyncio.gather(*(self.probe(endpoint) for endpoint in endpoints))
+        self.rounds += 1
+
+        slots = [e.slot for e, reason in zip(endpoints, reasons) if reason is None]
+        best_slot = max(slots) if slots else None
+        reasons = [
+            f"Node is {best_slot - e.slot} slots behind" if reason is None and best_slot - e.slot > self.max_slot_lag else reason
+            for e, reason in zip(endpoints, reasons)
+        ]
+        for endpoint, reason in zip(endpoints, reasons):
+            if reason is None:
+                endpoint.breaker.close()
+            elif best_slot is None and 0 < self._failed_probes.get(endpoint.url, 0) < LAST_ENDPOINT_PROBE_FAILURES:
+                # No endpoint passed, and this probe may just have been lost: leave the breaker as it is for now
+                continue
+            else:
+                endpoint.breaker.trip(reason)
@@ -0,0 +1,99 @@
+"""
+Hedged requests for latency-critical RPC methods
+
+For opted-in methods, if the first endpoint has not answered within a
+percentile of that method's recent latency, a duplicate request is sent to a
+second endpoint and whichever answers first wins. A token budget caps the
+extra load hedging adds to the RPC providers.
+"""
+import collections
+from typing import Any, Deque, Dict, FrozenSet, Iterable
+
+
+class HedgeBudget:
+    """
+    Token bucket limiting hedges to a fraction of requests
+
+    Every hedgeable request adds ratio tokens (up to burst) and every hedge
+    spends one, so over time hedges stay below ratio times the request count.
+    """
+
+    def __init__(self, ratio: float, burst: float = 10.0):
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = burst if ratio > 0 else 0.0
+
+    def deposit(self) -> None:
+        self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+class HedgePolicy:
+    """Decides which requests are hedged and how long to wait before hedging"""
+
+    def __init__(
+        self,
+        methods: Iterable[str],
+        percentile: float = 95.0,
+        budget: float = 0.05,
+        min_delay: float = 0.01,
+        initial_delay: float = 0.25,
+        window: int = 256
+    ):
+        """
+        Create a hedging policy
+
+        Args:
+            methods: RPC methods that may be hedged
+            percentile: Latency percentile of recent requests after which a hedge is sent
+            budget: Maximum extra load from hedges, as a fraction of hedgeable requests
+            min_delay: Lower bound for the hedge delay in seconds
+            initial_delay: Hedge delay in seconds until enough latency samples are collected
+            window: Number of recent latency samples kept per method
+        """
+        self.methods: FrozenSet[str] = frozenset(methods)
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+        self.budget = HedgeBudget(budget)
+        self._window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.hedges_denied = 0
+
+    def accepts(self, method: str) -> bool:
+        """Whether requests for this method are hedged"""
+        return method in self.methods
+
+    def record_latency(self, method: str, latency: float) -> None:
+        """Record how long a request took to be answered"""
+        samples = self._latencies.get(method)
+        if samples is None:
+            samples = self._latencies[method] = collections.deque(maxlen=self._window)
+        samples.append(latency)
+
+    def delay(self, method: str) -> float:
+        """Seconds to wait for the first endpoint before sending a hedge"""
+        samples = self._latencies.get(method)
+        if not samples or len(samples) < 20:
+            return self.initial_delay
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(self.min_delay, ordered[index])
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hedging counters"""
+        return {
+            "methods": sorted(self.methods),
+            "delays_ms": {method: round(self.delay(method) * 1000, 3) for method in sorted(self._latencies)},
+            "hedges": self.hedges_sent,
+            "won": self.hedges_won,
+            "denied": self.hedges_denied,
+            "budget_tokens": round(self.budget.tokens, 3)
+        }
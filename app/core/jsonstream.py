@@ -0,0 +1,212 @@
+"""
+Incremental parsing of large JSON-RPC responses
+
+Responses such as getProgramAccounts for the SPL Token program are far too
+large to decode in one piece. JsonArrayStream is fed the response body chunk
+by chunk and returns the elements of one array inside the document as soon as
+each element is complete, so only one element is held in memory at a time.
+Everything outside that array (jsonrpc, id, error, context) is kept as a small
+skeleton document, with the streamed array left empty.
+"""
+import codecs
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+_STRUCTURAL = re.compile(rb'[{}\[\]",]')
+_STRING_END = re.compile(rb'["\\]')
+_SEPARATORS = re.compile(r'[\s,]*')
+
+# Pending elements larger than this are only re-parsed once the buffer has doubled
+_RETRY_THRESHOLD = 1 << 20
+
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+_COMMA = ord(",")
+_OPEN = (ord("{"), ord("["))
+_OPEN_OBJECT = ord("{")
+
+
+class JsonArrayStream:
+    """
+    Extracts the elements of an array at a given key path from a JSON document
+
+    Outside the streamed array a small scanner looks only at structural
+    characters to track key paths. Inside it, each element is decoded by the
+    C JSON decoder as soon as it is complete.
+    """
+
+    def __init__(self, paths: Iterable[Sequence[Optional[str]]]):
+        """
+        Create a stream parser
+
+        Args:
+            paths: Key paths of the array to stream, e.g. ("result",) or ("result", "value");
+                the first array found at any of them is streamed
+        """
+        self.paths = {tuple(path) for path in paths}
+        self.items = 0
+        self._decoder = json.JSONDecoder()
+        # One [is_object, last_key] entry per open container
+        self._stack: List[list] = []
+        self._skeleton = bytearray()
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[bytearray] = None
+        # State while inside the streamed array
+        self._streaming = False
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._pending = ""
+        self._retry_at = 0
+
+    def _out(self, data: bytes) -> None:
+        self._skeleton += data
+        if self._key is not None:
+            self._key += data
+
+    def _scan_string(self, data: bytes, pos: int) -> int:
+        end = len(data)
+        while pos < end:
+            if self._escape:
+                self._escape = False
+                self._out(data[pos:pos + 1])
+                pos += 1
+                continue
+            match = _STRING_END.search(data, pos)
+            stop = end if match is None else match.end()
+            self._out(data[pos:stop])
+            if match is None:
+                return end
+            pos = stop
+            if data[stop - 1] == _BACKSLASH:
+                self._escape = True
+                continue
+            self._in_string = False
+            if self._key is not None:
+                self._stack[-1][1] = json.loads(b'"' + self._key)
+                self._key = None
+            return pos
+        return pos
+
+    def _scan(self, data: bytes) -> Optional[bytes]:
+        """Scan bytes outside the streamed array; returns the rest once the array opens"""
+        pos = 0
+        end = len(data)
+        while pos < end:
+            if self._in_string:
+                pos = self._scan_string(data, pos)
+                continue
+            match = _STRUCTURAL.search(data, pos)
+            if match is None:
+                self._out(data[pos:])
+                return None
+            index = match.start()
+            self._out(data[pos:index])
+            char = data[index]
+            pos = index + 1
+
+            if char == _QUOTE:
+                self._in_string = True
+                self._out(b'"')
+                # Strings directly inside an object may be keys; the last one
+                # seen names the next child container
+                if self._stack and self._stack[-1][0]:
+                    self._key = bytearray()
+            elif char in _OPEN:
+                path = tuple(entry[1] if entry[0] else None for entry in self._stack)
+                self._stack.append([char == _OPEN_OBJECT, None])
+                self._out(data[index:pos])
+                if char != _OPEN_OBJECT and path in self.paths:
+                    self._streaming = True
+                    return data[pos:]
+            else:
+                if char != _COMMA:
+                    self._stack.pop()
+                self._out(data[index:pos])
+        return None
+
+    def _drain(self, items: List[Any]) -> Optional[bytes]:
+        """Decode complete elements; returns the rest of the document once the array closes"""
+        text = self._pending
+        pos = 0
+        end = len(text)
+        while True:
+            pos = _SEPARATORS.match(text, pos).end()
+            if pos >= end:
+                break
+            if text[pos] == "]":
+                # Bytes still buffered in the UTF-8 decoder belong after the array
+                rest = text[pos + 1:].encode("utf-8") + self._text.getstate()[0]
+                self._text.reset()
+                self._pending = ""
+                self._retry_at = 0
+                self._streaming = False
+                self._stack.pop()
+                self._skeleton += b"]"
+                return rest
+            if end < self._retry_at:
+                break
+            try:
+                item, stop = self._decoder.raw_decode(text, pos)
+            except json.JSONDecodeError:
+                # Most likely incomplete. Very large elements are retried only
+                # once the buffer has doubled so they are not re-parsed on every chunk
+                if end - pos > _RETRY_THRESHOLD:
+                    self._retry_at = pos + 2 * (end - pos)
+                break
+            if text[pos] not in '{["' and (stop == end or text[stop] not in " \t\r\n,]"):
+                # A number may continue in the next chunk ("12" then "3" or ".5")
+                break
+            items.append(item)
+            self.items += 1
+            pos = stop
+            self._retry_at = 0
+        self._pending = text[pos:]
+        self._retry_at = max(0, self._retry_at - pos)
+        return None
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Parse the next chunk of the document
+
+        Returns:
+            List[Any]: Array elements completed by this chunk
+        """
+        items: List[Any] = []
+        data: Optional[bytes] = chunk
+        while data:
+            if self._streaming:
+                self._pending += self._text.decode(data)
+                data = self._drain(items)
+            else:
+                data = self._scan(data)
+        return items
+
+    def finish(self) -> List[Any]:
+        """
+        Signal the end of the body
+
+        Returns:
+            List[Any]: Elements that were held back waiting for more data
+        """
+        items: List[Any] = []
+        if self._streaming:
+            self._retry_at = 0
+            rest = self._drain(items)
+            if rest:
+                self.feed(rest)
+        return items
+
+    def close(self) -> Dict[str, Any]:
+        """
+        Return the rest of the document, after finish()
+
+        Returns:
+            Dict[str, Any]: The document without the streamed array's elements
+
+        Raises:
+            ValueError: If the document is incomplete or not valid JSON
+        """
+        if self._stack or self._in_string or self._pending:
+            raise ValueError("Incomplete JSON document")
+        return json.loads(self._skeleton)
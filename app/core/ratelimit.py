@@ -0,0 +1,242 @@
+"""
+Client-side rate limiting and adaptive concurrency toward RPC providers
+
+Each endpoint has a token bucket and an adaptive concurrency limit per method
+class, so heavy methods such as getProgramAccounts and getBlock have their own
+budget and cannot starve cheap calls. The concurrency limit follows AIMD
+(additive increase, multiplicative decrease): it shrinks when the provider
+answers 429 or latency rises well above its baseline, and grows back by about
+one slot per round trip while requests succeed.
+"""
+import asyncio
+import collections
+import time
+from typing import Any, Deque, Dict, Optional
+
+# Methods with large responses or expensive server-side scans
+HEAVY_METHODS = frozenset({
+    "getBlock",
+    "getBlocks",
+    "getBlocksWithLimit",
+    "getClusterNodes",
+    "getLargestAccounts",
+    "getLeaderSchedule",
+    "getMultipleAccounts",
+    "getProgramAccounts",
+    "getSignaturesForAddress",
+})
+
+LIGHT = "light"
+HEAVY = "heavy"
+
+
+def method_class(method: str) -> str:
+    """Return the rate limit class of an RPC method"""
+    return HEAVY if method in HEAVY_METHODS else LIGHT
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at a fixed rate
+
+    Tokens are reserved as soon as acquire() is called and the caller then
+    sleeps off any deficit, so waiting callers are served in arrival order and
+    a request for more tokens than the burst size (a large batch) still passes.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Create a token bucket
+
+        Args:
+            rate: Tokens added per second (0 disables the bucket)
+            burst: Bucket capacity (defaults to one second of tokens)
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until the requested number of tokens is available"""
+        if self.rate <= 0:
+            return
+        self._refill(time.monotonic())
+        self.tokens -= tokens
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests for a while (e.g. after a Retry-After header)"""
+        if self.rate <= 0:
+            return
+        self._refill(time.monotonic())
+        self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+class AdaptiveConcurrencyLimit:
+    """Concurrency limit adjusted with additive increase, multiplicative decrease"""
+
+    def __init__(
+        self,
+        initial: int = 32,
+        minimum: int = 1,
+        maximum: int = 256,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0
+    ):
+        """
+        Create a concurrency limit
+
+        Args:
+            initial: Starting number of concurrent requests
+            minimum: Lower bound for the limit
+            maximum: Upper bound for the limit
+            backoff: Factor the limit is multiplied by on overload
+            latency_tolerance: Recent latency above this multiple of the baseline counts as overload
+        """
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        # Slow and fast moving latency averages; single outliers do not count as overload
+        self.baseline: Optional[float] = None
+        self.recent: Optional[float] = None
+        self.inflight = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._waiters: Deque[asyncio.Future] = collections.deque()
+
+    async def acquire(self) -> None:
+        """Wait for a free slot"""
+        while self.inflight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                else:
+                    # Pass the wake-up on to the next waiter
+                    self._wake()
+                raise
+        self.inflight += 1
+
+    def release(self, latency: Optional[float] = None, throttled: bool = False) -> None:
+        """
+        Free a slot and adjust the limit
+
+        Args:
+            latency: Seconds the request took, or None if it failed without a response
+            throttled: Whether the provider rejected the request with 429
+        """
+        self.inflight -= 1
+        now = time.monotonic()
+        if latency is not None and not throttled:
+            if self.baseline is None:
+                self.baseline = self.recent = latency
+            else:
+                self.baseline = 0.98 * self.baseline + 0.02 * latency
+                self.recent = 0.8 * self.recent + 0.2 * latency
+        overloaded = throttled or (
+            latency is not None
+            and self.recent is not None
+            and self.recent > self.latency_tolerance * self.baseline
+        )
+
+        if overloaded:
+            # Decrease at most once per round trip so one burst of 429s counts once
+            if now - self._last_decrease >= max(0.1, self.baseline or 0.0):
+                self.limit = max(float(self.minimum), self.limit * self.backoff)
+                self._last_decrease = now
+                self.decreases += 1
+        elif latency is not None:
+            self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+
+        self._wake()
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.inflight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "inflight": self.inflight,
+            "waiting": len(self._waiters),
+            "decreases": self.decreases,
+            "latency_ms": round(self.recent * 1000, 3) if self.recent is not None else None
+        }
+
+
+class EndpointLimiter:
+    """Rate and concurrency limits for one endpoint, split by method class"""
+
+    def __init__(
+        self,
+        rate: float,
+        heavy_rate: float,
+        initial_concurrency: int = 32,
+        max_concurrency: int = 256
+    ):
+        """
+        Create the limits for one endpoint
+
+        Args:
+            rate: Requests per second for light methods (0 for no limit)
+            heavy_rate: Requests per second for heavy methods (0 for no limit)
+            initial_concurrency: Starting concurrency limit per method class
+            max_concurrency: Upper bound for the concurrency limit per method class
+        """
+        self.buckets = {
+            LIGHT: TokenBucket(rate),
+            HEAVY: TokenBucket(heavy_rate)
+        }
+        self.concurrency = {
+            LIGHT: AdaptiveConcurrencyLimit(initial_concurrency, maximum=max_concurrency),
+            HEAVY: AdaptiveConcurrencyLimit(initial_concurrency, maximum=max_concurrency)
+        }
+        self.throttled = 0
+
+    async def acquire(self, cls: str, requests: int = 1) -> None:
+        """
+        Wait until a request of the given class may be sent
+
+        Args:
+            cls: Method class (light or heavy)
+            requests: Number of RPC calls carried by the HTTP request (batch size)
+        """
+        await self.buckets[cls].acquire(requests)
+        await self.concurrency[cls].acquire()
+
+    def release(
+        self,
+        cls: str,
+        latency: Optional[float] = None,
+        throttled: bool = False,
+        retry_after: Optional[float] = None
+    ) -> None:
+        """Report the outcome of a request acquired with acquire()"""
+        if throttled:
+            self.throttled += 1
+            if retry_after:
+                for bucket in self.buckets.values():
+                    bucket.pause(retry_after)
+        self.concurrency[cls].release(latency, throttled)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "throttled": self.throttled,
+            LIGHT: self.concurrency[LIGHT].stats(),
+            HEAVY: self.concurrency[HEAVY].stats()
+        }
@@ -0,0 +1,117 @@
+"""
+Deadlines and retries for RPC requests
+
+Every request gets a per-method timeout (longer for heavy methods such as
+getBlock and getProgramAccounts), bounded by an optional caller deadline that
+flows down to the HTTP request. Failures that are worth trying again (connection
+resets, 429, 5xx, and nodes that are behind) are retried with exponential
+backoff and full jitter, on a different endpoint where possible.
+"""
+import contextlib
+import contextvars
+import random
+import time
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+
+# JSON-RPC error codes returned by nodes that are unhealthy or behind
+RETRYABLE_RPC_ERRORS = frozenset({
+    -32005,  # Node is unhealthy / behind
+    -32016,  # Minimum context slot has not been reached
+})
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("rpc_deadline", default=None)
+
+
+class DeadlineExceededError(Exception):
+    """Raised when an RPC request does not finish before its deadline"""
+
+
+@contextlib.contextmanager
+def rpc_deadline(seconds: float) -> Iterator[None]:
+    """
+    Bound every RPC request made inside the block by a deadline
+
+    Nested deadlines can only shorten the enclosing one.
+
+    Args:
+        seconds: Seconds from now until the deadline
+    """
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> Optional[float]:
+    """Return the monotonic deadline set by the caller, if any"""
+    return _deadline.get()
+
+
+def retry_after(response: httpx.Response) -> Optional[float]:
+    """Return the Retry-After delay of a response in seconds, if it has one"""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Decides which failures are retried and how long to back off"""
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.1, max_delay: float = 2.0):
+        """
+        Create a retry policy
+
+        Args:
+            max_retries: Retries after the first attempt (0 disables retrying)
+            base_delay: Backoff cap in seconds for the first retry, doubled for every further retry
+            max_delay: Upper bound for the backoff in seconds
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self.exhausted = 0
+
+    @staticmethod
+    def retryable_error(error: BaseException) -> bool:
+        """Whether a request that raised this error may be retried"""
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            return status == 429 or status >= 500
+        # Connection resets and refused connections; read timeouts are not
+        # retried since the node may simply be slow to answer
+        return isinstance(error, (httpx.NetworkError, httpx.RemoteProtocolError, httpx.ConnectTimeout))
+
+    @staticmethod
+    def retryable_response(response: Any) -> bool:
+        """Whether a JSON-RPC response carries an error from a node that is behind"""
+        if not isinstance(response, dict) or not isinstance(response.get("error"), dict):
+            return False
+        return response["error"].get("code") in RETRYABLE_RPC_ERRORS
+
+    def backoff(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """
+        Seconds to wait before the given retry (1 for the first retry)
+
+        Uses full jitter: a uniform delay up to an exponentially growing cap,
+        but never less than a Retry-After the provider asked for.
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if isinstance(error, httpx.HTTPStatusError):
+            delay = max(delay, retry_after(error.response) or 0.0)
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_retries": self.max_retries,
+            "retries": self.retries,
+            "exhausted": self.exhausted
+        }
@@ -0,0 +1,593 @@
+"""
+Solana JSON-RPC transport
+
+All calls to the Solana RPC nodes go through a single shared async client.
+The client keeps a pool of keep-alive connections (HTTP/2 when the optional
+h2 package is installed) so tool calls do not pay a new TCP+TLS handshake
+on every request, and asks for compressed responses (see app.core.compression).
+
+Results that can never change are kept permanently on disk (see
+app.core.diskcache) and recent responses are served from a cache (see
+app.core.cache), identical
+concurrent calls share one upstream request (see app.core.singleflight) and
+concurrent calls to cheap methods are combined into JSON-RPC batches (see
+app.core.batching). Latency-critical methods may be hedged to a second
+endpoint (see app.core.hedging).
+
+The latest blockhash is refreshed in the background once it has been asked
+for (see app.core.blockhash).
+
+Each request is routed to the best of the configured endpoints (see
+app.core.endpoints), skipping endpoints that background health probes found
+unhealthy or behind (see app.core.health). Requests to each endpoint are paced
+by client-side rate and adaptive concurrency limits (see app.core.ratelimit),
+and retryable failures are retried on another endpoint within the request's
+deadline (see app.core.retry).
+"""
+import asyncio
+import itertools
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+
+import httpx
+
+from app.core.config import (
+    SOLANA_RPC_URLS,
+    SOLANA_RPC_EJECT_AFTER_FAILURES,
+    SOLANA_RPC_EJECT_SECONDS,
+    SOLANA_RPC_HEALTH_INTERVAL,
+    SOLANA_RPC_MAX_SLOT_LAG,
+    SOLANA_RPC_BREAKER_COOLDOWN,
+    SOLANA_RPC_TIMEOUT,
+    SOLANA_RPC_METHOD_TIMEOUTS,
+    SOLANA_RPC_MAX_RETRIES,
+    SOLANA_RPC_RETRY_BASE_DELAY,
+    SOLANA_RPC_RETRY_MAX_DELAY,
+    SOLANA_RPC_MAX_CONNECTIONS,
+    SOLANA_RPC_MAX_KEEPALIVE_CONNECTIONS,
+    SOLANA_RPC_KEEPALIVE_EXPIRY,
+    SOLANA_RPC_HTTP2,
+    SOLANA_RPC_COMPRESSION,
+    SOLANA_RPC_BATCH_WINDOW_MS,
+    SOLANA_RPC_BATCH_MAX_SIZE,
+    SOLANA_RPC_SINGLEFLIGHT,
+    SOLANA_RPC_CACHE_MAX_BYTES,
+    SOLANA_RPC_CACHE_TTLS,
+    SOLANA_RPC_DISK_CACHE,
+    SOLANA_BLOCKHASH_REFRESH_INTERVAL,
+    SOLANA_BLOCKHASH_IDLE_SECONDS,
+    SOLANA_RPC_HEDGE_METHODS,
+    SOLANA_RPC_HEDGE_PERCENTILE,
+    SOLANA_RPC_HEDGE_BUDGET,
+    SOLANA_RPC_RATE_LIMIT,
+    SOLANA_RPC_HEAVY_RATE_LIMIT,
+    SOLANA_RPC_INITIAL_CONCURRENCY,
+    SOLANA_RPC_MAX_CONCURRENCY,
+)
+from app.core.batching import RpcBatcher
+from app.core.blockhash import BlockhashTracker
+from app.core.cache import ResponseCache
+from app.core.compression import TransferStats, accept_encoding
+from app.core.diskcache import PERMANENT_METHODS, DiskStore
+from app.core.endpoints import EndpointPool, RpcEndpoint
+from app.core.health import HealthProber
+from app.core.hedging import HedgePolicy
+from app.core.jsonstream import JsonArrayStream
+from app.core.ratelimit import HEAVY, LIGHT, EndpointLimiter, method_class
+from app.core.retry import DeadlineExceededError, RetryPolicy, current_deadline, retry_after
+from app.core.singleflight import SingleFlight, canonical_key
+
+
+def _http2_available() -> bool:
+    """Check whether the optional h2 package needed by httpx for HTTP/2 is installed"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class SolanaRpcClient:
+    """Async JSON-RPC client backed by a long-lived connection pool"""
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        urls: Optional[List[str]] = None,
+        timeout: float = SOLANA_RPC_TIMEOUT,
+        method_timeouts: Optional[Dict[str, float]] = None,
+        max_retries: int = SOLANA_RPC_MAX_RETRIES,
+        retry_base_delay: float = SOLANA_RPC_RETRY_BASE_DELAY,
+        retry_max_delay: float = SOLANA_RPC_RETRY_MAX_DELAY,
+        max_connections: int = SOLANA_RPC_MAX_CONNECTIONS,
+        max_keepalive_connections: int = SOLANA_RPC_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = SOLANA_RPC_KEEPALIVE_EXPIRY,
+        http2: bool = SOLANA_RPC_HTTP2,
+        compression: bool = SOLANA_RPC_COMPRESSION,
+        batch_window_ms: float = SOLANA_RPC_BATCH_WINDOW_MS,
+        batch_max_size: int = SOLANA_RPC_BATCH_MAX_SIZE,
+        singleflight: bool = SOLANA_RPC_SINGLEFLIGHT,
+        cache_max_bytes: int = SOLANA_RPC_CACHE_MAX_BYTES,
+        cache_ttls: Optional[Dict[str, Any]] = None,
+        disk_cache: str = SOLANA_RPC_DISK_CACHE,
+        blockhash_refresh_interval: float = SOLANA_BLOCKHASH_REFRESH_INTERVAL,
+        eject_after_failures: int = SOLANA_RPC_EJECT_AFTER_FAILURES,
+        eject_seconds: float = SOLANA_RPC_EJECT_SECONDS,
+        health_interval: float = SOLANA_RPC_HEALTH_INTERVAL,
+        max_slot_lag: int = SOLANA_RPC_MAX_SLOT_LAG,
+        breaker_cooldown: float = SOLANA_RPC_BREAKER_COOLDOWN,
+        hedge_methods: Optional[List[str]] = None,
+        hedge_percentile: float = SOLANA_RPC_HEDGE_PERCENTILE,
+        hedge_budget: float = SOLANA_RPC_HEDGE_BUDGET,
+        rate_limit: float = SOLANA_RPC_RATE_LIMIT,
+        heavy_rate_limit: float = SOLANA_RPC_HEAVY_RATE_LIMIT,
+        initial_concurrency: int = SOLANA_RPC_INITIAL_CONCURRENCY,
+        max_concurrency: int = SOLANA_RPC_MAX_CONCURRENCY,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Create a client for one or more Solana RPC nodes
+
+        Args:
+            url: A single RPC node URL
+            urls: RPC node URLs to route between (defaults to the configured pool)
+            timeout: Default request timeout in seconds
+            method_timeouts: Per-method request timeouts in seconds (defaults to the configured overrides)
+            max_retries: Retries of retryable failures after the first attempt
+            retry_base_delay: Backoff cap in seconds for the first retry
+            retry_max_delay: Upper bound for the retry backoff in seconds
+            max_connections: Maximum number of concurrent connections in the pool
+            max_keepalive_connections: Maximum number of idle connections kept open
+            keepalive_expiry: Seconds an idle connection is kept before being closed
+            http2: Negotiate HTTP/2 when the h2 package is available
+            compression: Ask for gzip/deflate (and brotli when available) compressed responses
+            batch_window_ms: Milliseconds to collect concurrent calls into one batch (0 disables batching)
+            batch_max_size: Maximum number of calls per batch
+            singleflight: Share one upstream request among concurrent identical calls
+            cache_max_bytes: Size bound of the response cache in bytes (0 disables caching)
+            cache_ttls: Per-method cache TTL overrides in seconds (defaults to the configured overrides)
+            disk_cache: Path of the permanent store for immutable results (empty disables it)
+            blockhash_refresh_interval: Seconds between background refreshes of the latest blockhash (0 disables them)
+            eject_after_failures: Consecutive failures after which an endpoint is ejected
+            eject_seconds: Base ejection period in seconds
+            health_interval: Seconds between background health probes (0 disables probing)
+            max_slot_lag: Slots an endpoint may lag behind the best endpoint before its breaker trips
+            breaker_cooldown: Seconds before an open circuit breaker lets a trial request through
+            hedge_methods: Methods that may be hedged to a second endpoint (defaults to the configured list)
+            hedge_percentile: Latency percentile after which a hedge is sent
+            hedge_budget: Maximum extra load from hedges, as a fraction of hedgeable requests
+            rate_limit: Requests per second per endpoint for light methods (0 for no limit)
+            heavy_rate_limit: Requests per second per endpoint for heavy methods (0 for no limit)
+            initial_concurrency: Starting concurrency limit per endpoint and method class
+            max_concurrency: Upper bound for the adaptive concurrency limit
+            transport: Optional custom httpx transport (used by tests)
+        """
+        self.pool = EndpointPool(
+            urls or ([url] if url else SOLANA_RPC_URLS),
+            eject_after_failures=eject_after_failures,
+            eject_seconds=eject_seconds,
+            breaker_cooldown=breaker_cooldown
+        )
+        self.timeout = timeout
+        self.method_timeouts = SOLANA_RPC_METHOD_TIMEOUTS if method_timeouts is None else method_timeouts
+        self.retry = RetryPolicy(max_retries, retry_base_delay, retry_max_delay)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2 and _http2_available()
+        self.accept_encoding = accept_encoding(compression)
+        self.transfer = TransferStats()
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._ids = itertools.count(1)
+        self.batcher: Optional[RpcBatcher] = None
+        if batch_window_ms > 0 and batch_max_size > 1:
+            self.batcher = RpcBatcher(self.post, batch_window_ms / 1000, batch_max_size)
+        self.singleflight: Optional[SingleFlight] = SingleFlight() if singleflight else None
+        self.cache: Optional[ResponseCache] = None
+        if cache_max_bytes > 0:
+            self.cache = ResponseCache(cache_max_bytes, SOLANA_RPC_CACHE_TTLS if cache_ttls is None else cache_ttls)
+        self.disk: Optional[DiskStore] = DiskStore(disk_cache) if disk_cache else None
+        self.blockhashes: Optional[BlockhashTracker] = None
+        if blockhash_refresh_interval > 0:
+            self.blockhashes = BlockhashTracker(self, blockhash_refresh_interval, SOLANA_BLOCKHASH_IDLE_SECONDS)
+        self.prober: Optional[HealthProber] = None
+        if health_interval > 0:
+            self.prober = HealthProber(self, health_interval, max_slot_lag)
+        self.hedging = HedgePolicy(
+            SOLANA_RPC_HEDGE_METHODS if hedge_methods is None else hedge_methods,
+            percentile=hedge_percentile,
+            budget=hedge_budget
+        )
+        self.limiters: Dict[str, EndpointLimiter] = {
+            endpoint.url: EndpointLimiter(rate_limit, heavy_rate_limit, initial_concurrency, max_concurrency)
+            for endpoint in self.pool.endpoints
+        }
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The underlying httpx client, created on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                headers={"Accept-Encoding": self.accept_encoding},
+                transport=self._transport
+            )
+        return self._client
+
+    def next_id(self) -> int:
+        """Return a request id that is unique for this client"""
+        return next(self._ids)
+
+    def method_timeout(self, method: str) -> float:
+        """Return the timeout in seconds for one attempt of a request"""
+        return self.method_timeouts.get(method, self.timeout)
+
+    async def request(
+        self,
+        method: str,
+        params: Optional[List[Any]] = None,
+        timeout: Optional[float] = None,
+        cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Send a single JSON-RPC request
+
+        Args:
+            method: The JSON-RPC method name
+            params: The method parameters
+            timeout: Seconds the caller is willing to wait, including retries
+                (combined with any enclosing rpc_deadline)
+            cache: Whether the response may be served from and stored in the
+                response cache and the permanent store (False for bulk scans
+                that would only evict everything else)
+
+        Returns:
+            Dict[str, Any]: The decoded JSON-RPC response, containing either "result" or "error"
+
+        Raises:
+            DeadlineExceededError: If the request does not finish before the deadline
+        """
+        if self.prober is not None:
+            self.prober.start()
+
+        deadline = current_deadline()
+        if timeout is not None:
+            expires = time.monotonic() + timeout
+            deadline = expires if deadline is None else min(deadline, expires)
+
+        key = canonical_key(method, params)
+        ttl = 0.0
+        if self.cache is not None and cache:
+            ttl = self.cache.ttl(method, params, self.rooted_slot())
+            if ttl > 0:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    return cached
+        persist = cache and self.disk is not None and method in PERMANENT_METHODS
+        if persist:
+            # Stored blocks can take megabytes: read and decode them off the event loop
+            result = await asyncio.to_thread(self.disk.get, method, params)
+            if result is not None:
+                response = {"jsonrpc": "2.0", "result": result, "id": self.next_id()}
+                if ttl > 0:
+                    self.cache.put(key, response, ttl)
+                return response
+
+        if self.singleflight is not None:
+            call = self.singleflight.do(key, lambda: self._fetch(method, params, deadline, key, ttl, persist))
+        else:
+            call = self._fetch(method, params, deadline, key, ttl, persist)
+        if deadline is None:
+            return await call
+
+        try:
+            return await asyncio.wait_for(call, max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError(f"{method} did not complete before its deadline") from None
+
+    async def _fetch(
+        self,
+        method: str,
+        params: Optional[List[Any]],
+        deadline: Optional[float],
+        key: Any,
+        ttl: float,
+        persist: bool
+    ) -> Dict[str, Any]:
+        response = await self._request(method, params, deadline)
+        if ttl > 0:
+            self.cache.put(key, response, ttl)
+        if persist:
+            await asyncio.to_thread(self._persist, method, params, response, self.rooted_slot())
+        return response
+
+    def _persist(self, method: str, params: Optional[List[Any]], response: Dict[str, Any], rooted_slot: Optional[int]) -> None:
+        """Store a response permanently if it can never change; runs in a worker thread"""
+        self.disk.observe_rooted_slot(rooted_slot)
+        self.disk.put(method, params, response)
+
+    def rooted_slot(self) -> Optional[int]:
+        """The highest slot known to be rooted: from the disk store, or the finalized slot health probes report"""
+        slots = [e.slot for e in self.pool.endpoints if e.slot is not None]
+        if self.disk is not None and self.disk.rooted_slot is not None:
+            slots.append(self.disk.rooted_slot)
+        return max(slots, default=None)
+
+    async def _request(self, method: str, params: Optional[List[Any]], deadline: Optional[float]) -> Dict[str, Any]:
+        tried: List[RpcEndpoint] = []
+        attempt = 0
+        while True:
+            payload = {
+                "jsonrpc": "2.0",
+                "id": self.next_id(),
+                "method": method,
+                "params": params if params is not None else []
+            }
+            timeout = self.method_timeout(method)
+            if deadline is not None:
+                timeout = min(timeout, max(0.0, deadline - time.monotonic()))
+
+            error: Optional[Exception] = None
+            response: Any = None
+            try:
+                # Hedged methods skip the batch window: they are sent on their own so
+                # that a duplicate can be raced against a second endpoint. Retries
+                # are sent on their own to an endpoint not tried yet.
+                if attempt == 0 and self.hedging.accepts(method) and len(self.pool.endpoints) > 1:
+                    response = await self._hedged(method, payload, timeout)
+                elif attempt == 0 and self.batcher is not None and self.batcher.accepts(method):
+                    response = await self.batcher.submit(payload)
+                else:
+                    if len(tried) >= len(self.pool.endpoints):
+                        tried.clear()
+                    endpoint = self.pool.choose(exclude=tried)
+                    tried.append(endpoint)
+                    response = await self._post_to(endpoint, payload, timeout)
+            except Exception as e:
+                if not self.retry.retryable_error(e):
+                    raise
+                error = e
+            else:
+                if not self.retry.retryable_response(response):
+                    return response
+
+            attempt += 1
+            delay = self.retry.backoff(attempt, error)
+            if attempt > self.retry.max_retries or (deadline is not None and time.monotonic() + delay >= deadline):
+                self.retry.exhausted += 1
+                if error is not None:
+                    raise error
+                return response
+            self.retry.retries += 1
+            await asyncio.sleep(delay)
+
+    async def _hedged(self, method: str, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        start = time.monotonic()
+        self.hedging.budget.deposit()
+        first = self.pool.choose()
+        tasks = [asyncio.ensure_future(self._post_to(first, payload, timeout))]
+
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedging.delay(method))
+            if not done:
+                second = self.pool.choose(exclude=[first])
+                if second is not first and second.is_available(time.monotonic()) and self.hedging.budget.withdraw():
+                    tasks.append(asyncio.ensure_future(self._post_to(second, payload, timeout)))
+                    self.hedging.hedges_sent += 1
+                else:
+                    self.hedging.hedges_denied += 1
+
+            # The first successful answer wins; a failure waits for the other request
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not tasks[0]:
+                            self.hedging.hedges_won += 1
+                        self.hedging.record_latency(method, time.monotonic() - start)
+                        return task.result()
+            return tasks[0].result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def post(self, body: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Any:
+        """
+        Post a JSON-RPC request object or batch array to the best available endpoint
+
+        Args:
+            body: A single request payload or a list of payloads
+
+        Returns:
+            Any: The decoded JSON response (a list for batch requests)
+        """
+        items = body if isinstance(body, list) else [body]
+        timeout = max(self.method_timeout(item["method"]) for item in items)
+        return await self._post_to(self.pool.choose(), body, timeout)
+
+    async def _post_to(
+        self,
+        endpoint: RpcEndpoint,
+        body: Union[Dict[str, Any], List[Dict[str, Any]]],
+        timeout: float
+    ) -> Any:
+        limiter = self.limiters[endpoint.url]
+        methods = [item["method"] for item in body] if isinstance(body, list) else [body["method"]]
+        cls = HEAVY if any(method_class(method) == HEAVY for method in methods) else LIGHT
+        await limiter.acquire(cls, len(methods))
+
+        endpoint.inflight += 1
+        start = time.monotonic()
+        latency: Optional[float] = None
+        delay: Optional[float] = None
+        throttled = False
+        try:
+            response = await self.client.post(endpoint.url, json=body, timeout=timeout)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            self.pool.record_failure(endpoint, time.monotonic() - start)
+            throttled = e.response.status_code == 429
+            delay = retry_after(e.response)
+            raise
+        except httpx.TransportError:
+            self.pool.record_failure(endpoint, time.monotonic() - start)
+            raise
+        except asyncio.CancelledError:
+            self.pool.record_cancelled(endpoint, time.monotonic() - start)
+            raise
+        else:
+            latency = time.monotonic() - start
+            self.pool.record_success(endpoint, latency)
+        finally:
+            endpoint.inflight -= 1
+            limiter.release(cls, latency, throttled, delay)
+        self.transfer.record(methods, response.num_bytes_downloaded, len(response.content))
+        return response.json()
+
+    async def stream(
+        self,
+        method: str,
+        params: Optional[List[Any]],
+        parser: JsonArrayStream,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Send a JSON-RPC request and yield the elements of a large array in its response as they arrive
+
+        Streamed requests bypass singleflight, batching and hedging, and are not
+        retried since elements may already have been consumed. Once iteration
+        finishes, parser.close() returns the rest of the response (id, error, context).
+
+        Args:
+            method: The JSON-RPC method name
+            params: The method parameters
+            parser: Parser set up with the key path of the array to stream
+            timeout: Seconds the caller is willing to wait for the whole response
+
+        Yields:
+            Any: Decoded array elements, one at a time
+
+        Raises:
+            DeadlineExceededError: If the response does not finish before the deadline
+        """
+        if self.prober is not None:
+            self.prober.start()
+        deadline = current_deadline()
+        if timeout is not None:
+            expires = time.monotonic() + timeout
+            deadline = expires if deadline is None else min(deadline, expires)
+
+        payload = {
+            "jsonrpc": "2.0",
+            "id": self.next_id(),
+            "method": method,
+            "params": params if params is not None else []
+        }
+        endpoint = self.pool.choose()
+        limiter = self.limiters[endpoint.url]
+        cls = method_class(method)
+        await limiter.acquire(cls)
+
+        # httpx applies the timeout to each read, so it bounds stalls rather than the whole transfer
+        read_timeout = self.method_timeout(method)
+        if deadline is not None:
+            read_timeout = min(read_timeout, max(0.0, deadline - time.monotonic()))
+
+        endpoint.inflight += 1
+        start = time.monotonic()
+        latency: Optional[float] = None
+        delay: Optional[float] = None
+        throttled = False
+        decoded = 0
+        try:
+            async with self.client.stream("POST", endpoint.url, json=payload, timeout=read_timeout) as response:
+                response.raise_for_status()
+                latency = time.monotonic() - start
+                self.pool.record_success(endpoint, latency)
+                async for chunk in response.aiter_bytes():
+                    decoded += len(chunk)
+                    for item in parser.feed(chunk):
+                        yield item
+                    if deadline is not None and time.monotonic() > deadline:
+                        raise DeadlineExceededError(f"{method} did not complete before its deadline")
+                for item in parser.finish():
+                    yield item
+                self.transfer.record([method], response.num_bytes_downloaded, decoded)
+        except httpx.HTTPStatusError as e:
+            self.pool.record_failure(endpoint, time.monotonic() - start)
+            throttled = e.response.status_code == 429
+            delay = retry_after(e.response)
+            raise
+        except httpx.TransportError:
+            if latency is None:
+                self.pool.record_failure(endpoint, time.monotonic() - start)
+            raise
+        except (asyncio.CancelledError, GeneratorExit):
+            if latency is None:
+                self.pool.record_cancelled(endpoint, time.monotonic() - start)
+            raise
+        finally:
+            endpoint.inflight -= 1
+            limiter.release(cls, latency, throttled, delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters for the transport layers"""
+        return {
+            "endpoints": self.pool.stats(),
+            "http2": self.http2,
+            "accept_encoding": self.accept_encoding,
+            "transfer": self.transfer.stats(),
+            "batching": self.batcher.stats() if self.batcher is not None else None,
+            "singleflight": self.singleflight.stats() if self.singleflight is not None else None,
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "disk_cache": self.disk.stats() if self.disk is not None else None,
+            "blockhash": self.blockhashes.stats() if self.blockhashes is not None else None,
+            "hedging": self.hedging.stats(),
+            "retries": self.retry.stats(),
+            "limits": {url: limiter.stats() for url, limiter in self.limiters.items()}
+        }
+
+    async def aclose(self) -> None:
+        """Stop background probing and refreshing and close all pooled connections"""
+        if self.prober is not None:
+            await self.prober.stop()
+        if self.blockhashes is not None:
+            await self.blockhashes.stop()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_rpc_client: Optional[SolanaRpcClient] = None
+
+
+def get_rpc_client() -> SolanaRpcClient:
+    """Return the shared RPC client, creating it from configuration on first use"""
+    global _rpc_client
+    if _rpc_client is None:
+        _rpc_client = SolanaRpcClient()
+    return _rpc_client
+
+
+def set_rpc_client(client: Optional[SolanaRpcClient]) -> None:
+    """Replace the shared RPC client (None resets it to the configured default)"""
+    global _rpc_client
+    _rpc_client = client
+
+
+async def rpc_request(
+    method: str,
+    params: Optional[List[Any]] = None,
+    timeout: Optional[float] = None,
+    cache: bool = True
+) -> Dict[str, Any]:
+    """Send a JSON-RPC request through the shared client"""
+    return await get_rpc_client().request(method, params, timeout, cache)
+
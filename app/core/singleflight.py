@@ -0,0 +1,75 @@
+"""
+Coalescing of identical in-flight RPC requests
+
+When several callers ask for the same (method, params) while a request for it
+is already in flight, they all wait for that request instead of sending their
+own. Every caller receives the same decoded response.
+"""
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+def canonical_key(method: str, params: Optional[List[Any]] = None) -> Tuple[str, str]:
+    """
+    Build a canonical key for a JSON-RPC call
+
+    Config objects are serialized with sorted keys so that calls which only
+    differ in key order map to the same key.
+
+    Args:
+        method: The JSON-RPC method name
+        params: The method parameters
+
+    Returns:
+        Tuple[str, str]: The method and its canonical JSON-encoded params
+    """
+    encoded = json.dumps(params if params is not None else [], sort_keys=True, separators=(",", ":"))
+    return method, encoded
+
+
+class SingleFlight:
+    """Shares one in-flight call among all concurrent callers with the same key"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.saved = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() unless a call with the same key is already in flight
+
+        Args:
+            key: Identity of the call
+            fn: Coroutine function performing the call
+
+        Returns:
+            Any: The result of the shared call
+        """
+        self.calls += 1
+        future = self._inflight.get(key)
+        if future is not None:
+            self.saved += 1
+        else:
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+
+        # Shield so that a cancelled caller does not cancel the call for everyone else
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not future.cancelled():
+            future.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """Return call counters"""
+        return {
+            "calls": self.calls,
+            "saved": self.saved,
+            "inflight": len(self._inflight)
+        }
@@ -1,7 +1,7 @@
 """
 Solana data models
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import List, Optional, Union, Any, Dict
 
 
@@ -15,6 +15,24 @@ class SolanaBalanceResponse(BaseModel):
     error: dict = Field(None, description="Error details if status is error")
 
 
+class SolanaWalletBalance(BaseModel):
+    """Model for the balance of one address"""
+    address: str = Field(description="The Solana wallet address")
+    balance_lamports: int = Field(description="Balance in lamports, 0 for accounts that do not exist")
+    balance_sol: float = Field(description="Balance in SOL")
+
+
+class SolanaBalancesResponse(BaseModel):
+    """Response model for bulk Solana balance queries"""
+    status: str
+    balances: Optional[List[SolanaWalletBalance]] = Field(None, description="Balance of each address, in the order given")
+    total_lamports: Optional[int] = Field(None, description="Sum of the balances of the distinct addresses in lamports")
+    total_sol: Optional[float] = Field(None, description="Sum of the balances of the distinct addresses in SOL")
+    contextSlotRange: Optional[List[int]] = Field(None, description="Lowest and highest slot the balances were read at")
+    message: Optional[str] = Field(None, description="Error message if status is error")
+    error: Optional[dict] = Field(None, description="Error details if status is error")
+
+
 class SolanaAccountData(BaseModel):
     """Model for account data in different encoding formats"""
     data: Union[List[str], dict] = Field(description="Account data in the specified encoding format")
@@ -22,7 +40,7 @@ class SolanaAccountData(BaseModel):
     lamports: int = Field(description="Number of lamports assigned to this account")
     owner: str = Field(description="Base-58 encoded Pubkey of the program this account has been assigned to")
     rentEpoch: int = Field(description="The epoch at which this account will next owe rent")
-    space: int = Field(description="The data size of the account")
+    space: int = Field(0, description="The data size of the account")
 
 
 class SolanaAccountInfoResponse(BaseModel):
@@ -49,7 +67,7 @@ class SolanaTransactionInBlock(BaseModel):
     """Model for transaction in block"""
     meta: SolanaTransactionMeta = Field(description="Transaction metadata")
     transaction: Dict = Field(description="Transaction details including signatures and account keys")
-    version: Optional[int] = Field(None, description="Transaction version")
+    version: Optional[Union[int, str]] = Field(None, description="Transaction version (a number, or \"legacy\")")
 
 
 class SolanaBlockResponse(BaseModel):
@@ -63,6 +81,8 @@ class SolanaBlockResponse(BaseModel):
     transactions: Optional[List[SolanaTransactionInBlock]] = Field(None, description="An array of transactions and transaction statuses")
     rewards: Optional[List] = Field(None, description="Block rewards if requested")
     slot: Optional[int] = Field(None, description="The slot index of this block")
+    transactionCount: Optional[int] = Field(None, description="Number of transactions in the block, when transactions were filtered")
+    droppedTransactions: Optional[int] = Field(None, description="Number of transactions dropped by the filters")
     message: Optional[str] = Field(None, description="Error message if status is error")
     error: Optional[dict] = Field(None, description="Error details if status is error")
 
@@ -71,6 +91,31 @@ class SolanaBlocksResponse(BaseModel):
     """Response model for Solana blocks queries"""
     status: str
     blocks: Optional[List[int]] = Field(None, description="List of available block slot numbers")
+    blockCount: Optional[int] = Field(None, description="Number of blocks (compact output)")
+    runs: Optional[List[List[int]]] = Field(None, description="First and last slot of every run of consecutive blocks (compact output)")
+    skipped: Optional[List[int]] = Field(None, description="Slots between the first and the last block without a block (compact output)")
+    message: Optional[str] = Field(None, description="Error message if status is error")
+    error: Optional[dict] = Field(None, description="Error details if status is error")
+
+
+class SolanaSlotSkippedResponse(BaseModel):
+    """Response model for skipped-slot lookups"""
+    status: str
+    slot: Optional[int] = Field(None, description="The slot looked up")
+    skipped: Optional[bool] = Field(None, description="Whether the slot was skipped (has no finalized block)")
+    message: Optional[str] = Field(None, description="Error message if status is error")
+    error: Optional[dict] = Field(None, description="Error details if status is error")
+
+
+class SolanaSkipRateResponse(BaseModel):
+    """Response model for skip rates over a slot range"""
+    status: str
+    startSlot: Optional[int] = Field(None, description="First slot counted")
+    endSlot: Optional[int] = Field(None, description="Last slot counted (at most the finalized slot)")
+    slots: Optional[int] = Field(None, description="Number of slots counted")
+    blocks: Optional[int] = Field(None, description="Number of slots with a block")
+    skipped: Optional[int] = Field(None, description="Number of skipped slots")
+    skipRate: Optional[float] = Field(None, description="Fraction of the slots that were skipped")
     message: Optional[str] = Field(None, description="Error message if status is error")
     error: Optional[dict] = Field(None, description="Error details if status is error")
 
@@ -140,6 +185,44 @@ class SolanaClusterNodesResponse(BaseModel):
     error: Optional[dict] = Field(None, description="Error details if status is error")
 
 
+class SolanaClusterNodeLookupResponse(BaseModel):
+    """Response model for cluster node directory lookups"""
+    status: str
+    revision: Optional[int] = Field(None, description="Revision of the node directory the nodes were read from")
+    nodes: Optional[List[SolanaClusterNodeInfo]] = Field(None, description="Matching nodes with the requested fields")
+    missing: Optional[List[str]] = Field(None, description="Requested pubkeys that are not in the directory")
+    message: Optional[str] = Field(None, description="Error message if status is error")
+    error: Optional[dict] = Field(None, description="Error details if status is error")
+
+
+class SolanaClusterNodeGroup(BaseModel):
+    """Model for the number of nodes sharing a version or feature set"""
+    version: Optional[str] = Field(None, description="Software version, omitted for nodes that do not advertise one")
+    featureSet: Optional[int] = Field(None, description="Feature set identifier, omitted for nodes that do not advertise one")
+    count: int = Field(description="Number of nodes in the group")
+
+
+class SolanaClusterNodeGroupsResponse(BaseModel):
+    """Response model for cluster node version and feature set counts"""
+    status: str
+    revision: Optional[int] = Field(None, description="Revision of the node directory the counts were taken from")
+    total: Optional[int] = Field(None, description="Number of nodes in the directory")
+    groups: Optional[List[SolanaClusterNodeGroup]] = Field(None, description="Node counts, largest group first")
+    message: Optional[str] = Field(None, description="Error message if status is error")
+    error: Optional[dict] = Field(None, description="Error details if status is error")
+
+
+class SolanaClusterNodeChangesResponse(BaseModel):
+    """Response model for changes to the cluster node directory"""
+    status: str
+    revision: Optional[int] = Field(None, description="Current revision of the node directory")
+    resync: Optional[bool] = Field(None, description="Whether nodes holds the full directory because the given revision is no longer kept")
+    nodes: Optional[List[SolanaClusterNodeInfo]] = Field(None, description="Nodes that joined or changed since the given revision")
+    removed: Optional[List[str]] = Field(None, description="Pubkeys of nodes that left since the given revision")
+    message: Optional[str] = Field(None, description="Error message if status is error")
+    error: Optional[dict] = Field(None, description="Error details if status is error")
+
+
 class SolanaEpochInfo(BaseModel):
     """Model for epoch information"""
     absoluteSlot: int = Field(description="The current slot")
@@ -175,6 +258,19 @@ class SolanaEpochScheduleResponse(BaseModel):
     error: Optional[dict] = Field(None, description="Error details if status is error")
 
 
+class SolanaEpochSlotsResponse(BaseModel):
+    """Response model for local epoch and slot conversions"""
+    status: str
+    slot: Optional[int] = Field(None, description="The slot that was converted")
+    epoch: Optional[int] = Field(None, description="Epoch containing the slot")
+    slotIndex: Optional[int] = Field(None, description="Index of the slot within its epoch")
+    slotsInEpoch: Optional[int] = Field(None, description="Number of slots in the epoch")
+    firstSlot: Optional[int] = Field(None, description="First slot of the epoch")
+    lastSlot: Optional[int] = Field(None, description="Last slot of the epoch")
+    message: Optional[str] = Field(None, description="Error message if status is error")
+    error: Optional[dict] = Field(None, description="Error details if status is error")
+
+
 class SolanaFeeForMessageResponse(BaseModel):
     """Response model for fee for message queries"""
     status: str
@@ -312,6 +408,19 @@ class SolanaLatestBlockhashResponse(BaseModel):
     error: Optional[dict] = Field(None, description="Error details if status is error")
 
 
+class SolanaBlockhashValidityResponse(BaseModel):
+    """Response model for local blockhash validity checks"""
+    status: str
+    blockhash: Optional[str] = Field(None, description="The blockhash that was checked")
+    known: Optional[bool] = Field(None, description="Whether the blockhash was handed out by get_latest_blockhash")
+    valid: Optional[bool] = Field(None, description="Whether the blockhash can still be used, or null if it is not known")
+    lastValidBlockHeight: Optional[int] = Field(None, description="Last block height at which the blockhash is valid")
+    estimatedBlockHeight: Optional[int] = Field(None, description="Locally tracked estimate of the current block height")
+    blocksRemaining: Optional[int] = Field(None, description="Blocks left before the blockhash expires")
+    message: Optional[str] = Field(None, description="Error message if status is error")
+    error: Optional[dict] = Field(None, description="Error details if status is error")
+
+
 class SolanaLeaderScheduleResponse(BaseModel):
     """Response model for leader schedule queries"""
     status: str
@@ -320,6 +429,21 @@ class SolanaLeaderScheduleResponse(BaseModel):
     error: Optional[dict] = Field(None, description="Error details if status is error")
 
 
+class SolanaSlotLeader(BaseModel):
+    """Model for the leader of one slot"""
+    slot: int = Field(description="Absolute slot")
+    leader: Optional[str] = Field(None, description="Identity pubkey of the slot leader")
+
+
+class SolanaSlotLeadersResponse(BaseModel):
+    """Response model for slot leader lookups"""
+    status: str
+    epoch: Optional[int] = Field(None, description="Epoch of the first slot")
+    leaders: Optional[List[SolanaSlotLeader]] = Field(None, description="Leaders of consecutive slots")
+    message: Optional[str] = Field(None, description="Error message if status is error")
+    error: Optional[dict] = Field(None, description="Error details if status is error")
+
+
 class SolanaMaxRetransmitSlotResponse(BaseModel):
     """Response model for max retransmit slot queries"""
     status: str
@@ -344,11 +468,28 @@ class SolanaMinimumBalanceForRentExemptionResponse(BaseModel):
     error: Optional[dict] = Field(None, description="Error details if status is error")
 
 
+class SolanaRentExemptMinimum(BaseModel):
+    """Model for the rent-exempt minimum of one data size"""
+    dataSize: int = Field(description="Size of account data in bytes")
+    lamports: int = Field(description="Minimum balance in lamports to be exempt from rent")
+
+
+class SolanaRentExemptMinimumsResponse(BaseModel):
+    """Response model for locally computed rent-exempt minimums"""
+    status: str
+    minimums: Optional[List[SolanaRentExemptMinimum]] = Field(None, description="Rent-exempt minimum for each data size")
+    rent: Optional[dict] = Field(None, description="Rent sysvar parameters used: lamportsPerByteYear, exemptionThreshold and burnPercent")
+    message: Optional[str] = Field(None, description="Error message if status is error")
+    error: Optional[dict] = Field(None, description="Error details if status is error")
+
+
 class SolanaMultipleAccountsResponse(BaseModel):
     """Response model for multiple accounts queries"""
     status: str
     value: Optional[List[Optional[SolanaAccountData]]] = Field(None, description="List of account information, can contain None if an address is not found")
-    context: Optional[Dict] = Field(None, description="RPC response context")
+    context: Optional[Dict] = Field(None, description="RPC response context of the chunk answered at the lowest slot")
+    minContextSlot: Optional[int] = Field(None, description="Minimum context slot every chunk of addresses was requested with")
+    contextSlotRange: Optional[List[int]] = Field(None, description="Lowest and highest slot the chunks of addresses were answered at")
     message: Optional[str] = Field(None, description="Error message if status is error")
     error: Optional[dict] = Field(None, description="Error details if status is error")
 
@@ -368,6 +509,41 @@ class SolanaProgramAccountsResponse(BaseModel):
     error: Optional[dict] = Field(None, description="Error details if status is error")
 
 
+class SolanaProgramAccountsStreamResponse(BaseModel):
+    """Response model for streamed program accounts queries"""
+    status: str
+    scanned: Optional[int] = Field(None, description="Number of accounts received from the RPC node")
+    matched: Optional[int] = Field(None, description="Number of accounts that passed the filter")
+    accounts: Optional[List[Dict[str, Any]]] = Field(None, description="Matching accounts, projected to the requested fields")
+    truncated: Optional[bool] = Field(None, description="Whether more accounts matched than were returned")
+    path: Optional[str] = Field(None, description="File the matching accounts were written to")
+    aggregate: Optional[Dict[str, Any]] = Field(None, description="Totals over the matching accounts")
+    context: Optional[Dict] = Field(None, description="RPC response context if withContext was true")
+    message: Optional[str] = Field(None, description="Error message if status is error")
+    error: Optional[dict] = Field(None, description="Error details if status is error")
+
+
+class SolanaBlockScanResponse(BaseModel):
+    """Response model for block-range scans"""
+    status: str
+    startSlot: Optional[int] = Field(None, description="First slot of the scanned range")
+    endSlot: Optional[int] = Field(None, description="Last slot of the scanned range")
+    nextSlot: Optional[int] = Field(None, description="First slot not scanned yet; every block before it has been handed to the sink")
+    complete: Optional[bool] = Field(None, description="Whether the whole range has been scanned")
+    resumed: Optional[bool] = Field(None, description="Whether the scan continued from a checkpoint")
+    scanned: Optional[int] = Field(None, description="Number of blocks scanned by this call")
+    skipped: Optional[int] = Field(None, description="Number of slots listed by getBlocks whose block was not available, in this call")
+    totalScanned: Optional[int] = Field(None, description="Number of blocks scanned including earlier calls with the same checkpoint")
+    totalSkipped: Optional[int] = Field(None, description="Number of unavailable blocks including earlier calls with the same checkpoint")
+    checkpoint: Optional[str] = Field(None, description="Checkpoint file the progress is saved to")
+    blocks: Optional[List[Dict[str, Any]]] = Field(None, description="Scanned blocks, projected to the requested fields")
+    truncated: Optional[bool] = Field(None, description="Whether more blocks were scanned than were returned")
+    path: Optional[str] = Field(None, description="File the scanned blocks were written to")
+    aggregate: Optional[Dict[str, Any]] = Field(None, description="Totals over the scanned blocks")
+    message: Optional[str] = Field(None, description="Error message if status is error")
+    error: Optional[dict] = Field(None, description="Error details if status is error")
+
+
 class SolanaPerformanceSample(BaseModel):
     """Model for performance sample data"""
     slot: int = Field(description="Slot in which sample was taken")
@@ -395,4 +571,18 @@ class SolanaRecentPrioritizationFeesResponse(BaseModel):
     status: str
     fees: Optional[List[SolanaPrioritizationFee]] = Field(None, description="List of recent prioritization fees")
     message: Optional[str] = Field(None, description="Error message if status is error")
-    error: Optional[dict] = Field(None, description="Error details if status is error") 
\ No newline at end of file
+    error: Optional[dict] = Field(None, description="Error details if status is error") 
+
+
+class SolanaRpcStatsResponse(BaseModel):
+    """Response model for RPC transport statistics"""
+    status: str
+    stats: Optional[Dict[str, Any]] = Field(None, description="Counters for each layer of the RPC transport")
+    message: Optional[str] = Field(None, description="Error message if status is error")
+    error: Optional[dict] = Field(None, description="Error details if status is error")
+
+
+# Validators of whole account lists, compiled once. A list is validated in a
+# single pydantic-core call instead of one model __init__ per account.
+ACCOUNT_DATA_LIST = TypeAdapter(List[Optional[SolanaAccountData]])
+PROGRAM_ACCOUNT_LIST = TypeAdapter(List[SolanaProgramAccount])
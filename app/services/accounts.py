@@ -0,0 +1,103 @@
+"""
+Chunked getMultipleAccounts
+
+RPC nodes accept at most MAX_ACCOUNTS_PER_REQUEST addresses per
+getMultipleAccounts call. fetch_multiple_accounts splits any number of
+addresses into chunks of that size, fetches them concurrently with bounded
+parallelism and reassembles the values in the order of the addresses.
+
+Chunks may be answered by different endpoints at different slots. To keep
+the result consistent, every chunk is sent with the same minContextSlot: the
+one given by the caller, or else the slot the first chunk was answered at.
+No chunk can then reflect an older state than the first, and the range of
+context slots actually observed is reported alongside the values.
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import SOLANA_MULTIPLE_ACCOUNTS_CONCURRENCY
+from app.core.rpc import rpc_request
+
+# Most addresses an RPC node accepts in one getMultipleAccounts call
+MAX_ACCOUNTS_PER_REQUEST = 100
+
+
+class MultipleAccountsError(Exception):
+    """Raised when the RPC node returns an error for a chunk of addresses"""
+
+    def __init__(self, message: str, error: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.error = error
+
+
+class MultipleAccountsResult:
+    """The accounts of every address, with the context slots the chunks were answered at"""
+
+    def __init__(self, values: List[Optional[Dict[str, Any]]], context: Dict[str, Any], min_context_slot: Optional[int], slots: List[int]):
+        self.values = values
+        self.context = context
+        self.min_context_slot = min_context_slot
+        self.slot_range: Optional[Tuple[int, int]] = (min(slots), max(slots)) if slots else None
+
+
+async def _fetch_chunk(addresses: List[str], config: Dict[str, Any], min_context_slot: Optional[int]) -> Dict[str, Any]:
+    if min_context_slot is not None:
+        config = dict(config, minContextSlot=min_context_slot)
+    result = await rpc_request("getMultipleAccounts", [addresses, config])
+    if "error" in result:
+        raise MultipleAccountsError(f"RPC error: {result['error']['message']}", result["error"])
+    return result["result"]
+
+
+async def fetch_multiple_accounts(
+    addresses: List[str],
+    config: Optional[Dict[str, Any]] = None,
+    min_context_slot: Optional[int] = None,
+    concurrency: int = SOLANA_MULTIPLE_ACCOUNTS_CONCURRENCY
+) -> MultipleAccountsResult:
+    """
+    Fetch the accounts of any number of addresses in concurrent chunks
+
+    Args:
+        addresses: Account addresses, in the order values are returned in
+        config: getMultipleAccounts configuration (encoding, dataSlice, commitment)
+        min_context_slot: Lowest slot any chunk may be answered at (default: the first chunk's slot)
+        concurrency: Most chunks in flight at once
+
+    Returns:
+        MultipleAccountsResult: One value per address, None for accounts that do not exist
+
+    Raises:
+        MultipleAccountsError: If the RPC node returns an error for any chunk
+    """
+    config = config or {}
+    chunks = [addresses[i:i + MAX_ACCOUNTS_PER_REQUEST] for i in range(0, len(addresses), MAX_ACCOUNTS_PER_REQUEST)] or [[]]
+
+    results: List[Dict[str, Any]] = []
+    if min_context_slot is None:
+        # The first chunk's slot pins every other chunk
+        first = await _fetch_chunk(chunks[0], config, None)
+        results.append(first)
+        min_context_slot = first["context"]["slot"]
+        chunks = chunks[1:]
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(chunk: List[str]) -> Dict[str, Any]:
+        async with semaphore:
+            return await _fetch_chunk(chunk, config, min_context_slot)
+
+    tasks = [asyncio.ensure_future(fetch(chunk)) for chunk in chunks]
+    try:
+        results.extend(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    values: List[Optional[Dict[str, Any]]] = []
+    for result in results:
+        values.extend(result["value"])
+    slots = [result["context"]["slot"] for result in results]
+    context = min((result["context"] for result in results), key=lambda context: context["slot"])
+    return MultipleAccountsResult(values, context, min_context_slot, slots)
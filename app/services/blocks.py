@@ -0,0 +1,321 @@
+"""
+Parallel block-range scans and slot lists
+
+getBlocks accepts spans of at most MAX_BLOCKS_RANGE slots, and
+getBlocksWithLimit at most MAX_BLOCKS_RANGE blocks. blocks_in_range splits a
+longer span into windows of that size and fetches them concurrently. The
+windows are disjoint and in order, so their slot lists are joined as they
+are, without a merge or sort. blocks_with_limit covers as many slots as
+blocks are still missing with such ranges until it has enough.
+
+A scan walks every confirmed block between two slots. The confirmed slots
+are resolved with getBlocks, one window of at most MAX_BLOCKS_RANGE slots at
+a time, and the blocks are fetched with getBlock, up to a concurrency limit
+at once. Blocks usually arrive out of order; they wait in a reorder buffer
+until every earlier block has been handed on, so consumers see them in slot
+order. The buffer holds at most REORDER_FACTOR times the concurrency in
+blocks, so a slow block holds back fetching instead of growing memory.
+
+Because blocks are handed on in order, the progress of a scan is a single
+slot: everything before it is done. ScanCheckpoint saves that slot, together
+with the sink's state, to a JSON file, and a scan started with the same
+checkpoint continues from there.
+"""
+import asyncio
+import collections
+import json
+import os
+import time
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import SOLANA_BLOCK_SCAN_CONCURRENCY, SOLANA_EXPORT_DIR
+from app.core.rpc import rpc_request
+
+# Most slots one getBlocks call may span
+MAX_BLOCKS_RANGE = 500_000
+
+# Blocks fetched ahead of the oldest outstanding one, per concurrent request
+REORDER_FACTOR = 4
+
+# getBlock errors for slots without a block: skipped, or not in long-term storage
+SKIPPED_SLOT_ERRORS = frozenset({-32007, -32009})
+
+# Seconds between checkpoint saves while a scan is running
+CHECKPOINT_INTERVAL = 5.0
+
+
+class BlockScanError(Exception):
+    """Raised when the RPC node returns an error for a block or slot list, or a checkpoint does not fit the scan"""
+
+    def __init__(self, message: str, error: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.error = error
+
+
+async def _get_blocks(first: int, last: int, commitment: Optional[str]) -> List[int]:
+    params: List[Any] = [first, last]
+    if commitment:
+        params.append({"commitment": commitment})
+    result = await rpc_request("getBlocks", params)
+    if "error" in result:
+        raise BlockScanError(f"RPC error: {result['error']['message']}", result["error"])
+    return result["result"]
+
+
+async def latest_slot(commitment: Optional[str] = None) -> int:
+    """
+    The current slot, the end of ranges that are given without one
+
+    Raises:
+        BlockScanError: If the RPC node returns an error
+    """
+    result = await rpc_request("getSlot", [{"commitment": commitment}] if commitment else [])
+    if "error" in result:
+        raise BlockScanError(f"RPC error: {result['error']['message']}", result["error"])
+    return result["result"]
+
+
+async def first_available_block() -> int:
+    """
+    The oldest block the RPC node still holds; a node with pruned history has no blocks before it
+
+    Raises:
+        BlockScanError: If the RPC node returns an error
+    """
+    result = await rpc_request("getFirstAvailableBlock")
+    if "error" in result:
+        raise BlockScanError(f"RPC error: {result['error']['message']}", result["error"])
+    return result["result"]
+
+
+async def blocks_in_range(
+    start_slot: int,
+    end_slot: int,
+    commitment: Optional[str] = None,
+    concurrency: int = SOLANA_BLOCK_SCAN_CONCURRENCY,
+    window: int = MAX_BLOCKS_RANGE
+) -> List[int]:
+    """
+    Slots with a confirmed block between start_slot and end_slot, inclusive, for a span of any length
+
+    Args:
+        start_slot: First slot
+        end_slot: Last slot
+        commitment: The level of commitment (confirmed, finalized)
+        concurrency: Most getBlocks requests in flight at once
+        window: Most slots resolved per getBlocks call
+
+    Raises:
+        BlockScanError: If the RPC node returns an error for any window
+    """
+    firsts = range(start_slot, end_slot + 1, window)
+    if len(firsts) <= 1:
+        return await _get_blocks(start_slot, end_slot, commitment)
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(first: int) -> List[int]:
+        async with semaphore:
+            return await _get_blocks(first, min(end_slot, first + window - 1), commitment)
+
+    tasks = [asyncio.ensure_future(fetch(first)) for first in firsts]
+    try:
+        parts = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    # Windows are disjoint and in slot order: joining them keeps the list sorted.
+    # The parts may be shared with the response cache and other callers, so
+    # they are copied rather than extended in place.
+    return [slot for part in parts for slot in part]
+
+
+async def blocks_with_limit(
+    start_slot: int,
+    limit: int,
+    commitment: Optional[str] = None,
+    concurrency: int = SOLANA_BLOCK_SCAN_CONCURRENCY
+) -> List[int]:
+    """
+    The first limit slots with a confirmed block from start_slot on, for a limit of any size
+
+    Every slot holds at most one block, so each round resolves as many slots
+    as blocks are still missing; skipped slots make a short second round.
+
+    Args:
+        start_slot: First slot
+        limit: Most slots to return
+        commitment: The level of commitment (confirmed, finalized)
+        concurrency: Most getBlocks requests in flight at once
+
+    Raises:
+        BlockScanError: If the RPC node returns an error
+    """
+    latest = await latest_slot(commitment)
+    blocks: List[int] = []
+    first = start_slot
+    while len(blocks) < limit and first <= latest:
+        last = min(latest, first + (limit - len(blocks)) - 1)
+        blocks.extend(await blocks_in_range(first, last, commitment, concurrency))
+        first = last + 1
+    del blocks[limit:]
+    return blocks
+
+
+async def confirmed_slots(
+    start_slot: int,
+    end_slot: int,
+    commitment: Optional[str] = None,
+    window: int = MAX_BLOCKS_RANGE
+) -> AsyncIterator[int]:
+    """
+    Slots with a confirmed block between start_slot and end_slot, inclusive
+
+    Args:
+        start_slot: First slot
+        end_slot: Last slot
+        commitment: The level of commitment (confirmed, finalized)
+        window: Most slots resolved per getBlocks call
+
+    Raises:
+        BlockScanError: If the RPC node returns an error
+    """
+    for first in range(start_slot, end_slot + 1, window):
+        for slot in await _get_blocks(first, min(end_slot, first + window - 1), commitment):
+            yield slot
+
+
+async def fetch_blocks(
+    slots: AsyncIterator[int],
+    config: Dict[str, Any],
+    concurrency: int
+) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]]]]:
+    """
+    Fetch blocks concurrently and yield them in the order of slots
+
+    Args:
+        slots: Slots to fetch, in order
+        config: getBlock configuration
+        concurrency: Most getBlock requests in flight at once
+
+    Yields:
+        Tuple[int, Optional[Dict[str, Any]]]: Each slot with its block, or None if the slot has no block
+
+    Raises:
+        BlockScanError: If the RPC node returns an error for a block
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(slot: int) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            # Scanned blocks bypass the response cache and the permanent store
+            result = await rpc_request("getBlock", [slot, config], cache=False)
+        if "error" in result:
+            if result["error"].get("code") in SKIPPED_SLOT_ERRORS:
+                return None
+            raise BlockScanError(f"RPC error for slot {slot}: {result['error']['message']}", result["error"])
+        return result["result"]
+
+    # The reorder buffer: fetches in slot order, of which only the head is awaited
+    pending: Deque[Tuple[int, asyncio.Future]] = collections.deque()
+    window = max(1, concurrency) * REORDER_FACTOR
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < window:
+                try:
+                    slot = await slots.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending.append((slot, asyncio.ensure_future(fetch(slot))))
+            if not pending:
+                return
+            slot, future = pending.popleft()
+            yield slot, await future
+    finally:
+        for _, future in pending:
+            if future.done() and not future.cancelled():
+                # Errors of blocks that are no longer wanted are dropped
+                future.exception()
+            future.cancel()
+
+
+class ScanCheckpoint:
+    """Progress of a block-range scan, saved as JSON in the export directory"""
+
+    def __init__(self, name: Optional[str], scan: Dict[str, Any], directory: Optional[str] = None):
+        """
+        Load the checkpoint of a scan, or start a new one
+
+        Args:
+            name: Checkpoint file name; any directory part is ignored (None keeps progress in memory only)
+            scan: Parameters that identify the scan (range, getBlock configuration, sink)
+            directory: Directory the checkpoint is kept in (default: SOLANA_EXPORT_DIR)
+
+        Raises:
+            BlockScanError: If the checkpoint file belongs to a different scan
+        """
+        self.path: Optional[str] = None
+        self.scan = scan
+        self.next_slot: int = scan["start_slot"]
+        self.blocks = 0
+        self.skipped = 0
+        self.sink: Dict[str, Any] = {}
+        self.resumed = False
+        self._saved_at = time.monotonic()
+        if name is None:
+            return
+
+        directory = directory or SOLANA_EXPORT_DIR
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, os.path.basename(name))
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                state = json.load(f)
+            if state["scan"] != scan:
+                raise BlockScanError(f"Checkpoint {name} belongs to a different scan; use another name or delete it")
+            self.next_slot = state["next_slot"]
+            self.blocks = state["blocks"]
+            self.skipped = state["skipped"]
+            self.sink = state["sink"]
+            self.resumed = True
+
+    @property
+    def complete(self) -> bool:
+        return self.next_slot > self.scan["end_slot"]
+
+    def advance(self, slot: int, found: bool) -> None:
+        """Record that every slot up to and including slot is done"""
+        self.next_slot = slot + 1
+        if found:
+            self.blocks += 1
+        else:
+            self.skipped += 1
+
+    def finish(self) -> None:
+        """Record that the whole range is done"""
+        self.next_slot = self.scan["end_slot"] + 1
+
+    def due(self) -> bool:
+        """Whether it is time for a periodic save"""
+        return self.path is not None and time.monotonic() - self._saved_at >= CHECKPOINT_INTERVAL
+
+    def save(self, sink_state: Dict[str, Any]) -> None:
+        """Write the checkpoint, replacing the previous one atomically"""
+        self.sink = sink_state
+        if self.path is None:
+            return
+        state = {
+            "scan": self.scan,
+            "next_slot": self.next_slot,
+            "blocks": self.blocks,
+            "skipped": self.skipped,
+            "sink": sink_state
+        }
+        temporary = self.path + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump(state, f)
+        os.replace(temporary, self.path)
+        self._saved_at = time.monotonic()
@@ -0,0 +1,88 @@
+"""
+Local epoch and slot arithmetic
+
+The epoch schedule (slotsPerEpoch, warmup, firstNormalEpoch, firstNormalSlot)
+is all that is needed to convert between slots and epochs. EpochCalculator
+does these conversions locally, following the cluster's EpochSchedule rules:
+with warmup, epochs start at 32 slots and double in length until
+firstNormalEpoch, after which every epoch has slotsPerEpoch slots.
+
+The schedule itself never changes and is served from the response cache after
+the first getEpochSchedule call.
+"""
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.rpc import rpc_request
+
+MINIMUM_SLOTS_PER_EPOCH = 32
+
+
+class EpochScheduleError(Exception):
+    """Raised when the epoch schedule cannot be fetched"""
+
+    def __init__(self, message: str, error: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.error = error
+
+
+class EpochCalculator:
+    """Converts between slots and epochs for one epoch schedule"""
+
+    def __init__(self, slots_per_epoch: int, first_normal_epoch: int = 0, first_normal_slot: int = 0):
+        """
+        Create an epoch calculator
+
+        Args:
+            slots_per_epoch: Number of slots in each epoch after warmup
+            first_normal_epoch: First epoch with slots_per_epoch slots (0 without warmup)
+            first_normal_slot: First slot of first_normal_epoch (0 without warmup)
+        """
+        self.slots_per_epoch = slots_per_epoch
+        self.first_normal_epoch = first_normal_epoch
+        self.first_normal_slot = first_normal_slot
+
+    @classmethod
+    def from_schedule(cls, schedule: Dict[str, Any]) -> "EpochCalculator":
+        """Create a calculator from a getEpochSchedule result"""
+        return cls(schedule["slotsPerEpoch"], schedule["firstNormalEpoch"], schedule["firstNormalSlot"])
+
+    def epoch_and_slot_index(self, slot: int) -> Tuple[int, int]:
+        """Epoch containing a slot and the slot's index within it"""
+        if slot < self.first_normal_slot:
+            epoch = (slot + MINIMUM_SLOTS_PER_EPOCH).bit_length() - MINIMUM_SLOTS_PER_EPOCH.bit_length()
+            return epoch, slot - self.first_slot(epoch)
+        epochs, index = divmod(slot - self.first_normal_slot, self.slots_per_epoch)
+        return self.first_normal_epoch + epochs, index
+
+    def epoch(self, slot: int) -> int:
+        """Epoch containing a slot"""
+        return self.epoch_and_slot_index(slot)[0]
+
+    def slots_in_epoch(self, epoch: int) -> int:
+        """Number of slots in an epoch"""
+        if epoch < self.first_normal_epoch:
+            return MINIMUM_SLOTS_PER_EPOCH << epoch
+        return self.slots_per_epoch
+
+    def first_slot(self, epoch: int) -> int:
+        """First slot of an epoch"""
+        if epoch <= self.first_normal_epoch:
+            return ((1 << epoch) - 1) * MINIMUM_SLOTS_PER_EPOCH
+        return self.first_normal_slot + (epoch - self.first_normal_epoch) * self.slots_per_epoch
+
+    def last_slot(self, epoch: int) -> int:
+        """Last slot of an epoch"""
+        return self.first_slot(epoch) + self.slots_in_epoch(epoch) - 1
+
+
+async def epoch_calculator() -> EpochCalculator:
+    """
+    Get a calculator for the cluster's epoch schedule
+
+    Raises:
+        EpochScheduleError: If the RPC node returns an error
+    """
+    result = await rpc_request("getEpochSchedule")
+    if "error" in result:
+        raise EpochScheduleError(f"RPC error: {result['error']['message']}", result["error"])
+    return EpochCalculator.from_schedule(result["result"])
@@ -0,0 +1,210 @@
+"""
+Cached, indexed leader schedules
+
+getLeaderSchedule maps each validator identity to the slot indices it leads,
+about 432,000 integers per epoch. The schedule of an epoch never changes, so
+it is fetched once per epoch and inverted into a LeaderIndex: an array with
+one small integer per slot that points into a table of interned identities.
+Slot-to-leader and next-N-leaders lookups are then answered locally.
+
+Once a lookup lands near the end of an epoch, the next epoch's schedule is
+fetched in the background so lookups across the boundary do not wait for it.
+"""
+import asyncio
+import collections
+from array import array
+from typing import Any, Dict, List, Optional, OrderedDict, Tuple
+
+from app.core.config import SOLANA_LEADER_PREFETCH_SLOTS, SOLANA_LEADER_SCHEDULE_EPOCHS
+from app.core.rpc import rpc_request
+from app.services.epochs import EpochCalculator, EpochScheduleError, epoch_calculator
+
+# Most consecutive slots returned by one leaders() lookup
+MAX_SLOT_LEADERS = 5000
+
+
+class LeaderScheduleError(Exception):
+    """Raised when the RPC node returns an error or no schedule"""
+
+    def __init__(self, message: str, error: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.error = error
+
+
+class LeaderIndex:
+    """The leader of every slot in one epoch"""
+
+    def __init__(self, epoch: int, first_slot: int, slots_in_epoch: int, schedule: Dict[str, List[int]]):
+        """
+        Create an index from a getLeaderSchedule result
+
+        Args:
+            epoch: The epoch the schedule is for
+            first_slot: Absolute slot of the first slot of the epoch
+            slots_in_epoch: Number of slots in the epoch
+            schedule: Map of validator identity to the slot indices it leads
+        """
+        self.epoch = epoch
+        self.first_slot = first_slot
+        self.slots_in_epoch = slots_in_epoch
+        self.identities: List[str] = list(schedule)
+        # Slots without a leader keep the largest value of the array type
+        typecode = "H" if len(self.identities) < 0xFFFF else "I"
+        self._leaders = array(typecode, [(1 << (8 * array(typecode).itemsize)) - 1]) * slots_in_epoch
+        for number, indices in enumerate(schedule.values()):
+            for index in indices:
+                self._leaders[index] = number
+
+    @property
+    def last_slot(self) -> int:
+        return self.first_slot + self.slots_in_epoch - 1
+
+    def __contains__(self, slot: int) -> bool:
+        return self.first_slot <= slot <= self.last_slot
+
+    def leader(self, slot: int) -> Optional[str]:
+        """Identity of the leader of a slot in this epoch"""
+        number = self._leaders[slot - self.first_slot]
+        return self.identities[number] if number < len(self.identities) else None
+
+    def slots_of(self, identity: str) -> List[int]:
+        """Slot indices led by one identity"""
+        try:
+            number = self.identities.index(identity)
+        except ValueError:
+            return []
+        return [index for index, leader in enumerate(self._leaders) if leader == number]
+
+    def schedule(self) -> Dict[str, List[int]]:
+        """The schedule in getLeaderSchedule form"""
+        schedule: Dict[str, List[int]] = {identity: [] for identity in self.identities}
+        for index, number in enumerate(self._leaders):
+            if number < len(self.identities):
+                schedule[self.identities[number]].append(index)
+        return schedule
+
+
+class LeaderScheduleCache:
+    """Leader indexes for the most recently used epochs"""
+
+    def __init__(self, max_epochs: int = SOLANA_LEADER_SCHEDULE_EPOCHS, prefetch_slots: int = SOLANA_LEADER_PREFETCH_SLOTS):
+        """
+        Create a leader schedule cache
+
+        Args:
+            max_epochs: Number of epoch indexes kept in memory
+            prefetch_slots: Fetch the next epoch's schedule once a lookup is this close to the epoch's end
+        """
+        self.max_epochs = max_epochs
+        self.prefetch_slots = prefetch_slots
+        self._indexes: OrderedDict[int, LeaderIndex] = collections.OrderedDict()
+        self._loading: Dict[int, asyncio.Future] = {}
+        self._prefetch: Optional[asyncio.Task] = None
+        self.fetches = 0
+        self.prefetches = 0
+
+    async def _calculator(self) -> EpochCalculator:
+        try:
+            return await epoch_calculator()
+        except EpochScheduleError as e:
+            raise LeaderScheduleError(str(e), e.error) from e
+
+    async def _load(self, epoch: int, first_slot: int, slots_in_epoch: int) -> LeaderIndex:
+        result = await rpc_request("getLeaderSchedule", [first_slot])
+        if "error" in result:
+            raise LeaderScheduleError(f"RPC error: {result['error']['message']}", result["error"])
+        if result["result"] is None:
+            raise LeaderScheduleError(f"No leader schedule is available for epoch {epoch}")
+        self.fetches += 1
+        index = LeaderIndex(epoch, first_slot, slots_in_epoch, result["result"])
+        self._indexes[epoch] = index
+        while len(self._indexes) > self.max_epochs:
+            self._indexes.popitem(last=False)
+        return index
+
+    async def index(self, epoch: int) -> LeaderIndex:
+        """
+        Return the leader index of an epoch, fetching its schedule if needed
+
+        Raises:
+            LeaderScheduleError: If the schedule is not available
+        """
+        index = self._indexes.get(epoch)
+        if index is not None:
+            self._indexes.move_to_end(epoch)
+            return index
+        calculator = await self._calculator()
+        # Concurrent lookups for an epoch that is being loaded wait for the same fetch
+        loading = self._loading.get(epoch)
+        if loading is None:
+            loading = asyncio.ensure_future(self._load(epoch, calculator.first_slot(epoch), calculator.slots_in_epoch(epoch)))
+            self._loading[epoch] = loading
+            loading.add_done_callback(lambda _: self._loading.pop(epoch, None))
+        return await asyncio.shield(loading)
+
+    async def index_for_slot(self, slot: int) -> LeaderIndex:
+        """
+        Return the leader index of the epoch containing a slot
+
+        Raises:
+            LeaderScheduleError: If the schedule is not available
+        """
+        for index in self._indexes.values():
+            if slot in index:
+                self._indexes.move_to_end(index.epoch)
+                break
+        else:
+            index = await self.index((await self._calculator()).epoch(slot))
+        if index.last_slot - slot < self.prefetch_slots:
+            self._prefetch_next(index.epoch + 1)
+        return index
+
+    def _prefetch_next(self, epoch: int) -> None:
+        if epoch in self._indexes or epoch in self._loading:
+            return
+        if self._prefetch is not None and not self._prefetch.done():
+            return
+
+        async def prefetch() -> None:
+            try:
+                await self.index(epoch)
+                self.prefetches += 1
+            except Exception:
+                # The schedule may not be published yet; a later lookup retries
+                pass
+
+        self._prefetch = asyncio.ensure_future(prefetch())
+
+    async def leaders(self, start_slot: int, count: int) -> List[Tuple[int, Optional[str]]]:
+        """
+        Leaders of count consecutive slots starting at start_slot, across epoch boundaries
+
+        Raises:
+            LeaderScheduleError: If a schedule is not available
+        """
+        leaders: List[Tuple[int, Optional[str]]] = []
+        slot = start_slot
+        while len(leaders) < count:
+            index = await self.index_for_slot(slot)
+            end = min(index.last_slot + 1, start_slot + count)
+            leaders.extend((s, index.leader(s)) for s in range(slot, end))
+            slot = end
+        return leaders
+
+    def clear(self) -> None:
+        """Drop every cached index and reset the counters"""
+        self._indexes.clear()
+        self._loading.clear()
+        self._prefetch = None
+        self.fetches = 0
+        self.prefetches = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "epochs": list(self._indexes),
+            "fetches": self.fetches,
+            "prefetches": self.prefetches
+        }
+
+
+leader_schedules = LeaderScheduleCache()
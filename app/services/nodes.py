@@ -0,0 +1,266 @@
+"""
+Indexed cluster-node directory
+
+getClusterNodes returns every node in gossip, thousands of entries that
+change slowly. NodeDirectory keeps the latest list in memory, indexed by
+pubkey, by version and by feature set, so single-node lookups and version
+histograms are answered without re-reading or re-serializing the full list.
+
+Once the directory has been read it is refreshed in the background at a fixed
+cadence until no one has read it for a while. Each refresh is diffed against
+the previous list; a revision number is bumped whenever something changed
+and the pubkeys touched by recent revisions are kept, so consumers can ask
+for only the changes since the revision they last saw.
+"""
+import asyncio
+import collections
+import time
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import (
+    SOLANA_CLUSTER_NODES_HISTORY,
+    SOLANA_CLUSTER_NODES_IDLE_SECONDS,
+    SOLANA_CLUSTER_NODES_REFRESH_INTERVAL
+)
+from app.core.rpc import rpc_request
+
+# Fields of a getClusterNodes entry kept in the directory
+NODE_FIELDS = ("pubkey", "gossip", "tpu", "rpc", "version", "featureSet", "shredVersion")
+
+
+class ClusterNodesError(Exception):
+    """Raised when the RPC node returns an error for getClusterNodes"""
+
+    def __init__(self, message: str, error: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.error = error
+
+
+class NodeDirectory:
+    """The cluster's nodes, indexed by pubkey, version and feature set"""
+
+    def __init__(
+        self,
+        interval: float = SOLANA_CLUSTER_NODES_REFRESH_INTERVAL,
+        idle_seconds: float = SOLANA_CLUSTER_NODES_IDLE_SECONDS,
+        history: int = SOLANA_CLUSTER_NODES_HISTORY
+    ):
+        """
+        Create an empty directory
+
+        Args:
+            interval: Seconds between background refreshes (0 refreshes on every read instead)
+            idle_seconds: Stop refreshing once the directory has not been read for this long
+            history: Number of revisions whose changes are kept for get_cluster_node_changes
+        """
+        self.interval = interval
+        self.idle_seconds = idle_seconds
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._by_version: Dict[Optional[str], Set[str]] = {}
+        self._by_feature_set: Dict[Optional[int], Set[str]] = {}
+        # (revision, pubkeys added, removed or changed by it)
+        self._changes: Deque[Tuple[int, Set[str]]] = collections.deque(maxlen=history)
+        self.revision = 0
+        self._fetched_at: Optional[float] = None
+        self._read_at = 0.0
+        self._loading: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.refreshes = 0
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def _index(self, pubkey: str, node: Dict[str, Any]) -> None:
+        self._by_version.setdefault(node["version"], set()).add(pubkey)
+        self._by_feature_set.setdefault(node["featureSet"], set()).add(pubkey)
+
+    def _unindex(self, pubkey: str, node: Dict[str, Any]) -> None:
+        for index, key in ((self._by_version, node["version"]), (self._by_feature_set, node["featureSet"])):
+            members = index[key]
+            members.discard(pubkey)
+            if not members:
+                del index[key]
+
+    def apply(self, nodes: Iterable[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """
+        Replace the directory's contents with a getClusterNodes result
+
+        Args:
+            nodes: The getClusterNodes result
+
+        Returns:
+            Dict[str, List[str]]: The pubkeys that were added, removed and changed
+        """
+        latest = {node["pubkey"]: {field: node.get(field) for field in NODE_FIELDS} for node in nodes}
+        added = [pubkey for pubkey in latest if pubkey not in self._nodes]
+        removed = [pubkey for pubkey in self._nodes if pubkey not in latest]
+        changed = [pubkey for pubkey, node in latest.items() if pubkey in self._nodes and self._nodes[pubkey] != node]
+
+        for pubkey in removed:
+            self._unindex(pubkey, self._nodes.pop(pubkey))
+        for pubkey in changed:
+            self._unindex(pubkey, self._nodes[pubkey])
+        for pubkey in added + changed:
+            self._nodes[pubkey] = latest[pubkey]
+            self._index(pubkey, latest[pubkey])
+
+        if added or removed or changed:
+            self.revision += 1
+            self._changes.append((self.revision, set(added) | set(removed) | set(changed)))
+        return {"added": added, "removed": removed, "changed": changed}
+
+    async def _fetch(self) -> Dict[str, List[str]]:
+        result = await rpc_request("getClusterNodes")
+        if "error" in result:
+            raise ClusterNodesError(f"RPC error: {result['error']['message']}", result["error"])
+        diff = self.apply(result["result"])
+        self._fetched_at = time.monotonic()
+        self.refreshes += 1
+        return diff
+
+    async def refresh(self) -> Dict[str, List[str]]:
+        """
+        Fetch the node list and apply it; concurrent callers share one request
+
+        Returns:
+            Dict[str, List[str]]: The pubkeys that were added, removed and changed
+
+        Raises:
+            ClusterNodesError: If the RPC node returns an error
+        """
+        if self._loading is None:
+            self._loading = asyncio.ensure_future(self._fetch())
+            self._loading.add_done_callback(lambda _: setattr(self, "_loading", None))
+        return await asyncio.shield(self._loading)
+
+    def start(self) -> None:
+        """Start refreshing in the background if not already running"""
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self) -> None:
+        while time.monotonic() - self._read_at <= self.idle_seconds:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception:
+                # Reads fall back to a direct refresh once the list is stale
+                pass
+
+    async def ensure_fresh(self) -> None:
+        """
+        Make sure the directory is up to date before a read
+
+        Raises:
+            ClusterNodesError: If the node list has to be fetched and the RPC node returns an error
+        """
+        now = time.monotonic()
+        self._read_at = now
+        if self._fetched_at is not None and self.interval > 0 and now - self._fetched_at <= 2 * self.interval:
+            self.hits += 1
+        else:
+            await self.refresh()
+        self.start()
+
+    def node(self, pubkey: str) -> Optional[Dict[str, Any]]:
+        """The node with a pubkey, or None if it is not in gossip"""
+        return self._nodes.get(pubkey)
+
+    def find(
+        self,
+        pubkeys: Optional[List[str]] = None,
+        version: Optional[str] = None,
+        feature_set: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Nodes matching every given filter, from the indexes
+
+        Args:
+            pubkeys: Only these pubkeys, in the given order
+            version: Only nodes running this software version
+            feature_set: Only nodes with this feature set identifier
+
+        Returns:
+            List[Dict[str, Any]]: The matching nodes, sorted by pubkey unless pubkeys were given
+        """
+        sets = []
+        if version is not None:
+            sets.append(self._by_version.get(version, set()))
+        if feature_set is not None:
+            sets.append(self._by_feature_set.get(feature_set, set()))
+        if pubkeys is not None:
+            return [self._nodes[p] for p in pubkeys if p in self._nodes and all(p in s for s in sets)]
+        if not sets:
+            return [self._nodes[p] for p in sorted(self._nodes)]
+        sets.sort(key=len)
+        return [self._nodes[p] for p in sorted(sets[0].intersection(*sets[1:]))]
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Every node, in the order of the last getClusterNodes result"""
+        return list(self._nodes.values())
+
+    def counts(self, group_by: str) -> List[Tuple[Any, int]]:
+        """
+        Number of nodes per version or feature set, largest group first
+
+        Args:
+            group_by: "version" or "featureSet"
+        """
+        index = self._by_version if group_by == "version" else self._by_feature_set
+        return sorted(((key, len(members)) for key, members in index.items()), key=lambda group: (-group[1], str(group[0])))
+
+    def changes_since(self, revision: int) -> Optional[Tuple[List[Dict[str, Any]], List[str]]]:
+        """
+        Net changes between a revision and the current one
+
+        Args:
+            revision: The revision the caller last saw
+
+        Returns:
+            Optional[Tuple[List[Dict[str, Any]], List[str]]]: The nodes that were added or changed and the
+                pubkeys that were removed, or None if the revision is too old and the caller has to resync
+        """
+        if revision == self.revision and revision > 0:
+            return [], []
+        # Revision 0, a revision from before a restart and revisions older than
+        # the kept history (none when SOLANA_CLUSTER_NODES_HISTORY is 0) can only
+        # be answered with the full directory
+        if revision <= 0 or revision > self.revision or not self._changes or self._changes[0][0] > revision + 1:
+            return None
+        touched: Set[str] = set()
+        for change_revision, pubkeys in self._changes:
+            if change_revision > revision:
+                touched |= pubkeys
+        upserted = [self._nodes[p] for p in sorted(touched) if p in self._nodes]
+        removed = sorted(p for p in touched if p not in self._nodes)
+        return upserted, removed
+
+    def clear(self) -> None:
+        """Drop every node, stop refreshing and reset the counters"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._nodes.clear()
+        self._by_version.clear()
+        self._by_feature_set.clear()
+        self._changes.clear()
+        self.revision = 0
+        self._fetched_at = None
+        self._loading = None
+        self.hits = 0
+        self.refreshes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "nodes": len(self._nodes),
+            "versions": len(self._by_version),
+            "feature_sets": len(self._by_feature_set),
+            "revision": self.revision,
+            "age_ms": round((time.monotonic() - self._fetched_at) * 1000, 1) if self._fetched_at is not None else None,
+            "hits": self.hits,
+            "refreshes": self.refreshes
+        }
+
+
+node_directory = NodeDirectory()
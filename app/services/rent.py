@@ -0,0 +1,118 @@
+"""
+Offline rent-exemption calculator
+
+The rent-exempt minimum for an account is a fixed formula over the Rent
+sysvar: (128 + data length) * lamports per byte-year * exemption threshold.
+The sysvar is read once with getAccountInfo and cached; minimums for any
+number of data lengths are then computed locally. The parameters can only
+change at an epoch boundary, so the sysvar is read again only once the
+epoch it was read in is estimated to have ended.
+"""
+import base64
+import struct
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.rpc import rpc_request
+from app.services.epochs import epoch_calculator
+
+RENT_SYSVAR_ID = "SysvarRent111111111111111111111111111111111"
+
+# Bytes of account metadata that are charged rent in addition to the data
+ACCOUNT_STORAGE_OVERHEAD = 128
+
+# Lower bound for the time a slot takes, used to estimate when an epoch ends
+SLOT_SECONDS = 0.4
+
+# lamports_per_byte_year: u64, exemption_threshold: f64, burn_percent: u8
+_RENT_LAYOUT = struct.Struct("<QdB")
+
+
+class RentError(Exception):
+    """Raised when the Rent sysvar cannot be read"""
+
+    def __init__(self, message: str, error: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.error = error
+
+
+class Rent:
+    """Parameters of the Rent sysvar"""
+
+    def __init__(self, lamports_per_byte_year: int, exemption_threshold: float, burn_percent: int):
+        self.lamports_per_byte_year = lamports_per_byte_year
+        self.exemption_threshold = exemption_threshold
+        self.burn_percent = burn_percent
+
+    @classmethod
+    def from_account_data(cls, data: bytes) -> "Rent":
+        """Decode the Rent sysvar's account data"""
+        return cls(*_RENT_LAYOUT.unpack_from(data))
+
+    def minimum_balance(self, data_size: int) -> int:
+        """Lamports an account with data_size bytes of data needs to be rent exempt"""
+        # Same integer/float steps as the runtime, so results match the RPC node exactly
+        return int(float((ACCOUNT_STORAGE_OVERHEAD + data_size) * self.lamports_per_byte_year) * self.exemption_threshold)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "lamportsPerByteYear": self.lamports_per_byte_year,
+            "exemptionThreshold": self.exemption_threshold,
+            "burnPercent": self.burn_percent
+        }
+
+
+class RentCache:
+    """The Rent sysvar, read again only after an epoch boundary"""
+
+    def __init__(self):
+        self._rent: Optional[Rent] = None
+        self._expires = 0.0
+        self.fetches = 0
+
+    async def rent(self) -> Rent:
+        """
+        Return the Rent sysvar parameters, reading the sysvar if needed
+
+        Raises:
+            RentError: If the sysvar cannot be read
+        """
+        if self._rent is not None and time.monotonic() < self._expires:
+            return self._rent
+
+        result = await rpc_request("getAccountInfo", [RENT_SYSVAR_ID, {"encoding": "base64"}])
+        if "error" in result:
+            raise RentError(f"RPC error: {result['error']['message']}", result["error"])
+        account = result["result"]["value"]
+        if account is None:
+            raise RentError("Rent sysvar account not found")
+        rent = Rent.from_account_data(base64.b64decode(account["data"][0]))
+
+        # Keep the parameters until the end of the epoch they were read in.
+        # Slots take at least SLOT_SECONDS, so the estimate errs on the early side.
+        slot = result["result"]["context"]["slot"]
+        calculator = await epoch_calculator()
+        remaining = calculator.last_slot(calculator.epoch(slot)) - slot + 1
+        self._rent = rent
+        self._expires = time.monotonic() + remaining * SLOT_SECONDS
+        self.fetches += 1
+        return rent
+
+    async def minimum_balances(self, data_sizes: List[int]) -> List[int]:
+        """
+        Rent-exempt minimums for several data lengths
+
+        Raises:
+            RentError: If the sysvar cannot be read
+        """
+        rent = await self.rent()
+        return [rent.minimum_balance(size) for size in data_sizes]
+
+    def clear(self) -> None:
+        """Forget the cached parameters"""
+        self._rent = None
+        self._expires = 0.0
+        self.fetches = 0
+
+
+rent_cache = RentCache()
@@ -0,0 +1,387 @@
+"""
+Index of the slots that hold a finalized block
+
+Once a slot is finalized, whether it holds a block never changes, so getBlocks
+keeps giving the same answer for the same past slots. SlotIndex keeps those
+answers as a bitset with one bit per slot, set when the slot has a block,
+together with the spans of slots that have been resolved. The parts of a
+range that are already indexed are answered from the bitset. Only the rest is
+fetched, at finalized commitment, and added. Slots above the finalized slot
+are never indexed.
+
+The bitset is split into pages of PAGE_SLOTS slots and stored in a SQLite
+database, so the index survives restarts and only the pages that are read are
+loaded into memory. A page of 2**20 slots takes 128 KiB; the same slots as a
+JSON list of integers take several megabytes. The database is read and
+written on a single worker thread, in the order the work was submitted, so the
+event loop only updates the bitset in memory.
+
+slot_runs and skipped_slots describe a sorted slot list compactly: as the runs
+of consecutive slots with a block, and the slots between them without one.
+"""
+import asyncio
+import bisect
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import SOLANA_BLOCK_SCAN_CONCURRENCY, SOLANA_SLOT_INDEX
+from app.services.blocks import blocks_in_range, first_available_block, latest_slot
+
+# Slots per stored page of the bitset (128 KiB)
+PAGE_SLOTS = 1 << 20
+
+# Slots fetched past the end of a missing range, so that a block after it
+# closes the range even when the range ends in skipped slots
+LOOKAHEAD_SLOTS = 64
+
+_PAGE_BYTES = PAGE_SLOTS // 8
+
+# Offsets of the set bits of every byte value
+_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (page INTEGER PRIMARY KEY, bits BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS spans (first INTEGER PRIMARY KEY, last INTEGER NOT NULL);
+"""
+
+
+def slot_runs(blocks: List[int]) -> List[List[int]]:
+    """
+    Runs of consecutive slots in a sorted slot list
+
+    Returns:
+        List[List[int]]: The first and last slot of every run
+    """
+    runs: List[List[int]] = []
+    for slot in blocks:
+        if runs and slot == runs[-1][1] + 1:
+            runs[-1][1] = slot
+        else:
+            runs.append([slot, slot])
+    return runs
+
+
+def skipped_slots(runs: List[List[int]]) -> List[int]:
+    """Slots between the first and the last of the runs that are in none of them"""
+    skipped: List[int] = []
+    for (_, last), (first, _) in zip(runs, runs[1:]):
+        skipped.extend(range(last + 1, first))
+    return skipped
+
+
+class SlotIndex:
+    """Bitset of the slots that hold a finalized block, over the spans resolved so far"""
+
+    def __init__(self, path: str = SOLANA_SLOT_INDEX):
+        """
+        Create an index; the database is opened on first use
+
+        Args:
+            path: SQLite file the index is stored in (empty keeps it in memory only)
+        """
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slot-index")
+        self._loaded = False
+        self._pages: Dict[int, bytearray] = {}
+        # Pages the database does not hold, so that they are not looked up again
+        self._absent: Set[int] = set()
+        # Disjoint, non-adjacent spans of indexed slots, in order
+        self._firsts: List[int] = []
+        self._lasts: List[int] = []
+        self.finalized_slot: Optional[int] = None
+        self.fetched_slots = 0
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if self.path:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.executescript(_SCHEMA)
+                for first, last in self._db.execute("SELECT first, last FROM spans ORDER BY first"):
+                    self._firsts.append(first)
+                    self._lasts.append(last)
+            self._loaded = True
+
+    async def _in_worker(self, call: Callable[..., Any], *args: Any) -> Any:
+        """Run database work on the index's worker thread"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call, *args)
+
+    async def load(self, first: int, last: int) -> None:
+        """
+        Read the spans and the pages over first..last from the database, off the event loop
+
+        The other methods read what they need themselves, on the calling thread,
+        when it has not been loaded yet.
+        """
+        if not self._loaded:
+            await self._in_worker(self._load)
+        if self._db is None:
+            return
+        numbers = [
+            number for number in range(first // PAGE_SLOTS, last // PAGE_SLOTS + 1)
+            if number not in self._pages and number not in self._absent
+        ]
+        if numbers:
+            for number, page in (await self._in_worker(self._read_pages, numbers)).items():
+                # A page recorded meanwhile already holds everything read here
+                if page is None:
+                    if number not in self._pages:
+                        self._absent.add(number)
+                else:
+                    self._pages.setdefault(number, page)
+
+    def _read_pages(self, numbers: Iterable[int]) -> Dict[int, Optional[bytearray]]:
+        pages: Dict[int, Optional[bytearray]] = {}
+        with self._lock:
+            if self._db is None:
+                return pages
+            for number in numbers:
+                row = self._db.execute("SELECT bits FROM pages WHERE page = ?", (number,)).fetchone()
+                pages[number] = bytearray(row[0]) if row is not None else None
+        return pages
+
+    def open(self, path: str) -> None:
+        """Switch to the index stored at path (empty keeps it in memory only)"""
+        self.close()
+        self.path = path
+
+    def close(self) -> None:
+        """Close the database and drop what is held in memory; the index is loaded again on next use"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+            self._db = None
+            self._loaded = False
+        self._pages.clear()
+        self._absent.clear()
+        self._firsts.clear()
+        self._lasts.clear()
+        self.finalized_slot = None
+        self.fetched_slots = 0
+
+    def _page(self, number: int) -> Optional[bytearray]:
+        page = self._pages.get(number)
+        if page is None and self._db is not None and number not in self._absent:
+            page = self._read_pages([number]).get(number)
+            if page is None:
+                self._absent.add(number)
+            else:
+                self._pages[number] = page
+        return page
+
+    def missing(self, first: int, last: int) -> List[Tuple[int, int]]:
+        """The parts of first..last that are not indexed, as (first, last) pairs"""
+        self._load()
+        gaps: List[Tuple[int, int]] = []
+        cursor = first
+        i = max(0, bisect.bisect_right(self._firsts, first) - 1)
+        while cursor <= last and i < len(self._firsts) and self._firsts[i] <= last:
+            if self._lasts[i] >= cursor:
+                if self._firsts[i] > cursor:
+                    gaps.append((cursor, self._firsts[i] - 1))
+                cursor = self._lasts[i] + 1
+            i += 1
+        if cursor <= last:
+            gaps.append((cursor, last))
+        return gaps
+
+    def indexed_through(self, first: int) -> int:
+        """The last slot of the indexed span that contains first (first - 1 if first is not indexed)"""
+        self._load()
+        i = bisect.bisect_right(self._firsts, first) - 1
+        if i >= 0 and self._lasts[i] >= first:
+            return self._lasts[i]
+        return first - 1
+
+    async def record(self, first: int, last: int, blocks: List[int]) -> None:
+        """
+        Add a resolved span to the index
+
+        Args:
+            first: First slot of the span
+            last: Last slot of the span
+            blocks: Every slot of the span that holds a finalized block, in order (slots outside it are ignored)
+        """
+        blocks = blocks[bisect.bisect_left(blocks, first):bisect.bisect_right(blocks, last)]
+        if blocks:
+            await self.load(blocks[0], blocks[-1])
+        else:
+            await self.load(first, first)
+
+        touched: Dict[int, bytearray] = {}
+        number = -1
+        page = bytearray()
+        for slot in blocks:
+            if slot // PAGE_SLOTS != number:
+                number = slot // PAGE_SLOTS
+                page = touched.get(number) or self._page(number) or bytearray(_PAGE_BYTES)
+                touched[number] = page
+            offset = slot - number * PAGE_SLOTS
+            page[offset >> 3] |= 1 << (offset & 7)
+        # Pages without a block are not stored; a missing page reads as empty
+        self._pages.update(touched)
+        self._absent.difference_update(touched)
+
+        # Merge the span with every span it overlaps or touches
+        lo = bisect.bisect_left(self._lasts, first - 1)
+        hi = bisect.bisect_right(self._firsts, last + 1)
+        if lo < hi:
+            first = min(first, self._firsts[lo])
+            last = max(last, self._lasts[hi - 1])
+        replaced = self._firsts[lo:hi]
+        self._firsts[lo:hi] = [first]
+        self._lasts[lo:hi] = [last]
+
+        if self._db is not None:
+            # Copies of the pages, as later records may change them before the write
+            pages = [(number, bytes(page)) for number, page in touched.items()]
+            await self._in_worker(self._save, pages, replaced, first, last)
+
+    def _save(self, pages: List[Tuple[int, bytes]], replaced: List[int], first: int, last: int) -> None:
+        with self._lock:
+            if self._db is None:
+                return
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany("INSERT OR REPLACE INTO pages (page, bits) VALUES (?, ?)", pages)
+                self._db.executemany("DELETE FROM spans WHERE first = ?", [(slot,) for slot in replaced])
+                self._db.execute("INSERT OR REPLACE INTO spans (first, last) VALUES (?, ?)", (first, last))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _slices(self, first: int, last: int):
+        """The pages over first..last with the first and last slot offset within each"""
+        for number in range(first // PAGE_SLOTS, last // PAGE_SLOTS + 1):
+            page = self._page(number)
+            if page is not None:
+                base = number * PAGE_SLOTS
+                yield base, page, max(first - base, 0), min(last - base, PAGE_SLOTS - 1)
+
+    def blocks(self, first: int, last: int) -> List[int]:
+        """Slots of first..last that hold a block; the slots must be indexed"""
+        self._load()
+        blocks: List[int] = []
+        for base, page, lo, hi in self._slices(first, last):
+            for index in range(lo >> 3, (hi >> 3) + 1):
+                value = page[index]
+                if value:
+                    slot = base + (index << 3)
+                    blocks.extend([slot + bit for bit in _BITS[value]])
+        # The first and last byte may reach past the range
+        while blocks and blocks[-1] > last:
+            blocks.pop()
+        del blocks[:bisect.bisect_left(blocks, first)]
+        return blocks
+
+    def count(self, first: int, last: int) -> int:
+        """Number of slots of first..last that hold a block; the slots must be indexed"""
+        self._load()
+        total = 0
+        for _, page, lo, hi in self._slices(first, last):
+            bits = int.from_bytes(page[lo >> 3:(hi >> 3) + 1], "little") >> (lo & 7)
+            total += (bits & ((1 << (hi - lo + 1)) - 1)).bit_count()
+        return total
+
+    async def first_blocks(self, first: int, limit: int) -> Optional[List[int]]:
+        """The first limit slots from first on that hold a block, or None if the index does not hold them without a gap"""
+        await self.load(first, first)
+        through = self.indexed_through(first)
+        blocks: List[int] = []
+        start = first
+        while len(blocks) < limit and start <= through:
+            end = min(through, (start // PAGE_SLOTS + 1) * PAGE_SLOTS - 1)
+            await self.load(start, end)
+            blocks.extend(self.blocks(start, end))
+            start = end + 1
+        if len(blocks) < limit:
+            return None
+        del blocks[limit:]
+        return blocks
+
+    def has_block(self, slot: int) -> Optional[bool]:
+        """Whether a slot holds a block, or None if it is not indexed"""
+        if self.indexed_through(slot) < slot:
+            return None
+        page = self._page(slot // PAGE_SLOTS)
+        offset = slot % PAGE_SLOTS
+        return page is not None and bool(page[offset >> 3] >> (offset & 7) & 1)
+
+    async def resolve(self, first: int, last: int, concurrency: int = SOLANA_BLOCK_SCAN_CONCURRENCY) -> int:
+        """
+        Index the finalized slots of first..last that are not indexed yet
+
+        Args:
+            first: First slot
+            last: Last slot
+            concurrency: Most getBlocks requests in flight at once
+
+        Returns:
+            int: The last slot up to which first..last is indexed without a gap (first - 1 if first is not)
+
+        Raises:
+            BlockScanError: If the RPC node returns an error
+        """
+        await self.load(first, first)
+        if self.finalized_slot is None or last > self.finalized_slot:
+            self.finalized_slot = await latest_slot("finalized")
+        finalized = self.finalized_slot
+        for gap_first, gap_last in self.missing(first, min(last, finalized)):
+            end = min(finalized, gap_last + LOOKAHEAD_SLOTS)
+            blocks = await blocks_in_range(gap_first, end, "finalized", concurrency)
+            self.fetched_slots += end - gap_first + 1
+            await self.record_fetched(gap_first, blocks)
+        through = min(last, self.indexed_through(first))
+        # The pages the caller reads next
+        await self.load(first, through)
+        return through
+
+    async def record_fetched(self, first: int, blocks: List[int]) -> None:
+        """
+        Add the finalized blocks an RPC node returned for the slots from first on
+
+        A node that is behind answers up to its own finalized slot, so only the
+        slots up to the last block returned are certain. A node with pruned
+        history answers from its first available block, so when the blocks
+        start after first, the slots before that block are only certain from
+        there.
+
+        Args:
+            first: First slot that was asked for
+            blocks: The slots with a block that were returned, in order
+
+        Raises:
+            BlockScanError: If the RPC node returns an error
+        """
+        if not blocks:
+            return
+        if blocks[0] > first:
+            first = max(first, min(blocks[0], await first_available_block()))
+        await self.record(first, blocks[-1], blocks)
+
+    def stats(self) -> Dict[str, Any]:
+        self._load()
+        return {
+            "path": self.path or None,
+            "spans": len(self._firsts),
+            "indexed_slots": sum(last - first + 1 for first, last in zip(self._firsts, self._lasts)),
+            "loaded_pages": len(self._pages),
+            "finalized_slot": self.finalized_slot,
+            "fetched_slots": self.fetched_slots
+        }
+
+
+slot_index = SlotIndex()
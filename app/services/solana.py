@@ -1,26 +1,57 @@
 """
 Solana blockchain service
 """
-import requests
-from typing import Optional, Dict, Any, List, Tuple, Union
-from app.core.config import SOLANA_RPC_URL
+from typing import Optional, Dict, Any, Callable, List, Tuple, Union
+from app.core.config import SOLANA_BLOCK_SCAN_CONCURRENCY
+from app.core.health import NoHealthyEndpointError
+from app.core.jsonstream import JsonArrayStream
+from app.core.rpc import get_rpc_client, rpc_request
+from app.services.accounts import MultipleAccountsError, fetch_multiple_accounts
+from app.services.blocks import (
+    MAX_BLOCKS_RANGE,
+    BlockScanError,
+    ScanCheckpoint,
+    blocks_in_range,
+    blocks_with_limit,
+    confirmed_slots,
+    fetch_blocks,
+    latest_slot
+)
+from app.services.slots import skipped_slots, slot_index, slot_runs
+from app.services.epochs import EpochScheduleError, epoch_calculator
+from app.services.leaders import MAX_SLOT_LEADERS, LeaderScheduleError, leader_schedules
+from app.services.nodes import NODE_FIELDS, ClusterNodesError, node_directory
+from app.services.rent import RentError, rent_cache
+from app.services.streaming import is_vote_transaction
 from app.models.solana import (
+    ACCOUNT_DATA_LIST,
+    PROGRAM_ACCOUNT_LIST,
     SolanaBalanceResponse, 
+    SolanaBalancesResponse,
+    SolanaWalletBalance,
     SolanaAccountInfoResponse, 
     SolanaAccountData,
     SolanaBlockResponse,
+    SolanaTransactionInBlock,
     SolanaBlockCommitmentResponse,
     SolanaBlockHeightResponse,
     SolanaBlockProductionResponse,
     SolanaBlockProductionRange,
     SolanaBlocksResponse,
+    SolanaSlotSkippedResponse,
+    SolanaSkipRateResponse,
     SolanaBlockTimeResponse,
     SolanaClusterNodesResponse,
     SolanaClusterNodeInfo,
+    SolanaClusterNodeLookupResponse,
+    SolanaClusterNodeGroup,
+    SolanaClusterNodeGroupsResponse,
+    SolanaClusterNodeChangesResponse,
     SolanaEpochInfoResponse,
     SolanaEpochInfo,
     SolanaEpochScheduleResponse,
     SolanaEpochSchedule,
+    SolanaEpochSlotsResponse,
     SolanaFeeForMessageResponse,
     SolanaFirstAvailableBlockResponse,
     SolanaGenesisHashResponse,
@@ -39,21 +70,28 @@ from app.models.solana import (
     SolanaLargeAccount,
     SolanaLatestBlockhashResponse,
     SolanaBlockhashInfo,
+    SolanaBlockhashValidityResponse,
     SolanaLeaderScheduleResponse,
+    SolanaSlotLeader,
+    SolanaSlotLeadersResponse,
     SolanaMaxRetransmitSlotResponse,
     SolanaMaxShredInsertSlotResponse,
     SolanaMinimumBalanceForRentExemptionResponse,
+    SolanaRentExemptMinimum,
+    SolanaRentExemptMinimumsResponse,
     SolanaMultipleAccountsResponse,
     SolanaProgramAccountsResponse,
-    SolanaProgramAccount,
+    SolanaProgramAccountsStreamResponse,
+    SolanaBlockScanResponse,
     SolanaRecentPerformanceSamplesResponse,
     SolanaRecentPrioritizationFeesResponse,
     SolanaPerformanceSample,
-    SolanaPrioritizationFee
+    SolanaPrioritizationFee,
+    SolanaRpcStatsResponse
 )
 
 
-def get_solana_balance(address: str) -> SolanaBalanceResponse:
+async def get_solana_balance(address: str) -> SolanaBalanceResponse:
     """
     Get the balance of a Solana wallet address in SOL.
     
@@ -63,21 +101,9 @@ def get_solana_balance(address: str) -> SolanaBalanceResponse:
     Returns:
         SolanaBalanceResponse: The wallet balance information
     """
-    # Build RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getBalance",
-        "params": [
-            address
-        ]
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getBalance", [address])
         
         if "error" in result:
             return SolanaBalanceResponse(
@@ -104,7 +130,66 @@ def get_solana_balance(address: str) -> SolanaBalanceResponse:
         )
 
 
-def get_account_info(address: str, encoding: str = "base58", data_slice: Optional[Dict[str, int]] = None) -> SolanaAccountInfoResponse:
+async def get_solana_balances(
+    addresses: List[str],
+    commitment: Optional[str] = None,
+    min_context_slot: Optional[int] = None
+) -> SolanaBalancesResponse:
+    """
+    Get the balances of any number of Solana addresses
+    
+    Args:
+        addresses: The Solana wallet addresses to check
+        commitment: The level of commitment (processed, confirmed, finalized)
+        min_context_slot: Lowest slot the balances may be read at
+    
+    Returns:
+        SolanaBalancesResponse: The balance of each address
+    """
+    # A zero-length data slice returns the lamports of each account without its data
+    config = {"encoding": "base64", "dataSlice": {"offset": 0, "length": 0}}
+    if commitment:
+        config["commitment"] = commitment
+
+    try:
+        distinct = list(dict.fromkeys(addresses))
+        result = await fetch_multiple_accounts(distinct, config, min_context_slot)
+        lamports = {
+            address: account["lamports"] if account is not None else 0
+            for address, account in zip(distinct, result.values)
+        }
+        total = sum(lamports.values())
+
+        return SolanaBalancesResponse(
+            status="success",
+            balances=[
+                SolanaWalletBalance(
+                    address=address,
+                    balance_lamports=lamports[address],
+                    balance_sol=lamports[address] / 1_000_000_000
+                )
+                for address in addresses
+            ],
+            total_lamports=total,
+            total_sol=total / 1_000_000_000,
+            contextSlotRange=list(result.slot_range) if result.slot_range else None
+        )
+
+    except MultipleAccountsError as e:
+        return SolanaBalancesResponse(
+            status="error",
+            message=str(e),
+            error=e.error
+        )
+
+    except Exception as e:
+        return SolanaBalancesResponse(
+            status="error",
+            message=f"Failed to get balances: {str(e)}"
+        )
+
+
+async def get_account_info(address: str, encoding: str = "base58", data_slice: Optional[Dict[str, int]] = None) -> SolanaAccountInfoResponse:
     """
     Get all information associated with the account of provided Pubkey
     
@@ -123,20 +208,9 @@ def get_account_info(address: str, encoding: str = "base58", data_slice: Optiona
     if data_slice:
         params[1]["dataSlice"] = data_slice
     
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getAccountInfo",
-        "params": params
-    }
-    
-    print(f"payload{payload}")
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getAccountInfo", params)
         
         if "error" in result:
             return SolanaAccountInfoResponse(
@@ -179,12 +253,14 @@ def get_account_info(address: str, encoding: str = "base58", data_slice: Optiona
         )
 
 
-def get_block(
+async def get_block(
     slot: int, 
     encoding: str = "json", 
     transaction_details: str = "full", 
     rewards: bool = True, 
-    max_supported_transaction_version: Optional[int] = None
+    max_supported_transaction_version: Optional[int] = None,
+    exclude_votes: bool = False,
+    exclude: Optional[List[Callable[[Dict[str, Any]], bool]]] = None
 ) -> SolanaBlockResponse:
     """
     Get information about a confirmed block
@@ -195,6 +271,8 @@ def get_block(
         transaction_details: Level of transaction detail to return (full, accounts, signatures, none)
         rewards: Whether to include rewards in the response
         max_supported_transaction_version: Filter for max transaction version
+        exclude_votes: Drop vote transactions
+        exclude: Predicates on raw transactions; a transaction matching any of them is dropped
     
     Returns:
         SolanaBlockResponse: The block information
@@ -212,20 +290,14 @@ def get_block(
     # Add maxSupportedTransactionVersion if provided
     if max_supported_transaction_version is not None:
         params[1]["maxSupportedTransactionVersion"] = max_supported_transaction_version
-    
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getBlock",
-        "params": params
-    }
+
+    drop = ([is_vote_transaction] if exclude_votes else []) + list(exclude or [])
+    if drop:
+        return await _get_block_filtered(params, drop)
     
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getBlock", params)
         
         if "error" in result:
             return SolanaBlockResponse(
@@ -255,7 +327,58 @@ def get_block(
         )
 
 
-def get_block_commitment(slot: int) -> SolanaBlockCommitmentResponse:
+async def _get_block_filtered(
+    params: List[Any],
+    drop: List[Callable[[Dict[str, Any]], bool]]
+) -> SolanaBlockResponse:
+    """
+    Get a block, streaming its transactions and dropping unwanted ones before any model is built
+
+    Args:
+        params: getBlock request params
+        drop: Predicates on raw transactions; a transaction matching any of them is dropped
+    """
+    parser = JsonArrayStream([("result", "transactions")])
+    transactions = []
+    scanned = 0
+    try:
+        async for item in get_rpc_client().stream("getBlock", params, parser):
+            scanned += 1
+            if not any(predicate(item) for predicate in drop):
+                transactions.append(SolanaTransactionInBlock(**item))
+        result = parser.close()
+
+        if "error" in result:
+            return SolanaBlockResponse(
+                status="error",
+                message=f"RPC error: {result['error']['message']}",
+                error=result["error"]
+            )
+
+        block_data = result["result"]
+        if block_data is None:
+            return SolanaBlockResponse(
+                status="success",
+                message="Block not found or not confirmed"
+            )
+
+        if "transactions" in block_data:
+            block_data["transactions"] = transactions
+            block_data["transactionCount"] = scanned
+            block_data["droppedTransactions"] = scanned - len(transactions)
+        return SolanaBlockResponse(
+            status="success",
+            **block_data
+        )
+
+    except Exception as e:
+        return SolanaBlockResponse(
+            status="error",
+            message=f"Failed to get block: {str(e)}"
+        )
+
+
+async def get_block_commitment(slot: int) -> SolanaBlockCommitmentResponse:
     """
     Get commitment for a particular block
     
@@ -265,19 +388,9 @@ def get_block_commitment(slot: int) -> SolanaBlockCommitmentResponse:
     Returns:
         SolanaBlockCommitmentResponse: The block commitment information
     """
-    # Build RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getBlockCommitment",
-        "params": [slot]
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getBlockCommitment", [slot])
         
         if "error" in result:
             return SolanaBlockCommitmentResponse(
@@ -302,7 +415,7 @@ def get_block_commitment(slot: int) -> SolanaBlockCommitmentResponse:
         )
 
 
-def get_block_height(commitment: Optional[str] = None) -> SolanaBlockHeightResponse:
+async def get_block_height(commitment: Optional[str] = None) -> SolanaBlockHeightResponse:
     """
     Get the current block height of the node
     
@@ -317,19 +430,9 @@ def get_block_height(commitment: Optional[str] = None) -> SolanaBlockHeightRespo
     if commitment:
         params.append({"commitment": commitment})
     
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getBlockHeight",
-        "params": params
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getBlockHeight", params)
         
         if "error" in result:
             return SolanaBlockHeightResponse(
@@ -350,7 +453,7 @@ def get_block_height(commitment: Optional[str] = None) -> SolanaBlockHeightRespo
         )
 
 
-def get_block_production(
+async def get_block_production(
     identity: Optional[str] = None,
     first_slot: Optional[int] = None,
     last_slot: Optional[int] = None,
@@ -387,19 +490,9 @@ def get_block_production(
     if config:
         params.append(config)
     
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getBlockProduction",
-        "params": params
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getBlockProduction", params)
         
         if "error" in result:
             return SolanaBlockProductionResponse(
@@ -424,64 +517,59 @@ def get_block_production(
         )
 
 
-def get_blocks(
+def _blocks_response(blocks: List[int], compact: bool) -> SolanaBlocksResponse:
+    """Return a slot list as it is, or as runs of consecutive blocks and the slots skipped between them"""
+    if not compact:
+        return SolanaBlocksResponse(status="success", blocks=blocks)
+    runs = slot_runs(blocks)
+    return SolanaBlocksResponse(
+        status="success",
+        blockCount=len(blocks),
+        runs=runs,
+        skipped=skipped_slots(runs)
+    )
+
+
+async def get_blocks(
     start_slot: int,
     end_slot: Optional[int] = None,
-    commitment: Optional[str] = None
+    commitment: Optional[str] = None,
+    compact: bool = False
 ) -> SolanaBlocksResponse:
     """
     Get a list of confirmed blocks between two slots
+
+    Finalized slots are answered from the slot index (see app.services.slots),
+    which fetches only the parts it does not hold yet. Slots above the
+    finalized slot are fetched with the given commitment. Spans longer than the
+    RPC node's limit of 500,000 slots are split into windows that are fetched
+    in parallel (see app.services.blocks).
     
     Args:
         start_slot: Start slot (inclusive)
         end_slot: End slot (inclusive), if None, the latest block will be used
         commitment: The level of commitment (processed, confirmed, finalized)
+        compact: Return runs of consecutive blocks and skipped slots instead of the slot list
     
     Returns:
         SolanaBlocksResponse: The list of available blocks
     """
-    # Build RPC request params
-    params = [start_slot]
-    
-    # Add end_slot if provided
-    if end_slot is not None:
-        params.append(end_slot)
-        
-    # Add commitment config if provided
-    if commitment:
-        config = {"commitment": commitment}
-        # If end_slot is not provided, we need to handle the RPC parameter order correctly
-        if end_slot is None:
-            params.append(None)  # Add a placeholder for end_slot
-        params.append(config)
-    
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getBlocks",
-        "params": params
-    }
-    
-    # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
-        
-        if "error" in result:
-            return SolanaBlocksResponse(
-                status="error",
-                message=f"RPC error: {result['error']['message']}",
-                error=result["error"]
-            )
-        
-        # Parse blocks data
-        blocks = result["result"]
-        
+        if end_slot is None:
+            end_slot = await latest_slot(commitment)
+
+        indexed = await slot_index.resolve(start_slot, end_slot)
+        blocks = slot_index.blocks(start_slot, indexed)
+        if indexed < end_slot:
+            blocks.extend(await blocks_in_range(indexed + 1, end_slot, commitment))
+
+        return _blocks_response(blocks, compact)
+
+    except BlockScanError as e:
         return SolanaBlocksResponse(
-            status="success",
-            blocks=blocks
+            status="error",
+            message=str(e),
+            error=e.error
         )
         
     except Exception as e:
@@ -491,57 +579,68 @@ def get_blocks(
         )
 
 
-def get_blocks_with_limit(
+async def get_blocks_with_limit(
     start_slot: int,
     limit: int,
-    commitment: Optional[str] = None
+    commitment: Optional[str] = None,
+    compact: bool = False
 ) -> SolanaBlocksResponse:
     """
     Get a list of confirmed blocks starting at a slot with a limit
+
+    Blocks the slot index holds without a gap from start_slot on are answered
+    from it, and finalized results are added to it (see app.services.slots).
+    Limits above the RPC node's maximum of 500,000 blocks are served from slot
+    ranges fetched in parallel (see app.services.blocks).
     
     Args:
         start_slot: Start slot (inclusive)
-        limit: Maximum number of blocks to return (must be no more than 500,000)
+        limit: Maximum number of blocks to return
         commitment: The level of commitment (processed, confirmed, finalized)
+        compact: Return runs of consecutive blocks and skipped slots instead of the slot list
     
     Returns:
         SolanaBlocksResponse: The list of available blocks
     """
-    # Build RPC request params
-    params = [start_slot, limit]
-    
-    # Add commitment config if provided
-    if commitment:
-        config = {"commitment": commitment}
-        params.append(config)
-    
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getBlocksWithLimit",
-        "params": params
-    }
-    
-    # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
-        
-        if "error" in result:
-            return SolanaBlocksResponse(
-                status="error",
-                message=f"RPC error: {result['error']['message']}",
-                error=result["error"]
-            )
-        
-        # Parse blocks data
-        blocks = result["result"]
+        blocks = await slot_index.first_blocks(start_slot, limit)
+        if blocks is not None:
+            return _blocks_response(blocks, compact)
+
+        if limit > MAX_BLOCKS_RANGE:
+            blocks = await blocks_with_limit(start_slot, limit, commitment)
+        else:
+            # Build RPC request params
+            params = [start_slot, limit]
+            
+            # Add commitment config if provided
+            if commitment:
+                config = {"commitment": commitment}
+                params.append(config)
+            
+            # Send request to Solana RPC node
+            result = await rpc_request("getBlocksWithLimit", params)
+            
+            if "error" in result:
+                return SolanaBlocksResponse(
+                    status="error",
+                    message=f"RPC error: {result['error']['message']}",
+                    error=result["error"]
+                )
+            
+            # Parse blocks data
+            blocks = result["result"]
+
+        if commitment in (None, "finalized"):
+            await slot_index.record_fetched(start_slot, blocks)
         
+        return _blocks_response(blocks, compact)
+
+    except BlockScanError as e:
         return SolanaBlocksResponse(
-            status="success",
-            blocks=blocks
+            status="error",
+            message=str(e),
+            error=e.error
         )
         
     except Exception as e:
@@ -551,7 +650,96 @@ def get_blocks_with_limit(
         )
 
 
-def get_block_time(slot: int) -> SolanaBlockTimeResponse:
+async def is_slot_skipped(slot: int) -> SolanaSlotSkippedResponse:
+    """
+    Check whether a finalized slot was skipped, from the slot index
+
+    Args:
+        slot: The slot to check
+
+    Returns:
+        SolanaSlotSkippedResponse: Whether the slot has no block
+    """
+    try:
+        await slot_index.resolve(slot, slot)
+        has_block = slot_index.has_block(slot)
+
+        if has_block is None:
+            return SolanaSlotSkippedResponse(
+                status="success",
+                slot=slot,
+                message=f"Slot {slot} is not finalized yet, or no later block is"
+            )
+
+        return SolanaSlotSkippedResponse(
+            status="success",
+            slot=slot,
+            skipped=not has_block
+        )
+
+    except BlockScanError as e:
+        return SolanaSlotSkippedResponse(
+            status="error",
+            message=str(e),
+            error=e.error
+        )
+
+    except Exception as e:
+        return SolanaSlotSkippedResponse(
+            status="error",
+            message=f"Failed to check slot: {str(e)}"
+        )
+
+
+async def get_skip_rate(start_slot: int, end_slot: Optional[int] = None) -> SolanaSkipRateResponse:
+    """
+    Count the skipped slots of a finalized slot range, from the slot index
+
+    Args:
+        start_slot: Start slot (inclusive)
+        end_slot: End slot (inclusive), if None, the finalized slot will be used
+
+    Returns:
+        SolanaSkipRateResponse: Slots, blocks and skipped slots in the range
+    """
+    try:
+        if end_slot is None:
+            end_slot = await latest_slot("finalized")
+        end_slot = await slot_index.resolve(start_slot, end_slot)
+
+        if end_slot < start_slot:
+            return SolanaSkipRateResponse(
+                status="success",
+                message=f"Slot {start_slot} is not finalized yet, or no later block is"
+            )
+
+        slots = end_slot - start_slot + 1
+        blocks = slot_index.count(start_slot, end_slot)
+        return SolanaSkipRateResponse(
+            status="success",
+            startSlot=start_slot,
+            endSlot=end_slot,
+            slots=slots,
+            blocks=blocks,
+            skipped=slots - blocks,
+            skipRate=(slots - blocks) / slots
+        )
+
+    except BlockScanError as e:
+        return SolanaSkipRateResponse(
+            status="error",
+            message=str(e),
+            error=e.error
+        )
+
+    except Exception as e:
+        return SolanaSkipRateResponse(
+            status="error",
+            message=f"Failed to get skip rate: {str(e)}"
+        )
+
+
+async def get_block_time(slot: int) -> SolanaBlockTimeResponse:
     """
     Get the estimated production time of a block
     
@@ -561,19 +749,9 @@ def get_block_time(slot: int) -> SolanaBlockTimeResponse:
     Returns:
         SolanaBlockTimeResponse: The block time information
     """
-    # Build RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getBlockTime",
-        "params": [slot]
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getBlockTime", [slot])
         
         if "error" in result:
             return SolanaBlockTimeResponse(
@@ -604,54 +782,29 @@ def get_block_time(slot: int) -> SolanaBlockTimeResponse:
         )
 
 
-def get_cluster_nodes() -> SolanaClusterNodesResponse:
+async def get_cluster_nodes() -> SolanaClusterNodesResponse:
     """
     Get information about all the nodes participating in the cluster
     
     Returns:
         SolanaClusterNodesResponse: The cluster nodes information
     """
-    # Build RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getClusterNodes",
-        "params": []
-    }
-    
-    # Send request to Solana RPC node
+    # Served from the node directory, which is refreshed in the background
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
-        
-        if "error" in result:
-            return SolanaClusterNodesResponse(
-                status="error",
-                message=f"RPC error: {result['error']['message']}",
-                error=result["error"]
-            )
-        
-        # Parse cluster nodes data
-        nodes_data = result["result"]
-        nodes = []
-        
-        for node in nodes_data:
-            nodes.append(SolanaClusterNodeInfo(
-                pubkey=node["pubkey"],
-                gossip=node.get("gossip"),
-                tpu=node.get("tpu"),
-                rpc=node.get("rpc"),
-                version=node.get("version"),
-                featureSet=node.get("featureSet"),
-                shredVersion=node.get("shredVersion")
-            ))
+        await node_directory.ensure_fresh()
             
         return SolanaClusterNodesResponse(
             status="success",
-            nodes=nodes
+            nodes=[SolanaClusterNodeInfo(**node) for node in node_directory.all()]
         )
         
+    except ClusterNodesError as e:
+        return SolanaClusterNodesResponse(
+            status="error",
+            message=str(e),
+            error=e.error
+        )
+
     except Exception as e:
         return SolanaClusterNodesResponse(
             status="error",
@@ -659,7 +812,156 @@ def get_cluster_nodes() -> SolanaClusterNodesResponse:
         )
 
 
-def get_epoch_info(commitment: Optional[str] = None) -> SolanaEpochInfoResponse:
+def _project_node(node: Dict[str, Any], fields: Optional[List[str]]) -> SolanaClusterNodeInfo:
+    if fields is None:
+        return SolanaClusterNodeInfo(**node)
+    return SolanaClusterNodeInfo(pubkey=node["pubkey"], **{field: node[field] for field in fields if field != "pubkey"})
+
+
+async def find_cluster_nodes(
+    pubkeys: Optional[List[str]] = None,
+    version: Optional[str] = None,
+    feature_set: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    limit: int = 100
+) -> SolanaClusterNodeLookupResponse:
+    """
+    Look up nodes in the cluster node directory
+
+    Args:
+        pubkeys: Only nodes with these public keys
+        version: Only nodes running this software version
+        feature_set: Only nodes with this feature set identifier
+        fields: Node fields to return besides pubkey (default: all)
+        limit: Maximum number of nodes to return
+
+    Returns:
+        SolanaClusterNodeLookupResponse: The matching nodes and any requested pubkeys that were not found
+    """
+    unknown = [field for field in fields or [] if field not in NODE_FIELDS]
+    if unknown:
+        return SolanaClusterNodeLookupResponse(
+            status="error",
+            message=f"Unknown node fields: {', '.join(unknown)}; expected any of {', '.join(NODE_FIELDS)}"
+        )
+    if limit < 1:
+        return SolanaClusterNodeLookupResponse(
+            status="error",
+            message="Limit must be at least 1"
+        )
+
+    try:
+        await node_directory.ensure_fresh()
+        nodes = node_directory.find(pubkeys, version, feature_set)
+
+        return SolanaClusterNodeLookupResponse(
+            status="success",
+            revision=node_directory.revision,
+            nodes=[_project_node(node, fields) for node in nodes[:limit]],
+            missing=[pubkey for pubkey in pubkeys if node_directory.node(pubkey) is None] if pubkeys is not None else None
+        )
+
+    except ClusterNodesError as e:
+        return SolanaClusterNodeLookupResponse(
+            status="error",
+            message=str(e),
+            error=e.error
+        )
+
+    except Exception as e:
+        return SolanaClusterNodeLookupResponse(
+            status="error",
+            message=f"Failed to look up cluster nodes: {str(e)}"
+        )
+
+
+async def get_cluster_node_versions(group_by: str = "version") -> SolanaClusterNodeGroupsResponse:
+    """
+    Count the nodes in the cluster per software version or feature set
+
+    Args:
+        group_by: "version" or "featureSet"
+
+    Returns:
+        SolanaClusterNodeGroupsResponse: The number of nodes in each group
+    """
+    if group_by not in ("version", "featureSet"):
+        return SolanaClusterNodeGroupsResponse(
+            status="error",
+            message="group_by must be version or featureSet"
+        )
+
+    try:
+        await node_directory.ensure_fresh()
+
+        return SolanaClusterNodeGroupsResponse(
+            status="success",
+            revision=node_directory.revision,
+            total=len(node_directory),
+            groups=[SolanaClusterNodeGroup(**{group_by: key, "count": count}) for key, count in node_directory.counts(group_by)]
+        )
+
+    except ClusterNodesError as e:
+        return SolanaClusterNodeGroupsResponse(
+            status="error",
+            message=str(e),
+            error=e.error
+        )
+
+    except Exception as e:
+        return SolanaClusterNodeGroupsResponse(
+            status="error",
+            message=f"Failed to count cluster nodes: {str(e)}"
+        )
+
+
+async def get_cluster_node_changes(since_revision: int = 0) -> SolanaClusterNodeChangesResponse:
+    """
+    Get the nodes that joined, left or changed since a revision of the node directory
+
+    Args:
+        since_revision: The revision returned by an earlier call (0 returns the full directory)
+
+    Returns:
+        SolanaClusterNodeChangesResponse: The changed nodes, the removed pubkeys and the current revision
+    """
+    try:
+        await node_directory.ensure_fresh()
+        changes = node_directory.changes_since(since_revision)
+
+        if changes is None:
+            return SolanaClusterNodeChangesResponse(
+                status="success",
+                revision=node_directory.revision,
+                resync=True,
+                nodes=[SolanaClusterNodeInfo(**node) for node in node_directory.all()],
+                removed=[]
+            )
+
+        upserted, removed = changes
+        return SolanaClusterNodeChangesResponse(
+            status="success",
+            revision=node_directory.revision,
+            resync=False,
+            nodes=[SolanaClusterNodeInfo(**node) for node in upserted],
+            removed=removed
+        )
+
+    except ClusterNodesError as e:
+        return SolanaClusterNodeChangesResponse(
+            status="error",
+            message=str(e),
+            error=e.error
+        )
+
+    except Exception as e:
+        return SolanaClusterNodeChangesResponse(
+            status="error",
+            message=f"Failed to get cluster node changes: {str(e)}"
+        )
+
+
+async def get_epoch_info(commitment: Optional[str] = None) -> SolanaEpochInfoResponse:
     """
     Get information about the current epoch
     
@@ -674,19 +976,9 @@ def get_epoch_info(commitment: Optional[str] = None) -> SolanaEpochInfoResponse:
     if commitment:
         params.append({"commitment": commitment})
     
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getEpochInfo",
-        "params": params
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getEpochInfo", params)
         
         if "error" in result:
             return SolanaEpochInfoResponse(
@@ -717,26 +1009,16 @@ def get_epoch_info(commitment: Optional[str] = None) -> SolanaEpochInfoResponse:
         )
 
 
-def get_epoch_schedule() -> SolanaEpochScheduleResponse:
+async def get_epoch_schedule() -> SolanaEpochScheduleResponse:
     """
     Get epoch schedule information from this cluster
     
     Returns:
         SolanaEpochScheduleResponse: The epoch schedule information
     """
-    # Build RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getEpochSchedule",
-        "params": []
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getEpochSchedule")
         
         if "error" in result:
             return SolanaEpochScheduleResponse(
@@ -766,7 +1048,80 @@ def get_epoch_schedule() -> SolanaEpochScheduleResponse:
         )
 
 
-def get_fee_for_message(message: str, commitment: Optional[str] = None) -> SolanaFeeForMessageResponse:
+async def get_epoch_for_slot(slot: int) -> SolanaEpochSlotsResponse:
+    """
+    Get the epoch containing a slot, computed locally from the epoch schedule
+    
+    Args:
+        slot: The slot to convert
+    
+    Returns:
+        SolanaEpochSlotsResponse: The epoch, the slot's index within it and the epoch's slot range
+    """
+    try:
+        calculator = await epoch_calculator()
+        epoch, slot_index = calculator.epoch_and_slot_index(slot)
+
+        return SolanaEpochSlotsResponse(
+            status="success",
+            slot=slot,
+            epoch=epoch,
+            slotIndex=slot_index,
+            slotsInEpoch=calculator.slots_in_epoch(epoch),
+            firstSlot=calculator.first_slot(epoch),
+            lastSlot=calculator.last_slot(epoch)
+        )
+
+    except EpochScheduleError as e:
+        return SolanaEpochSlotsResponse(
+            status="error",
+            message=str(e),
+            error=e.error
+        )
+
+    except Exception as e:
+        return SolanaEpochSlotsResponse(
+            status="error",
+            message=f"Failed to convert slot: {str(e)}"
+        )
+
+
+async def get_epoch_slot_range(epoch: int) -> SolanaEpochSlotsResponse:
+    """
+    Get the first and last slot of an epoch, computed locally from the epoch schedule
+    
+    Args:
+        epoch: The epoch to convert
+    
+    Returns:
+        SolanaEpochSlotsResponse: The epoch's slot range
+    """
+    try:
+        calculator = await epoch_calculator()
+
+        return SolanaEpochSlotsResponse(
+            status="success",
+            epoch=epoch,
+            slotsInEpoch=calculator.slots_in_epoch(epoch),
+            firstSlot=calculator.first_slot(epoch),
+            lastSlot=calculator.last_slot(epoch)
+        )
+
+    except EpochScheduleError as e:
+        return SolanaEpochSlotsResponse(
+            status="error",
+            message=str(e),
+            error=e.error
+        )
+
+    except Exception as e:
+        return SolanaEpochSlotsResponse(
+            status="error",
+            message=f"Failed to convert epoch: {str(e)}"
+        )
+
+
+async def get_fee_for_message(message: str, commitment: Optional[str] = None) -> SolanaFeeForMessageResponse:
     """
     Get the fee for a message
     
@@ -783,19 +1138,9 @@ def get_fee_for_message(message: str, commitment: Optional[str] = None) -> Solan
     if commitment:
         params.append({"commitment": commitment})
     
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getFeeForMessage",
-        "params": params
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getFeeForMessage", params)
         
         if "error" in result:
             return SolanaFeeForMessageResponse(
@@ -825,26 +1170,16 @@ def get_fee_for_message(message: str, commitment: Optional[str] = None) -> Solan
         )
 
 
-def get_first_available_block() -> SolanaFirstAvailableBlockResponse:
+async def get_first_available_block() -> SolanaFirstAvailableBlockResponse:
     """
     Get the first available block in the ledger
     
     Returns:
         SolanaFirstAvailableBlockResponse: The first available block information
     """
-    # Build RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getFirstAvailableBlock",
-        "params": []
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getFirstAvailableBlock")
         
         if "error" in result:
             return SolanaFirstAvailableBlockResponse(
@@ -868,26 +1203,16 @@ def get_first_available_block() -> SolanaFirstAvailableBlockResponse:
         )
 
 
-def get_genesis_hash() -> SolanaGenesisHashResponse:
+async def get_genesis_hash() -> SolanaGenesisHashResponse:
     """
     Get the genesis hash of the cluster
     
     Returns:
         SolanaGenesisHashResponse: The genesis hash information
     """
-    # Build RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getGenesisHash",
-        "params": []
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getGenesisHash")
         
         if "error" in result:
             return SolanaGenesisHashResponse(
@@ -911,26 +1236,16 @@ def get_genesis_hash() -> SolanaGenesisHashResponse:
         )
 
 
-def get_health() -> SolanaHealthResponse:
+async def get_health() -> SolanaHealthResponse:
     """
     Get the health of the node
     
     Returns:
         SolanaHealthResponse: The node health information
     """
-    # Build RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getHealth",
-        "params": []
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getHealth")
         
         # Special case: Health API returns error when the node is unhealthy
         if "error" in result:
@@ -955,6 +1270,14 @@ def get_health() -> SolanaHealthResponse:
             healthy=True
         )
         
+    except NoHealthyEndpointError as e:
+        # Background probes already found every configured node unhealthy
+        return SolanaHealthResponse(
+            status="success",
+            healthy=False,
+            message=str(e)
+        )
+        
     except Exception as e:
         return SolanaHealthResponse(
             status="error",
@@ -962,26 +1285,16 @@ def get_health() -> SolanaHealthResponse:
         )
 
 
-def get_highest_snapshot_slot() -> SolanaHighestSnapshotSlotResponse:
+async def get_highest_snapshot_slot() -> SolanaHighestSnapshotSlotResponse:
     """
     Get the highest snapshot slot available
     
     Returns:
         SolanaHighestSnapshotSlotResponse: The highest snapshot slot information
     """
-    # Build RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getHighestSnapshotSlot",
-        "params": []
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getHighestSnapshotSlot")
         
         if "error" in result:
             return SolanaHighestSnapshotSlotResponse(
@@ -1008,26 +1321,16 @@ def get_highest_snapshot_slot() -> SolanaHighestSnapshotSlotResponse:
         )
 
 
-def get_identity() -> SolanaIdentityResponse:
+async def get_identity() -> SolanaIdentityResponse:
     """
     Get the identity pubkey for the current node
     
     Returns:
         SolanaIdentityResponse: The node identity information
     """
-    # Build RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getIdentity",
-        "params": []
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getIdentity")
         
         if "error" in result:
             return SolanaIdentityResponse(
@@ -1053,7 +1356,7 @@ def get_identity() -> SolanaIdentityResponse:
         )
 
 
-def get_inflation_governor(commitment: Optional[str] = None) -> SolanaInflationGovernorResponse:
+async def get_inflation_governor(commitment: Optional[str] = None) -> SolanaInflationGovernorResponse:
     """
     Get the inflation governor parameters
     
@@ -1068,19 +1371,9 @@ def get_inflation_governor(commitment: Optional[str] = None) -> SolanaInflationG
     if commitment:
         params.append({"commitment": commitment})
     
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getInflationGovernor",
-        "params": params
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getInflationGovernor", params)
         
         if "error" in result:
             return SolanaInflationGovernorResponse(
@@ -1110,26 +1403,16 @@ def get_inflation_governor(commitment: Optional[str] = None) -> SolanaInflationG
         )
 
 
-def get_inflation_rate() -> SolanaInflationRateResponse:
+async def get_inflation_rate() -> SolanaInflationRateResponse:
     """
     Get the specific inflation values for the current epoch
     
     Returns:
         SolanaInflationRateResponse: The current inflation rate
     """
-    # Build RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getInflationRate",
-        "params": []
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getInflationRate")
         
         if "error" in result:
             return SolanaInflationRateResponse(
@@ -1158,7 +1441,7 @@ def get_inflation_rate() -> SolanaInflationRateResponse:
         )
 
 
-def get_inflation_reward(
+async def get_inflation_reward(
     addresses: List[str],
     epoch: Optional[int] = None,
     commitment: Optional[str] = None
@@ -1177,7 +1460,8 @@ def get_inflation_reward(
     # Build RPC request params
     params = [addresses]
     
-    # Create config object if needed
+    # Create config object if needed. Only results for an explicit epoch can
+    # go into the permanent store: without one the answer moves every epoch.
     config = {}
     if epoch is not None:
         config["epoch"] = epoch
@@ -1186,20 +1470,10 @@ def get_inflation_reward(
     
     if config:
         params.append(config)
-    
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getInflationReward",
-        "params": params
-    }
-    
+
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getInflationReward", params)
         
         if "error" in result:
             return SolanaInflationRewardResponse(
@@ -1236,7 +1510,7 @@ def get_inflation_reward(
         )
 
 
-def get_largest_accounts(
+async def get_largest_accounts(
     filter_opt: Optional[str] = None,
     commitment: Optional[str] = None
 ) -> SolanaLargestAccountsResponse:
@@ -1263,19 +1537,9 @@ def get_largest_accounts(
     if config:
         params.append(config)
     
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getLargestAccounts",
-        "params": params
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getLargestAccounts", params)
         
         if "error" in result:
             return SolanaLargestAccountsResponse(
@@ -1306,7 +1570,7 @@ def get_largest_accounts(
         )
 
 
-def get_latest_blockhash(commitment: Optional[str] = None) -> SolanaLatestBlockhashResponse:
+async def get_latest_blockhash(commitment: Optional[str] = None) -> SolanaLatestBlockhashResponse:
     """
     Get the latest blockhash
     
@@ -1321,19 +1585,13 @@ def get_latest_blockhash(commitment: Optional[str] = None) -> SolanaLatestBlockh
     if commitment:
         params.append({"commitment": commitment})
     
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getLatestBlockhash",
-        "params": params
-    }
-    
-    # Send request to Solana RPC node
+    # Send request to Solana RPC node, or read the value the background refresher keeps fresh
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        blockhashes = get_rpc_client().blockhashes
+        if blockhashes is not None:
+            result = await blockhashes.latest(commitment)
+        else:
+            result = await rpc_request("getLatestBlockhash", params)
         
         if "error" in result:
             return SolanaLatestBlockhashResponse(
@@ -1360,13 +1618,54 @@ def get_latest_blockhash(commitment: Optional[str] = None) -> SolanaLatestBlockh
         )
 
 
-def get_leader_schedule(
+async def check_blockhash_validity(blockhash: str) -> SolanaBlockhashValidityResponse:
+    """
+    Check whether a blockhash can still be used, without an RPC request
+
+    The blockhash is compared against a locally tracked block height (see
+    app.core.blockhash). Only blockhashes returned by get_latest_blockhash
+    are known.
+
+    Args:
+        blockhash: The blockhash to check, as base-58 encoded string
+
+    Returns:
+        SolanaBlockhashValidityResponse: Whether the blockhash is still valid and how many blocks remain
+    """
+    blockhashes = get_rpc_client().blockhashes
+    if blockhashes is None:
+        return SolanaBlockhashValidityResponse(
+            status="error",
+            message="Blockhash tracking is disabled (SOLANA_BLOCKHASH_REFRESH_INTERVAL=0)"
+        )
+
+    validity = blockhashes.validity(blockhash)
+    return SolanaBlockhashValidityResponse(
+        status="success",
+        blockhash=blockhash,
+        message=None if validity["known"] else "Blockhash was not returned by get_latest_blockhash; its validity is unknown",
+        **validity
+    )
+
+
+async def _current_slot(commitment: Optional[str] = None) -> int:
+    """Get the current slot, raising LeaderScheduleError on an RPC error"""
+    result = await rpc_request("getSlot", [{"commitment": commitment}] if commitment else [])
+    if "error" in result:
+        raise LeaderScheduleError(f"RPC error: {result['error']['message']}", result["error"])
+    return result["result"]
+
+
+async def get_leader_schedule(
     slot: Optional[int] = None,
     identity: Optional[str] = None,
     commitment: Optional[str] = None
 ) -> SolanaLeaderScheduleResponse:
     """
     Get the leader schedule for the current or a specific epoch
+
+    The schedule of each epoch is fetched once and served from the leader
+    schedule cache (see app.services.leaders) afterwards.
     
     Args:
         slot: Slot to get leader schedule for (defaults to current slot)
@@ -1376,62 +1675,34 @@ def get_leader_schedule(
     Returns:
         SolanaLeaderScheduleResponse: The leader schedule information
     """
-    # Build RPC request params
-    params = []
-    
-    # Add slot if provided
-    if slot is not None:
-        params.append(slot)
-    
-    # Create config object if needed
-    config = {}
-    if identity:
-        config["identity"] = identity
-    if commitment:
-        config["commitment"] = commitment
-    
-    if config:
-        # If slot wasn't provided but we have config, add null for slot
-        if slot is None:
-            params.append(None)
-        params.append(config)
-    
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getLeaderSchedule",
-        "params": params
-    }
-    
-    # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
-        
-        if "error" in result:
-            return SolanaLeaderScheduleResponse(
-                status="error",
-                message=f"RPC error: {result['error']['message']}",
-                error=result["error"]
-            )
-        
-        # Parse leader schedule data
-        schedule = result["result"]
-        
-        # Handle case where schedule might be null
-        if schedule is None:
+        if slot is None:
+            slot = await _current_slot(commitment)
+        index = await leader_schedules.index_for_slot(slot)
+
+        if identity:
+            slots = index.slots_of(identity)
+            schedule = {identity: slots} if slots else {}
+        else:
+            schedule = index.schedule()
+
+        return SolanaLeaderScheduleResponse(
+            status="success",
+            schedule=schedule
+        )
+
+    except LeaderScheduleError as e:
+        if e.error is None:
             return SolanaLeaderScheduleResponse(
                 status="success",
                 message="No leader schedule found for the given parameters"
             )
-        
         return SolanaLeaderScheduleResponse(
-            status="success",
-            schedule=schedule
+            status="error",
+            message=str(e),
+            error=e.error
         )
-        
+
     except Exception as e:
         return SolanaLeaderScheduleResponse(
             status="error",
@@ -1439,26 +1710,64 @@ def get_leader_schedule(
         )
 
 
-def get_max_retransmit_slot() -> SolanaMaxRetransmitSlotResponse:
+async def get_slot_leaders(
+    start_slot: Optional[int] = None,
+    limit: int = 1,
+    commitment: Optional[str] = None
+) -> SolanaSlotLeadersResponse:
+    """
+    Get the leaders of consecutive slots from the cached leader schedule
+
+    Args:
+        start_slot: First slot to look up (defaults to the current slot)
+        limit: Number of consecutive slots to look up (at most MAX_SLOT_LEADERS)
+        commitment: The level of commitment used to get the current slot
+
+    Returns:
+        SolanaSlotLeadersResponse: The leader of each slot
+    """
+    if not 1 <= limit <= MAX_SLOT_LEADERS:
+        return SolanaSlotLeadersResponse(
+            status="error",
+            message=f"limit must be between 1 and {MAX_SLOT_LEADERS}"
+        )
+
+    try:
+        if start_slot is None:
+            start_slot = await _current_slot(commitment)
+        index = await leader_schedules.index_for_slot(start_slot)
+        leaders = await leader_schedules.leaders(start_slot, limit)
+
+        return SolanaSlotLeadersResponse(
+            status="success",
+            epoch=index.epoch,
+            leaders=[SolanaSlotLeader(slot=slot, leader=leader) for slot, leader in leaders]
+        )
+
+    except LeaderScheduleError as e:
+        return SolanaSlotLeadersResponse(
+            status="error",
+            message=str(e),
+            error=e.error
+        )
+
+    except Exception as e:
+        return SolanaSlotLeadersResponse(
+            status="error",
+            message=f"Failed to get slot leaders: {str(e)}"
+        )
+
+
+async def get_max_retransmit_slot() -> SolanaMaxRetransmitSlotResponse:
     """
     Get the max slot that has been retransmitted by the node
     
     Returns:
         SolanaMaxRetransmitSlotResponse: The max retransmit slot information
     """
-    # Build RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getMaxRetransmitSlot",
-        "params": []
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getMaxRetransmitSlot")
         
         if "error" in result:
             return SolanaMaxRetransmitSlotResponse(
@@ -1482,26 +1791,16 @@ def get_max_retransmit_slot() -> SolanaMaxRetransmitSlotResponse:
         )
 
 
-def get_max_shred_insert_slot() -> SolanaMaxShredInsertSlotResponse:
+async def get_max_shred_insert_slot() -> SolanaMaxShredInsertSlotResponse:
     """
     Get the highest slot where shreds have been inserted by the node
     
     Returns:
         SolanaMaxShredInsertSlotResponse: The max shred insert slot information
     """
-    # Build RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getMaxShredInsertSlot",
-        "params": []
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getMaxShredInsertSlot")
         
         if "error" in result:
             return SolanaMaxShredInsertSlotResponse(
@@ -1525,55 +1824,44 @@ def get_max_shred_insert_slot() -> SolanaMaxShredInsertSlotResponse:
         )
 
 
-def get_minimum_balance_for_rent_exemption(
+async def get_minimum_balance_for_rent_exemption(
     data_size: int,
     commitment: Optional[str] = None
 ) -> SolanaMinimumBalanceForRentExemptionResponse:
     """
     Get the minimum balance required for rent exemption for a data size
+
+    The minimum is computed locally from the cached Rent sysvar (see
+    app.services.rent) instead of calling getMinimumBalanceForRentExemption.
     
     Args:
         data_size: Size of data in bytes
-        commitment: The level of commitment (processed, confirmed, finalized)
+        commitment: Unused; kept for compatibility. The Rent sysvar only changes at epoch boundaries
     
     Returns:
         SolanaMinimumBalanceForRentExemptionResponse: The minimum balance information
     """
-    # Build RPC request params
-    params = [data_size]
-    
-    if commitment:
-        params.append({"commitment": commitment})
-    
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getMinimumBalanceForRentExemption",
-        "params": params
-    }
-    
-    # Send request to Solana RPC node
+    if data_size < 0:
+        return SolanaMinimumBalanceForRentExemptionResponse(
+            status="error",
+            message="data_size must not be negative"
+        )
+
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
-        
-        if "error" in result:
-            return SolanaMinimumBalanceForRentExemptionResponse(
-                status="error",
-                message=f"RPC error: {result['error']['message']}",
-                error=result["error"]
-            )
-        
-        # Parse minimum balance data
-        lamports = result["result"]
-        
+        rent = await rent_cache.rent()
+
         return SolanaMinimumBalanceForRentExemptionResponse(
             status="success",
-            lamports=lamports
+            lamports=rent.minimum_balance(data_size)
         )
-        
+
+    except (RentError, EpochScheduleError) as e:
+        return SolanaMinimumBalanceForRentExemptionResponse(
+            status="error",
+            message=str(e),
+            error=e.error
+        )
+
     except Exception as e:
         return SolanaMinimumBalanceForRentExemptionResponse(
             status="error",
@@ -1581,77 +1869,101 @@ def get_minimum_balance_for_rent_exemption(
         )
 
 
-def get_multiple_accounts(
+async def get_rent_exempt_minimums(data_sizes: List[int]) -> SolanaRentExemptMinimumsResponse:
+    """
+    Get the rent-exempt minimum balance for many data sizes at once
+
+    Args:
+        data_sizes: Sizes of account data in bytes
+
+    Returns:
+        SolanaRentExemptMinimumsResponse: The minimum for each size and the Rent parameters used
+    """
+    if any(size < 0 for size in data_sizes):
+        return SolanaRentExemptMinimumsResponse(
+            status="error",
+            message="Data sizes must not be negative"
+        )
+
+    try:
+        rent = await rent_cache.rent()
+
+        return SolanaRentExemptMinimumsResponse(
+            status="success",
+            minimums=[
+                SolanaRentExemptMinimum(dataSize=size, lamports=rent.minimum_balance(size))
+                for size in data_sizes
+            ],
+            rent=rent.to_dict()
+        )
+
+    except (RentError, EpochScheduleError) as e:
+        return SolanaRentExemptMinimumsResponse(
+            status="error",
+            message=str(e),
+            error=e.error
+        )
+
+    except Exception as e:
+        return SolanaRentExemptMinimumsResponse(
+            status="error",
+            message=f"Failed to compute rent-exempt minimums: {str(e)}"
+        )
+
+
+async def get_multiple_accounts(
     addresses: List[str],
     encoding: str = "base58",
     data_slice: Optional[Dict[str, int]] = None,
-    commitment: Optional[str] = None
+    commitment: Optional[str] = None,
+    min_context_slot: Optional[int] = None
 ) -> 'SolanaMultipleAccountsResponse':
     """
     Get information for multiple accounts
     
     Args:
-        addresses: List of account addresses to query (max 100)
+        addresses: List of account addresses to query, fetched in concurrent chunks of 100
         encoding: Encoding format for Account data (base58, base64, base64+zstd, jsonParsed)
         data_slice: Optional slice of account data {offset: int, length: int}
         commitment: The level of commitment (processed, confirmed, finalized)
+        min_context_slot: Lowest slot any chunk may be answered at (default: the slot of the first chunk)
     
     Returns:
         SolanaMultipleAccountsResponse: The multiple accounts information
     """
-    # Build RPC request params
-    params = [addresses, {"encoding": encoding}]
+    # Build RPC request config
+    config = {"encoding": encoding}
     
     # Add dataSlice if provided
     if data_slice:
-        params[1]["dataSlice"] = data_slice
+        config["dataSlice"] = data_slice
         
     # Add commitment if provided
     if commitment:
-        params[1]["commitment"] = commitment
-    
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getMultipleAccounts",
-        "params": params
-    }
+        config["commitment"] = commitment
     
-    # Send request to Solana RPC node
+    # Send requests to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
-        
-        if "error" in result:
-            return SolanaMultipleAccountsResponse(
-                status="error",
-                message=f"RPC error: {result['error']['message']}",
-                error=result["error"]
-            )
+        result = await fetch_multiple_accounts(addresses, config, min_context_slot)
         
-        # Parse account data
-        accounts_data = []
-        for account_data in result["result"]["value"]:
-            if account_data is None:
-                accounts_data.append(None)
-            else:
-                accounts_data.append(SolanaAccountData(
-                    data=account_data["data"],
-                    executable=account_data["executable"],
-                    lamports=account_data["lamports"],
-                    owner=account_data["owner"],
-                    rentEpoch=account_data["rentEpoch"],
-                    space=account_data.get("space", 0)
-                ))
+        # Parse account data: the whole list is validated in one call
+        accounts_data = ACCOUNT_DATA_LIST.validate_python(result.values)
         
         return SolanaMultipleAccountsResponse(
             status="success",
             value=accounts_data,
-            context=result["result"].get("context", {})
+            context=result.context,
+            minContextSlot=result.min_context_slot,
+            contextSlotRange=list(result.slot_range) if result.slot_range else None
         )
         
+    except MultipleAccountsError as e:
+        return SolanaMultipleAccountsResponse(
+            status="error",
+            message=str(e),
+            error=e.error
+        )
+
     except Exception as e:
         return SolanaMultipleAccountsResponse(
             status="error",
@@ -1659,7 +1971,7 @@ def get_multiple_accounts(
         )
 
 
-def get_program_accounts(
+async def get_program_accounts(
     program_id: str,
     encoding: str = "base58",
     data_slice: Optional[Dict[str, int]] = None,
@@ -1696,19 +2008,9 @@ def get_program_accounts(
     if commitment:
         params[1]["commitment"] = commitment
     
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getProgramAccounts",
-        "params": params
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getProgramAccounts", params)
         
         if "error" in result:
             return SolanaProgramAccountsResponse(
@@ -1718,7 +2020,6 @@ def get_program_accounts(
             )
         
         # Parse account data
-        accounts = []
         result_data = result["result"]
         
         # Handle both with_context and without_context responses
@@ -1729,21 +2030,8 @@ def get_program_accounts(
             account_list = result_data
             context = {}
         
-        for account_item in account_list:
-            pubkey = account_item["pubkey"]
-            account_data = account_item["account"]
-            
-            accounts.append(SolanaProgramAccount(
-                pubkey=pubkey,
-                account=SolanaAccountData(
-                    data=account_data["data"],
-                    executable=account_data["executable"],
-                    lamports=account_data["lamports"],
-                    owner=account_data["owner"],
-                    rentEpoch=account_data["rentEpoch"],
-                    space=account_data.get("space", 0)
-                )
-            ))
+        # The whole list is validated in one call
+        accounts = PROGRAM_ACCOUNT_LIST.validate_python(account_list)
         
         return SolanaProgramAccountsResponse(
             status="success",
@@ -1758,7 +2046,209 @@ def get_program_accounts(
         )
 
 
-def get_recent_performance_samples(
+async def stream_program_accounts(
+    program_id: str,
+    sink: Any,
+    encoding: str = "base64",
+    data_slice: Optional[Dict[str, int]] = None,
+    filters: Optional[List[Dict]] = None,
+    with_context: bool = False,
+    commitment: Optional[str] = None,
+    predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+) -> 'SolanaProgramAccountsStreamResponse':
+    """
+    Stream all accounts owned by a program into a sink
+
+    The response is parsed one account at a time as it arrives, so memory use
+    stays bounded however many accounts the program owns.
+
+    Args:
+        program_id: Program ID to query accounts for
+        sink: Receives each matching account (see app.services.streaming)
+        encoding: Encoding format for Account data (base58, base64, base64+zstd, jsonParsed)
+        data_slice: Optional slice of account data {offset: int, length: int}
+        filters: Optional RPC filters applied by the node
+        with_context: Whether to wrap the result in an RpcResponse JSON object
+        commitment: The level of commitment (processed, confirmed, finalized)
+        predicate: Optional client-side filter on each raw account item
+
+    Returns:
+        SolanaProgramAccountsStreamResponse: Counts and the sink's summary
+    """
+    params = [program_id, {"encoding": encoding, "withContext": with_context}]
+    if data_slice:
+        params[1]["dataSlice"] = data_slice
+    if filters:
+        params[1]["filters"] = filters
+    if commitment:
+        params[1]["commitment"] = commitment
+
+    parser = JsonArrayStream([("result",), ("result", "value")])
+    scanned = 0
+    matched = 0
+    try:
+        async for item in get_rpc_client().stream("getProgramAccounts", params, parser):
+            scanned += 1
+            if predicate is None or predicate(item):
+                matched += 1
+                sink.add(item)
+        result = parser.close()
+
+        if "error" in result:
+            return SolanaProgramAccountsStreamResponse(
+                status="error",
+                message=f"RPC error: {result['error']['message']}",
+                error=result["error"]
+            )
+
+        result_data = result["result"]
+        return SolanaProgramAccountsStreamResponse(
+            status="success",
+            scanned=scanned,
+            matched=matched,
+            context=result_data.get("context") if isinstance(result_data, dict) else None,
+            **sink.summary()
+        )
+
+    except Exception as e:
+        return SolanaProgramAccountsStreamResponse(
+            status="error",
+            message=f"Failed to stream program accounts: {str(e)}"
+        )
+    finally:
+        sink.close()
+
+
+async def scan_blocks(
+    start_slot: int,
+    end_slot: int,
+    sink: Any,
+    encoding: str = "json",
+    transaction_details: str = "full",
+    rewards: bool = False,
+    max_supported_transaction_version: Optional[int] = 0,
+    commitment: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    max_blocks: Optional[int] = None,
+    checkpoint: Optional[str] = None
+) -> SolanaBlockScanResponse:
+    """
+    Scan every confirmed block in a slot range into a sink
+
+    Blocks are fetched concurrently and handed to the sink in slot order. With
+    a checkpoint, progress and the sink's state are saved as the scan runs,
+    and a later call with the same checkpoint continues where this one stopped.
+
+    Args:
+        start_slot: First slot of the range
+        end_slot: Last slot of the range
+        sink: Receives each block with its "slot" added (see app.services.streaming)
+        encoding: Encoding format for transaction data (json, jsonParsed, base58, base64)
+        transaction_details: Level of transaction detail to return (full, accounts, signatures, none)
+        rewards: Whether to include rewards in the blocks
+        max_supported_transaction_version: Max transaction version to return
+        commitment: The level of commitment (confirmed, finalized)
+        concurrency: Most getBlock requests in flight at once (default: SOLANA_BLOCK_SCAN_CONCURRENCY)
+        max_blocks: Stop after this many blocks; the scan can be continued with the checkpoint
+        checkpoint: Name of the checkpoint file in the export directory
+
+    Returns:
+        SolanaBlockScanResponse: Progress, counts and the sink's summary
+    """
+    if concurrency is None:
+        concurrency = SOLANA_BLOCK_SCAN_CONCURRENCY
+    if end_slot < start_slot:
+        return SolanaBlockScanResponse(
+            status="error",
+            message="end_slot must not be lower than start_slot"
+        )
+    if concurrency < 1 or (max_blocks is not None and max_blocks < 1):
+        return SolanaBlockScanResponse(
+            status="error",
+            message="concurrency and max_blocks must be at least 1"
+        )
+
+    config = {"encoding": encoding, "transactionDetails": transaction_details, "rewards": rewards}
+    if max_supported_transaction_version is not None:
+        config["maxSupportedTransactionVersion"] = max_supported_transaction_version
+    if commitment:
+        config["commitment"] = commitment
+
+    progress = None
+    started = False
+    scanned = 0
+    skipped = 0
+    try:
+        progress = ScanCheckpoint(checkpoint, {
+            "start_slot": start_slot,
+            "end_slot": end_slot,
+            "config": config,
+            "sink": type(sink).__name__
+        })
+        if progress.resumed:
+            sink.restore(progress.sink)
+        started = True
+
+        if not progress.complete:
+            slots = confirmed_slots(progress.next_slot, end_slot, commitment)
+            blocks = fetch_blocks(slots, config, concurrency)
+            try:
+                async for slot, block in blocks:
+                    if block is None:
+                        skipped += 1
+                    else:
+                        sink.add({"slot": slot, **block})
+                        scanned += 1
+                    progress.advance(slot, block is not None)
+                    if progress.due():
+                        progress.save(sink.checkpoint())
+                    if max_blocks is not None and scanned >= max_blocks:
+                        break
+                else:
+                    progress.finish()
+            finally:
+                await blocks.aclose()
+                await slots.aclose()
+                progress.save(sink.checkpoint())
+
+        return SolanaBlockScanResponse(
+            status="success",
+            startSlot=start_slot,
+            endSlot=end_slot,
+            nextSlot=progress.next_slot,
+            complete=progress.complete,
+            resumed=progress.resumed,
+            scanned=scanned,
+            skipped=skipped,
+            totalScanned=progress.blocks,
+            totalSkipped=progress.skipped,
+            checkpoint=progress.path,
+            **sink.summary()
+        )
+
+    except BlockScanError as e:
+        return SolanaBlockScanResponse(
+            status="error",
+            nextSlot=progress.next_slot if progress is not None else None,
+            checkpoint=progress.path if progress is not None else None,
+            message=str(e),
+            error=e.error
+        )
+
+    except Exception as e:
+        return SolanaBlockScanResponse(
+            status="error",
+            nextSlot=progress.next_slot if progress is not None else None,
+            checkpoint=progress.path if progress is not None else None,
+            message=f"Failed to scan blocks: {str(e)}"
+        )
+    finally:
+        # A scan that could not start leaves the output of the previous one as it is
+        if started:
+            sink.close()
+
+
+async def get_recent_performance_samples(
     limit: Optional[int] = None
 ) -> 'SolanaRecentPerformanceSamplesResponse':
     """
@@ -1775,19 +2265,9 @@ def get_recent_performance_samples(
     if limit is not None:
         params.append(limit)
     
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getRecentPerformanceSamples",
-        "params": params
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getRecentPerformanceSamples", params)
         
         if "error" in result:
             return SolanaRecentPerformanceSamplesResponse(
@@ -1818,7 +2298,7 @@ def get_recent_performance_samples(
         )
 
 
-def get_recent_prioritization_fees(
+async def get_recent_prioritization_fees(
     addresses: Optional[List[str]] = None
 ) -> 'SolanaRecentPrioritizationFeesResponse':
     """
@@ -1835,19 +2315,9 @@ def get_recent_prioritization_fees(
     if addresses is not None:
         params.append(addresses)
     
-    # Build full RPC request
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getRecentPrioritizationFees",
-        "params": params
-    }
-    
     # Send request to Solana RPC node
     try:
-        response = requests.post(SOLANA_RPC_URL, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        result = await rpc_request("getRecentPrioritizationFees", params)
         
         if "error" in result:
             return SolanaRecentPrioritizationFeesResponse(
@@ -1873,4 +2343,24 @@ def get_recent_prioritization_fees(
         return SolanaRecentPrioritizationFeesResponse(
             status="error",
             message=f"Failed to get recent prioritization fees: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+
+async def get_rpc_stats() -> SolanaRpcStatsResponse:
+    """
+    Get statistics for the shared RPC transport
+    
+    Returns:
+        SolanaRpcStatsResponse: Counters for batching and request coalescing
+    """
+    try:
+        return SolanaRpcStatsResponse(
+            status="success",
+            stats=get_rpc_client().stats()
+        )
+        
+    except Exception as e:
+        return SolanaRpcStatsResponse(
+            status="error",
+            message=f"Failed to get RPC stats: {str(e)}"
+        )
@@ -0,0 +1,370 @@
+"""
+Filters, projections and sinks for streamed RPC results
+
+Streamed accounts are handed one at a time to a sink, which either keeps a
+bounded number of them for the tool response, writes them to a JSON Lines
+file, or only keeps running totals. No sink holds the whole result set.
+
+Streamed block transactions are checked against drop predicates (vote
+transactions, failed transactions, ...) while still plain JSON, so only
+the transactions that are kept are turned into models.
+
+Block-range scans hand whole blocks to the same sinks, projected with
+project_block, or to BlockAggregateSink. Sinks can report their state for a
+scan checkpoint and be restored from it, so an interrupted scan resumes
+without losing or repeating output.
+"""
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO
+
+from app.core.config import SOLANA_EXPORT_DIR
+
+ACCOUNT_FIELDS = ("pubkey", "lamports", "owner", "space", "executable", "rentEpoch", "data")
+
+BLOCK_FIELDS = (
+    "slot", "blockhash", "previousBlockhash", "parentSlot", "blockTime", "blockHeight",
+    "transactionCount", "transactions", "signatures", "rewards"
+)
+
+VOTE_PROGRAM_ID = "Vote111111111111111111111111111111111111111"
+
+
+def unknown_fields(fields: Optional[List[str]], known: Iterable[str], kind: str) -> Optional[str]:
+    """
+    Check requested fields before a scan starts
+
+    Args:
+        fields: Requested fields, or None for the default
+        known: Fields that can be requested (ACCOUNT_FIELDS or BLOCK_FIELDS)
+        kind: What the fields belong to, for the message (account, block)
+
+    Returns:
+        Optional[str]: An error message naming the unknown fields, or None if all are known
+    """
+    known = tuple(known)
+    unknown = [field for field in fields or [] if field not in known]
+    if not unknown:
+        return None
+    return f"Unknown {kind} fields: {', '.join(unknown)}; expected any of {', '.join(known)}"
+
+
+def account_predicate(
+    min_lamports: Optional[int] = None,
+    max_lamports: Optional[int] = None
+) -> Optional[Callable[[Dict[str, Any]], bool]]:
+    """
+    Build a filter for streamed program accounts
+
+    Args:
+        min_lamports: Keep accounts holding at least this many lamports
+        max_lamports: Keep accounts holding at most this many lamports
+
+    Returns:
+        Optional[Callable]: A predicate on raw account items, or None to keep everything
+    """
+    if min_lamports is None and max_lamports is None:
+        return None
+
+    def predicate(item: Dict[str, Any]) -> bool:
+        lamports = item["account"]["lamports"]
+        if min_lamports is not None and lamports < min_lamports:
+            return False
+        if max_lamports is not None and lamports > max_lamports:
+            return False
+        return True
+
+    return predicate
+
+
+def project_account(item: Dict[str, Any], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Reduce a raw program account item to the requested fields
+
+    Args:
+        item: A {"pubkey": ..., "account": {...}} item from getProgramAccounts
+        fields: Fields to keep (see ACCOUNT_FIELDS), or None to keep the item as is
+
+    Returns:
+        Dict[str, Any]: The item itself, or a flat dict with only the requested fields
+    """
+    if not fields:
+        return item
+    account = item["account"]
+    return {
+        field: item["pubkey"] if field == "pubkey" else account.get(field)
+        for field in fields
+    }
+
+
+def project_block(item: Dict[str, Any], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Reduce a scanned block to the requested fields
+
+    Args:
+        item: A getBlock result with its "slot" added
+        fields: Fields to keep (see BLOCK_FIELDS), or None to keep the block as is
+
+    Returns:
+        Dict[str, Any]: The block itself, or a dict with only the requested fields
+    """
+    if not fields:
+        return item
+    projected = {}
+    for field in fields:
+        if field == "transactionCount":
+            projected[field] = len(item.get("transactions") or item.get("signatures") or [])
+        else:
+            projected[field] = item.get(field)
+    return projected
+
+
+class ResponseSink:
+    """Keeps up to a limit of matching items for the tool response"""
+
+    def __init__(
+        self,
+        limit: int = 1000,
+        fields: Optional[List[str]] = None,
+        project: Callable[[Dict[str, Any], Optional[List[str]]], Dict[str, Any]] = project_account,
+        key: str = "accounts"
+    ):
+        """
+        Create a response sink
+
+        Args:
+            limit: Most items kept
+            fields: Fields to keep for each item, or None for the full item
+            project: Reduces an item to the fields (project_account or project_block)
+            key: Name of the item list in the summary
+        """
+        self.limit = limit
+        self.fields = fields
+        self.project = project
+        self.key = key
+        self.items: List[Dict[str, Any]] = []
+        self.truncated = False
+
+    def add(self, item: Dict[str, Any]) -> None:
+        if len(self.items) < self.limit:
+            self.items.append(self.project(item, self.fields))
+        else:
+            self.truncated = True
+
+    def summary(self) -> Dict[str, Any]:
+        return {self.key: self.items, "truncated": self.truncated}
+
+    def checkpoint(self) -> Dict[str, Any]:
+        # Only items of the current call are returned, so there is nothing to carry over
+        return {}
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class FileSink:
+    """Writes matching items to a JSON Lines file in the export directory"""
+
+    def __init__(
+        self,
+        filename: str,
+        fields: Optional[List[str]] = None,
+        directory: str = SOLANA_EXPORT_DIR,
+        project: Callable[[Dict[str, Any], Optional[List[str]]], Dict[str, Any]] = project_account
+    ):
+        """
+        Create a file sink
+
+        The file is replaced when the first item is written, or continued
+        from a checkpoint when the sink is restored.
+
+        Args:
+            filename: Name of the output file; any directory part is ignored
+            fields: Fields to keep for each item, or None for the full item
+            directory: Directory the file is written to
+            project: Reduces an item to the fields (project_account or project_block)
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, os.path.basename(filename))
+        self.fields = fields
+        self.project = project
+        self._file: Optional[TextIO] = None
+
+    def add(self, item: Dict[str, Any]) -> None:
+        if self._file is None:
+            self._file = open(self.path, "w")
+        self._file.write(json.dumps(self.project(item, self.fields), separators=(",", ":")))
+        self._file.write("\n")
+
+    def summary(self) -> Dict[str, Any]:
+        return {"path": self.path}
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """Bytes written so far; everything before this offset is complete"""
+        if self._file is None:
+            return {"bytes": 0}
+        self._file.flush()
+        return {"bytes": self._file.tell()}
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """
+        Continue the file of an interrupted scan
+
+        Raises:
+            FileNotFoundError: If the file of the interrupted scan no longer exists
+        """
+        self._file = open(self.path, "r+")
+        # Lines written after the checkpoint are written again by the resumed scan
+        self._file.truncate(state.get("bytes", 0))
+        self._file.seek(0, os.SEEK_END)
+
+    def close(self) -> None:
+        if self._file is None:
+            # A scan without matches still leaves an (empty) file behind
+            self._file = open(self.path, "w")
+        self._file.close()
+
+
+class AggregateSink:
+    """Keeps running totals over matching accounts"""
+
+    def __init__(self):
+        self.count = 0
+        self.lamports = 0
+        self.space = 0
+        self.min_lamports: Optional[int] = None
+        self.max_lamports: Optional[int] = None
+
+    def add(self, item: Dict[str, Any]) -> None:
+        account = item["account"]
+        lamports = account["lamports"]
+        self.count += 1
+        self.lamports += lamports
+        self.space += account.get("space", 0)
+        self.min_lamports = lamports if self.min_lamports is None else min(self.min_lamports, lamports)
+        self.max_lamports = lamports if self.max_lamports is None else max(self.max_lamports, lamports)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "aggregate": {
+                "count": self.count,
+                "total_lamports": self.lamports,
+                "total_space": self.space,
+                "min_lamports": self.min_lamports,
+                "max_lamports": self.max_lamports
+            }
+        }
+
+    def checkpoint(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        vars(self).update(state)
+
+    def close(self) -> None:
+        pass
+
+
+class BlockAggregateSink:
+    """Keeps running totals over scanned blocks"""
+
+    def __init__(self):
+        self.blocks = 0
+        self.transactions = 0
+        self.failed_transactions = 0
+        self.vote_transactions = 0
+        self.fees = 0
+        self.first_block_time: Optional[int] = None
+        self.last_block_time: Optional[int] = None
+
+    def add(self, item: Dict[str, Any]) -> None:
+        self.blocks += 1
+        transactions = item.get("transactions")
+        if transactions is None:
+            self.transactions += len(item.get("signatures") or [])
+        else:
+            self.transactions += len(transactions)
+            for transaction in transactions:
+                meta = transaction.get("meta") or {}
+                self.fees += meta.get("fee", 0)
+                self.failed_transactions += meta.get("err") is not None
+                self.vote_transactions += is_vote_transaction(transaction)
+        block_time = item.get("blockTime")
+        if block_time is not None:
+            if self.first_block_time is None:
+                self.first_block_time = block_time
+            self.last_block_time = block_time
+
+    def summary(self) -> Dict[str, Any]:
+        return {"aggregate": dict(vars(self))}
+
+    def checkpoint(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        vars(self).update(state)
+
+    def close(self) -> None:
+        pass
+
+
+def _transaction_keys(item: Dict[str, Any]) -> List[str]:
+    """Account keys of a block transaction in json, jsonParsed or accounts form"""
+    transaction = item.get("transaction")
+    if not isinstance(transaction, dict):
+        return []
+    message = transaction.get("message", transaction)
+    keys = [key["pubkey"] if isinstance(key, dict) else key for key in message.get("accountKeys", [])]
+    loaded = (item.get("meta") or {}).get("loadedAddresses") or {}
+    return keys + loaded.get("writable", []) + loaded.get("readonly", [])
+
+
+def is_vote_transaction(item: Dict[str, Any]) -> bool:
+    """
+    Whether a block transaction only contains vote program instructions
+
+    Binary encoded transactions (base58, base64) cannot be inspected and are
+    never treated as votes.
+    """
+    transaction = item.get("transaction")
+    if not isinstance(transaction, dict):
+        return False
+    message = transaction.get("message", transaction)
+    keys = _transaction_keys(item)
+    instructions = message.get("instructions")
+    if instructions is None:
+        # transaction_details="accounts" lists keys but no instructions
+        return VOTE_PROGRAM_ID in keys
+    if not instructions:
+        return False
+    for instruction in instructions:
+        program = instruction.get("programId")
+        if program is None:
+            index = instruction.get("programIdIndex")
+            program = keys[index] if index is not None and index < len(keys) else None
+        if program != VOTE_PROGRAM_ID:
+            return False
+    return True
+
+
+def is_failed_transaction(item: Dict[str, Any]) -> bool:
+    """Whether a block transaction failed"""
+    return (item.get("meta") or {}).get("err") is not None
+
+
+def untouched_by(program_ids: Iterable[str]) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Build a drop predicate for transactions that do not involve any of the given accounts
+
+    Args:
+        program_ids: Program IDs or account addresses of interest
+    """
+    wanted = frozenset(program_ids)
+
+    def predicate(item: Dict[str, Any]) -> bool:
+        return wanted.isdisjoint(_transaction_keys(item))
+
+    return predicate
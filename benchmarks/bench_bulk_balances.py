@@ -0,0 +1,101 @@
+"""
+Benchmark: get_solana_balances against a get_solana_balance loop
+
+A local stand-in RPC node answers every HTTP request after a fixed round-trip
+delay. The benchmark reads the balances of the same addresses by calling the
+get_solana_balance tool once per address, with one get_multiple_accounts call
+that returns each account's data (165 bytes, the size of a token account), and
+with one get_solana_balances call, whose zero-length data slices leave the data
+out. Wall time, HTTP requests and response bytes are reported for each.
+Set SOLANA_MULTIPLE_ACCOUNTS_CONCURRENCY to change how many chunks are in flight.
+
+Usage:
+    python -m benchmarks.bench_bulk_balances [--addresses 2000] [--latency 0.005]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from app.api.solana import get_multiple_accounts_endpoint, get_solana_balance_endpoint, get_solana_balances_endpoint
+from app.core.rpc import SolanaRpcClient, set_rpc_client
+
+
+class StandInRpc:
+    """Emulates a Solana RPC node with a fixed round-trip delay and counts traffic"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.requests = 0
+        self.response_bytes = 0
+
+    @staticmethod
+    def lamports(address: str) -> int:
+        return int(address[6:]) * 1000
+
+    def answer(self, payload: dict) -> dict:
+        if payload["method"] == "getBalance":
+            result = {"context": {"slot": 1000}, "value": self.lamports(payload["params"][0])}
+        else:
+            addresses, config = payload["params"]
+            length = config.get("dataSlice", {}).get("length", 165)
+            data = "A" * (4 * ((length + 2) // 3))
+            result = {
+                "context": {"slot": 1000},
+                "value": [
+                    {"data": [data, "base64"], "executable": False, "lamports": self.lamports(address), "owner": "11111111111111111111111111111111", "rentEpoch": 0, "space": 165}
+                    for address in addresses
+                ]
+            }
+        return {"jsonrpc": "2.0", "result": result, "id": payload["id"]}
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        await asyncio.sleep(self.latency)
+        answer = [self.answer(payload) for payload in body] if isinstance(body, list) else self.answer(body)
+        content = json.dumps(answer).encode()
+        self.requests += 1
+        self.response_bytes += len(content)
+        return httpx.Response(200, content=content, headers={"Content-Type": "application/json"})
+
+
+async def run(mode: str, addresses, latency: float):
+    rpc = StandInRpc(latency)
+    client = SolanaRpcClient(url="http://rpc.bench", health_interval=0, cache_max_bytes=0, transport=httpx.MockTransport(rpc.handler))
+    set_rpc_client(client)
+
+    start = time.perf_counter()
+    if mode == "loop":
+        total = 0
+        for address in addresses:
+            total += (await get_solana_balance_endpoint(address))["balance_lamports"]
+    elif mode == "full":
+        response = json.loads(await get_multiple_accounts_endpoint(addresses, "base64", None, None, None, None))
+        total = sum(account["lamports"] for account in response["value"])
+    else:
+        total = (await get_solana_balances_endpoint(addresses, None, None))["total_lamports"]
+    elapsed = time.perf_counter() - start
+
+    await client.aclose()
+    set_rpc_client(None)
+    return elapsed, rpc.requests, rpc.response_bytes, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--addresses", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+
+    addresses = [f"wallet{n}" for n in range(args.addresses)]
+
+    print(f"{'mode':<8} {'seconds':>10} {'requests':>10} {'KiB':>10} {'total lamports':>16}")
+    for mode in ("loop", "full", "bulk"):
+        elapsed, requests, response_bytes, total = asyncio.run(run(mode, addresses, args.latency))
+        print(f"{mode:<8} {elapsed:>10.2f} {requests:>10} {response_bytes / 1024:>10.1f} {total:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: get_health latency while heavy get_block calls are in flight
+
+A local stand-in RPC node answers getHealth after a few milliseconds and
+getBlock after a configurable delay. The benchmark samples get_health tool
+latency on its own, then again while several get_block tool calls run on the
+same event loop. With async tools the p99 should barely move; the "blocking"
+run emulates the previous synchronous tools for comparison.
+
+Usage:
+    python -m benchmarks.bench_concurrent_tools [--samples 200] [--heavy 20] [--block-delay 2.0]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+from app.api.solana import get_block_endpoint, get_health_endpoint
+from app.core.rpc import SolanaRpcClient, set_rpc_client
+
+HEALTH_DELAY = 0.002
+
+
+def stand_in_rpc(block_delay: float) -> httpx.MockTransport:
+    """Create a transport that emulates a Solana RPC node with a slow getBlock"""
+    block = {
+        "blockHeight": 1,
+        "blockTime": 1700000000,
+        "blockhash": "EkSnNWid2cvwEVnVx9aBqawnmiCNiDgp3gUdkDPTKN1N",
+        "parentSlot": 0,
+        "previousBlockhash": "11111111111111111111111111111111",
+        "transactions": [],
+        "rewards": []
+    }
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        if payload["method"] == "getBlock":
+            await asyncio.sleep(block_delay)
+            result = block
+        else:
+            await asyncio.sleep(HEALTH_DELAY)
+            result = "ok"
+        return httpx.Response(200, json={"jsonrpc": "2.0", "result": result, "id": payload["id"]})
+
+    return httpx.MockTransport(handler)
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def sample_health(samples: int):
+    latencies = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        await get_health_endpoint()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def blocking_get_block(block_delay: float):
+    """Emulate the previous synchronous tool: the event loop is held for the whole call"""
+    time.sleep(block_delay)
+
+
+async def run(mode: str, samples: int, heavy: int, block_delay: float):
+    set_rpc_client(SolanaRpcClient(url="http://rpc.bench", health_interval=0, transport=stand_in_rpc(block_delay)))
+
+    async def heavy_call(slot: int):
+        # Start after the sampler so heavy calls overlap in-flight health checks
+        await asyncio.sleep(0.01 * (slot + 1))
+        if mode == "async":
+            await get_block_endpoint(slot, "json", "full", True, None, False, False, None)
+        else:
+            await blocking_get_block(block_delay)
+
+    tasks = [asyncio.create_task(heavy_call(slot)) for slot in range(heavy)] if mode != "idle" else []
+    latencies = await sample_health(samples)
+    await asyncio.gather(*tasks)
+    set_rpc_client(None)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--heavy", type=int, default=20)
+    parser.add_argument("--block-delay", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'p50 ms':>10} {'p99 ms':>10} {'max ms':>10}")
+    for mode in ("idle", "async", "blocking"):
+        # The blocking emulation serializes everything, so keep it short
+        heavy = min(args.heavy, 3) if mode == "blocking" else args.heavy
+        latencies = asyncio.run(run(mode, args.samples, heavy, args.block_delay))
+        print(
+            f"{mode:<10} {statistics.median(latencies):>10.2f} "
+            f"{percentile(latencies, 99):>10.2f} {max(latencies):>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Benchmark: building and serializing large responses, per item against whole lists
+
+Turns a large RPC result into the text of an MCP tool result in two ways:
+
+- as the services used to: one model __init__ per account, then .dict(), which
+  FastMCP converts to plain Python objects and encodes with json.dumps;
+- as they do now: the whole account list validated in one pydantic-core call
+  with a precompiled TypeAdapter, then JSON text written directly by the
+  model's compiled serializer (model_dump_json), which FastMCP sends as it is.
+
+Both texts are checked to decode to the same JSON. The median time of each
+step is reported.
+
+Results recorded from a real RPC node can be passed in, for example:
+
+    curl -s $SOLANA_RPC_URL -H 'Content-Type: application/json' -d \\
+      '{"jsonrpc":"2.0","id":1,"method":"getBlock","params":[SLOT,{"maxSupportedTransactionVersion":0}]}' > block.json
+
+Without them, results shaped like mainnet ones are generated: a block of 1,500
+transactions and 20,000 token accounts.
+
+Usage:
+    python -m benchmarks.bench_large_responses [--block block.json] [--program-accounts accounts.json] [--repeat 5]
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+import warnings
+
+from fastmcp.tools.tool import _convert_to_content
+
+from app.api.solana import _json_text
+from app.models.solana import (
+    PROGRAM_ACCOUNT_LIST,
+    SolanaAccountData,
+    SolanaBlockResponse,
+    SolanaProgramAccount,
+    SolanaProgramAccountsResponse
+)
+
+
+def generated_block(transactions: int = 1500) -> dict:
+    """A getBlock result with transactions shaped like mainnet ones"""
+    rng = random.Random(1)
+
+    def key() -> str:
+        return "".join(rng.choice("123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz") for _ in range(44))
+
+    def transaction(n: int) -> dict:
+        keys = [key() for _ in range(12)]
+        balances = [rng.randrange(10 ** 12) for _ in keys]
+        token_balance = {
+            "accountIndex": 3, "mint": keys[5], "owner": keys[0], "programId": "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA",
+            "uiTokenAmount": {"amount": "1000000", "decimals": 6, "uiAmount": 1.0, "uiAmountString": "1"}
+        }
+        return {
+            "meta": {
+                "computeUnitsConsumed": 41000,
+                "err": None if n % 10 else {"InstructionError": [1, {"Custom": 6001}]},
+                "fee": 5000,
+                "innerInstructions": [{"index": 1, "instructions": [{"accounts": [1, 3, 4], "data": "3Bxs4h24hBtQy9rw", "programIdIndex": 9, "stackHeight": 2}] * 3}],
+                "loadedAddresses": {"readonly": [key() for _ in range(2)], "writable": [key()]},
+                "logMessages": [f"Program {keys[9]} invoke [1]", "Program log: Instruction: Swap", f"Program {keys[9]} consumed 41000 of 200000 compute units", f"Program {keys[9]} success"] * 3,
+                "postBalances": balances,
+                "postTokenBalances": [token_balance, dict(token_balance, accountIndex=4)],
+                "preBalances": balances,
+                "preTokenBalances": [token_balance, dict(token_balance, accountIndex=4)],
+                "rewards": [],
+                "status": {"Ok": None} if n % 10 else {"Err": {"InstructionError": [1, {"Custom": 6001}]}}
+            },
+            "transaction": {
+                "message": {
+                    "accountKeys": keys,
+                    "addressTableLookups": [{"accountKey": key(), "readonlyIndexes": [3, 4], "writableIndexes": [7]}],
+                    "header": {"numReadonlySignedAccounts": 0, "numReadonlyUnsignedAccounts": 5, "numRequiredSignatures": 1},
+                    "instructions": [{"accounts": [0, 1, 2, 3], "data": "AJTQ2h9DXrBZ6xB4uU", "programIdIndex": 9, "stackHeight": None}] * 3,
+                    "recentBlockhash": key()
+                },
+                "signatures": [key() + key()]
+            },
+            "version": 0 if n % 3 else "legacy"
+        }
+
+    return {
+        "blockHeight": 280000000,
+        "blockTime": 1700000000,
+        "blockhash": key(),
+        "parentSlot": 300000000,
+        "previousBlockhash": key(),
+        "rewards": [{"commission": None, "lamports": 5000000, "postBalance": 10 ** 10, "pubkey": key(), "rewardType": "Fee"}],
+        "transactions": [transaction(n) for n in range(transactions)]
+    }
+
+
+def generated_program_accounts(accounts: int = 20000) -> list:
+    """A getProgramAccounts result of token accounts, base64 encoded"""
+    return [
+        {
+            "pubkey": f"TokenAccount{n:032d}",
+            "account": {"data": ["A" * 220, "base64"], "executable": False, "lamports": 2039280, "owner": "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA", "rentEpoch": 18446744073709551615, "space": 165}
+        }
+        for n in range(accounts)
+    ]
+
+
+def per_item_program_accounts(accounts: list) -> SolanaProgramAccountsResponse:
+    """The response as get_program_accounts used to build it"""
+    items = []
+    for item in accounts:
+        account = item["account"]
+        items.append(SolanaProgramAccount(
+            pubkey=item["pubkey"],
+            account=SolanaAccountData(
+                data=account["data"],
+                executable=account["executable"],
+                lamports=account["lamports"],
+                owner=account["owner"],
+                rentEpoch=account["rentEpoch"],
+                space=account.get("space", 0)
+            )
+        ))
+    return SolanaProgramAccountsResponse(status="success", accounts=items)
+
+
+def whole_list_program_accounts(accounts: list) -> SolanaProgramAccountsResponse:
+    """The response as get_program_accounts builds it now"""
+    return SolanaProgramAccountsResponse(status="success", accounts=PROGRAM_ACCOUNT_LIST.validate_python(accounts))
+
+
+def block_response(block: dict) -> SolanaBlockResponse:
+    return SolanaBlockResponse(status="success", **block)
+
+
+def as_dict(response) -> dict:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        return response.dict(exclude_none=True)
+
+
+def measure(make, serialize, payload, repeat: int):
+    """Median seconds to build, to serialize and to turn into MCP text, and the text"""
+    timings = []
+    text = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = make(payload)
+        built = time.perf_counter()
+        result = serialize(response)
+        serialized = time.perf_counter()
+        text = _convert_to_content(result)[0].text
+        timings.append((built - start, serialized - built, time.perf_counter() - serialized))
+    return [statistics.median(step) for step in zip(*timings)], text
+
+
+def load(path: str):
+    with open(path) as f:
+        body = json.load(f)
+    return body.get("result", body) if isinstance(body, dict) else body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--block", help="Recorded getBlock response")
+    parser.add_argument("--program-accounts", help="Recorded getProgramAccounts response")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    block = load(args.block) if args.block else generated_block()
+    accounts = load(args.program_accounts) if args.program_accounts else generated_program_accounts()
+    if isinstance(accounts, dict):
+        accounts = accounts["value"]
+    cases = [
+        (f"get_block ({len(block.get('transactions') or [])} tx)", block, (block_response, as_dict), (block_response, _json_text)),
+        (f"get_program_accounts ({len(accounts)})", accounts, (per_item_program_accounts, as_dict), (whole_list_program_accounts, _json_text))
+    ]
+
+    print(f"{'response':<32} {'mode':<8} {'build ms':>9} {'dump ms':>9} {'text ms':>9} {'total ms':>9} {'speedup':>8}")
+    for name, payload, before, after in cases:
+        results = [("before", *measure(*before, payload, args.repeat)), ("after", *measure(*after, payload, args.repeat))]
+        assert json.loads(results[0][2]) == json.loads(results[1][2]), "the tool result changed"
+        baseline = sum(results[0][1])
+        for mode, steps, _ in results:
+            total = sum(steps)
+            print(f"{name:<32} {mode:<8} " + " ".join(f"{step * 1000:>9.1f}" for step in steps) + f" {total * 1000:>9.1f} {baseline / total:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,7 @@
 """
 Tests for Solana MCP Server
 """
+import os
+
+# Tests must not read or write the permanent RPC result store
+os.environ["SOLANA_RPC_DISK_CACHE"] = ""
@@ -0,0 +1,93 @@
+"""
+Shared helpers for tests
+"""
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpx
+from app.core.rpc import SolanaRpcClient
+
+
+def mock_rpc_client(handler, requests=None, **kwargs):
+    """
+    Create an RPC client whose requests are answered by handler(payload) -> dict
+
+    Batch requests are answered element by element. When a list is passed as
+    requests, every HTTP request body is appended to it.
+    """
+    def respond(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if requests is not None:
+            requests.append(body)
+        if isinstance(body, list):
+            return httpx.Response(200, json=[handler(payload) for payload in body])
+        return httpx.Response(200, json=handler(body))
+    kwargs.setdefault("url", "http://rpc.test")
+    kwargs.setdefault("health_interval", 0)
+    return SolanaRpcClient(transport=httpx.MockTransport(respond), **kwargs)
+
+
+class StandInRpcServer:
+    """
+    A local HTTP server that answers JSON-RPC requests like a Solana RPC node
+
+    Runs in a background thread. latency and status can be changed while the
+    server is running; responses come from handler(payload) -> dict. With
+    compress=True, responses are gzip compressed for clients that accept gzip.
+    """
+
+    def __init__(self, latency=0.0, handler=None, status=200, compress=False):
+        self.latency = latency
+        self.status = status
+        self.compress = compress
+        self.accept_encoding = None
+        self.handler = handler or self.default_handler
+        self.requests = 0
+        server = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                server.requests += 1
+                server.accept_encoding = self.headers.get("Accept-Encoding")
+                time.sleep(server.latency)
+                if server.status != 200:
+                    content = b""
+                elif isinstance(body, list):
+                    content = json.dumps([server.handler(payload) for payload in body]).encode()
+                else:
+                    content = json.dumps(server.handler(body)).encode()
+                self.send_response(server.status)
+                self.send_header("Content-Type", "application/json")
+                if server.compress and "gzip" in (server.accept_encoding or ""):
+                    content = gzip.compress(content)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), RequestHandler)
+        self._httpd.daemon_threads = True
+        # Clients that time out or cancel leave broken pipes behind; keep test output quiet
+        self._httpd.handle_error = lambda request, client_address: None
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    @staticmethod
+    def default_handler(payload):
+        return {"jsonrpc": "2.0", "result": {"context": {"slot": 1}, "value": 1}, "id": payload["id"]}
+
+    def start(self):
+        threading.Thread(target=self._httpd.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
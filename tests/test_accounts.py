@@ -0,0 +1,144 @@
+"""
+Tests for chunked getMultipleAccounts
+"""
+import asyncio
+import itertools
+import unittest
+from unittest.mock import patch
+from app.core.rpc import set_rpc_client
+from app.services.accounts import fetch_multiple_accounts
+from app.services.solana import get_multiple_accounts, get_solana_balances
+from tests.helpers import mock_rpc_client
+
+ADDRESSES = [f"acct{n}" for n in range(2345)]
+
+
+def account(address):
+    """Every seventh account does not exist; the others hold their index in lamports"""
+    n = int(address[4:])
+    if n % 7 == 0:
+        return None
+    return {"data": ["", "base64"], "executable": False, "lamports": n, "owner": "11111111111111111111111111111111", "rentEpoch": 0, "space": 0}
+
+
+def accounts_handler():
+    """Answers getMultipleAccounts one slot higher on every call"""
+    slots = itertools.count(5000)
+
+    def handler(payload):
+        addresses, config = payload["params"]
+        assert len(addresses) <= 100
+        slot = max(next(slots), config.get("minContextSlot", 0))
+        result = {"context": {"slot": slot}, "value": [account(address) for address in addresses]}
+        return {"jsonrpc": "2.0", "result": result, "id": payload["id"]}
+
+    return handler
+
+
+class TestChunkedMultipleAccounts(unittest.IsolatedAsyncioTestCase):
+    """Tests for splitting, pinning and reassembling address lists"""
+
+    async def asyncSetUp(self):
+        self.requests = []
+        set_rpc_client(mock_rpc_client(accounts_handler(), self.requests, cache_max_bytes=0))
+
+    async def asyncTearDown(self):
+        set_rpc_client(None)
+
+    def bodies(self):
+        return [item for body in self.requests for item in (body if isinstance(body, list) else [body])]
+
+    async def test_large_lists_are_chunked_and_reassembled_in_order(self):
+        """Test that any number of addresses come back in order"""
+        result = await get_multiple_accounts(ADDRESSES, encoding="base64")
+
+        self.assertEqual(result.status, "success")
+        self.assertEqual(len(result.value), len(ADDRESSES))
+        for n, value in enumerate(result.value):
+            if n % 7 == 0:
+                self.assertIsNone(value)
+            else:
+                self.assertEqual(value.lamports, n)
+        self.assertEqual(len(self.bodies()), 24)
+
+    async def test_chunks_are_pinned_to_the_first_chunks_slot(self):
+        """Test that every later chunk is sent with the first chunk's slot as minContextSlot"""
+        result = await get_multiple_accounts(ADDRESSES[:450], commitment="confirmed")
+
+        bodies = self.bodies()
+        self.assertNotIn("minContextSlot", bodies[0]["params"][1])
+        self.assertEqual({body["params"][1]["minContextSlot"] for body in bodies[1:]}, {5000})
+        self.assertEqual(result.minContextSlot, 5000)
+        self.assertEqual(result.contextSlotRange, [5000, 5004])
+        self.assertEqual(result.context["slot"], 5000)
+
+    async def test_given_min_context_slot_is_sent_with_every_chunk(self):
+        """Test that an explicit minContextSlot is used for all chunks"""
+        result = await get_multiple_accounts(ADDRESSES[:250], min_context_slot=9000)
+
+        self.assertEqual([body["params"][1]["minContextSlot"] for body in self.bodies()], [9000, 9000, 9000])
+        self.assertEqual(result.contextSlotRange, [9000, 9000])
+
+    async def test_parallelism_is_bounded(self):
+        """Test that no more than the given number of chunks are in flight"""
+        in_flight = 0
+        peak = 0
+
+        async def fake_request(method, params):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"jsonrpc": "2.0", "result": {"context": {"slot": 7}, "value": [account(a) for a in params[0]]}, "id": 1}
+
+        with patch("app.services.accounts.rpc_request", fake_request):
+            result = await fetch_multiple_accounts(ADDRESSES, {"encoding": "base64"}, concurrency=4)
+
+        self.assertEqual(peak, 4)
+        self.assertEqual(len(result.values), len(ADDRESSES))
+
+    async def test_a_failed_chunk_fails_the_request(self):
+        """Test that an error in any chunk is reported"""
+        def handler(payload):
+            if payload["params"][0][0] == "acct200":
+                return {"jsonrpc": "2.0", "error": {"code": -32602, "message": "Invalid param"}, "id": payload["id"]}
+            return accounts_handler()(payload)
+
+        set_rpc_client(mock_rpc_client(handler, cache_max_bytes=0))
+        result = await get_multiple_accounts(ADDRESSES[:500])
+
+        self.assertEqual(result.status, "error")
+        self.assertEqual(result.error["code"], -32602)
+
+
+class TestBulkBalances(unittest.IsolatedAsyncioTestCase):
+    """Tests for balances read with zero-length data slices"""
+
+    async def asyncSetUp(self):
+        self.requests = []
+        set_rpc_client(mock_rpc_client(accounts_handler(), self.requests, cache_max_bytes=0))
+
+    async def asyncTearDown(self):
+        set_rpc_client(None)
+
+    async def test_balances_are_read_without_account_data(self):
+        """Test that balances come from getMultipleAccounts with an empty data slice"""
+        addresses = ADDRESSES[:1000] + ["acct3"]
+        result = await get_solana_balances(addresses, commitment="confirmed")
+
+        self.assertEqual(len(self.requests), 10)
+        config = self.requests[0]["params"][1]
+        self.assertEqual(config["dataSlice"], {"offset": 0, "length": 0})
+        self.assertEqual(config["commitment"], "confirmed")
+
+        self.assertEqual(len(result.balances), 1001)
+        self.assertEqual((result.balances[3].address, result.balances[3].balance_lamports), ("acct3", 3))
+        self.assertEqual(result.balances[7].balance_lamports, 0)
+        self.assertEqual(result.balances[-1].balance_sol, 3 / 1_000_000_000)
+        expected = sum(n for n in range(1000) if n % 7)
+        self.assertEqual(result.total_lamports, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
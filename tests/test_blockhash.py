@@ -0,0 +1,116 @@
+"""
+Tests for the background blockhash refresher
+"""
+import asyncio
+import itertools
+import unittest
+from unittest.mock import patch
+from app.core.blockhash import SLOT_SECONDS
+from app.core.rpc import set_rpc_client
+from app.services.solana import check_blockhash_validity, get_latest_blockhash
+from tests.helpers import mock_rpc_client
+
+
+def blockhash_handler():
+    """Answers getLatestBlockhash with a new blockhash and one block higher on every call"""
+    counter = itertools.count()
+
+    def handler(payload):
+        n = next(counter)
+        result = {"context": {"slot": 2000 + n}, "value": {"blockhash": f"hash{n}", "lastValidBlockHeight": 1150 + n}}
+        return {"jsonrpc": "2.0", "result": result, "id": payload["id"]}
+
+    return handler
+
+
+class TestBlockhashRefresher(unittest.IsolatedAsyncioTestCase):
+    """Tests for serving blockhashes from memory and checking their validity"""
+
+    async def asyncSetUp(self):
+        self.requests = []
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+        set_rpc_client(None)
+
+    def make_client(self, interval):
+        self.client = mock_rpc_client(blockhash_handler(), self.requests, blockhash_refresh_interval=interval, batch_window_ms=0)
+        set_rpc_client(self.client)
+        return self.client
+
+    async def test_reads_are_served_from_memory_and_refreshed_in_background(self):
+        """Test that reads between refreshes make no requests and refreshes replace the value"""
+        self.make_client(0.05)
+
+        first = await get_latest_blockhash()
+        second = await get_latest_blockhash()
+        self.assertEqual(first.value.blockhash, "hash0")
+        self.assertEqual(second.value.blockhash, "hash0")
+        self.assertEqual(len(self.requests), 1)
+
+        await asyncio.sleep(0.13)
+        third = await get_latest_blockhash()
+        self.assertGreaterEqual(len(self.requests), 2)
+        self.assertNotEqual(third.value.blockhash, "hash0")
+        self.assertEqual(self.client.stats()["blockhash"]["hits"], 2)
+
+    async def test_commitments_are_tracked_separately(self):
+        """Test that each commitment level has its own value"""
+        self.make_client(10)
+
+        await get_latest_blockhash()
+        await get_latest_blockhash("confirmed")
+        await get_latest_blockhash("confirmed")
+
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(self.requests[1]["params"], [{"commitment": "confirmed"}])
+
+    async def test_validity_is_checked_against_the_tracked_block_height(self):
+        """Test validity checks with the locally extrapolated block height"""
+        self.make_client(10)
+        latest = await get_latest_blockhash()
+
+        valid = await check_blockhash_validity(latest.value.blockhash)
+        self.assertTrue(valid.valid)
+        # The finalized height trails the processed tip by 32 blocks
+        self.assertEqual(valid.estimatedBlockHeight, 1032)
+        self.assertEqual(valid.blocksRemaining, 118)
+
+        with patch("app.core.blockhash.SLOT_SECONDS", 0.0001):
+            await asyncio.sleep(0.05)
+            expired = await check_blockhash_validity(latest.value.blockhash)
+        self.assertFalse(expired.valid)
+        self.assertEqual(expired.blocksRemaining, 0)
+
+        unknown = await check_blockhash_validity("other")
+        self.assertFalse(unknown.known)
+        self.assertIsNone(unknown.valid)
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_finalized_blockhash_expires_when_the_tip_passes_it(self):
+        """Test that a finalized blockhash is expired once the processed tip passes its last valid height"""
+        client = self.make_client(10)
+        latest = await get_latest_blockhash()
+        observed_at, height = client.blockhashes._heights["finalized"]
+
+        # At the refresh, the tip was at least 32 blocks past the finalized height of 1000;
+        # let as many slots pass as it takes that tip to pass the last valid height
+        slots_until_passed = latest.value.lastValidBlockHeight + 1 - (1000 + 32)
+        client.blockhashes._heights["finalized"] = (observed_at - slots_until_passed * SLOT_SECONDS - 0.01, height)
+        result = await check_blockhash_validity(latest.value.blockhash)
+        self.assertFalse(result.valid)
+
+    async def test_tracking_can_be_disabled(self):
+        """Test that every read goes to the RPC node without the refresher"""
+        self.make_client(0)
+
+        await get_latest_blockhash()
+        await get_latest_blockhash()
+        result = await check_blockhash_validity("hash0")
+
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(result.status, "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
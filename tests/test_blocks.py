@@ -0,0 +1,302 @@
+"""
+Tests for parallel block-range scans
+"""
+import asyncio
+import json
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import patch
+from app.core.rpc import set_rpc_client
+from app.services.blocks import MAX_BLOCKS_RANGE, blocks_in_range, confirmed_slots, fetch_blocks
+from app.services.slots import slot_index
+from app.services.solana import get_blocks, get_blocks_with_limit, scan_blocks
+from app.services.streaming import BLOCK_FIELDS, BlockAggregateSink, FileSink, ResponseSink, project_block, unknown_fields
+from tests.helpers import mock_rpc_client
+
+
+def make_block(slot):
+    transactions = [
+        {"meta": {"err": None if n else {"InstructionError": [0, "Custom"]}, "fee": 5000}, "transaction": {"signatures": [f"sig{slot}-{n}"], "message": {"accountKeys": ["payer"], "instructions": []}}}
+        for n in range(slot % 4)
+    ]
+    return {"blockhash": f"hash{slot}", "parentSlot": slot - 1, "blockTime": 1700000000 + slot, "blockHeight": slot, "transactions": transactions}
+
+
+class BlocksHandler:
+    """Every third slot is skipped; getBlock fails for the slots in fail until they are removed"""
+
+    def __init__(self):
+        self.fail = set()
+        self.gone = set()
+        self.fetched = []
+
+    def __call__(self, payload):
+        method = payload["method"]
+        if method == "getBlocks":
+            start, end = payload["params"][:2]
+            result = [slot for slot in range(start, end + 1) if slot % 3]
+        elif method == "getSlot":
+            result = 1_700_000
+        elif method == "getFirstAvailableBlock":
+            result = 0
+        else:
+            slot = payload["params"][0]
+            self.fetched.append(slot)
+            if slot in self.fail:
+                return {"jsonrpc": "2.0", "error": {"code": -32602, "message": "Invalid param"}, "id": payload["id"]}
+            if slot in self.gone:
+                return {"jsonrpc": "2.0", "error": {"code": -32007, "message": f"Slot {slot} was skipped"}, "id": payload["id"]}
+            result = make_block(slot)
+        return {"jsonrpc": "2.0", "result": result, "id": payload["id"]}
+
+
+class TestBlockFetcher(unittest.IsolatedAsyncioTestCase):
+    """Tests for slot resolution and the reorder buffer"""
+
+    async def test_blocks_are_yielded_in_slot_order(self):
+        """Test ordering and the concurrency bound when blocks complete out of order"""
+        in_flight = 0
+        peak = 0
+
+        async def fake_request(method, params, timeout=None, cache=True):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(random.uniform(0, 0.005))
+            in_flight -= 1
+            return {"jsonrpc": "2.0", "result": make_block(params[0]), "id": 1}
+
+        async def slots():
+            for slot in range(100, 300):
+                yield slot
+
+        with patch("app.services.blocks.rpc_request", fake_request):
+            received = [(slot, block["blockhash"]) async for slot, block in fetch_blocks(slots(), {}, 5)]
+
+        self.assertEqual(received, [(slot, f"hash{slot}") for slot in range(100, 300)])
+        self.assertEqual(peak, 5)
+
+    async def test_slots_are_resolved_in_windows(self):
+        """Test that getBlocks is called once per window of the range"""
+        requests = []
+        set_rpc_client(mock_rpc_client(BlocksHandler(), requests, batch_window_ms=0))
+        try:
+            slots = [slot async for slot in confirmed_slots(0, 24, window=10)]
+        finally:
+            set_rpc_client(None)
+
+        self.assertEqual(slots, [slot for slot in range(25) if slot % 3])
+        self.assertEqual([body["params"][:2] for body in requests], [[0, 9], [10, 19], [20, 24]])
+
+
+class TestBlockRanges(unittest.IsolatedAsyncioTestCase):
+    """Tests for get_blocks and get_blocks_with_limit beyond the RPC limit"""
+
+    async def asyncSetUp(self):
+        self.requests = []
+        set_rpc_client(mock_rpc_client(BlocksHandler(), self.requests, batch_window_ms=0, cache_max_bytes=0))
+        slot_index.open("")
+
+    async def asyncTearDown(self):
+        set_rpc_client(None)
+        slot_index.close()
+
+    def ranges(self):
+        return [body["params"][:2] for body in self.requests if body["method"] == "getBlocks"]
+
+    async def test_long_spans_are_split_into_windows(self):
+        """Test that a span of 1.2 million slots is resolved in three windows and joined in order"""
+        result = await get_blocks(100, 1_200_099, "finalized")
+
+        self.assertEqual(result.status, "success")
+        self.assertEqual(result.blocks, [slot for slot in range(100, 1_200_100) if slot % 3])
+        # The last window reaches past the end for the slot index's lookahead
+        self.assertEqual(sorted(self.ranges()), [[100, 500_099], [500_100, 1_000_099], [1_000_100, 1_200_163]])
+        getblocks = [body for body in self.requests if body["method"] == "getBlocks"]
+        self.assertEqual({json.dumps(body["params"][2]) for body in getblocks}, {'{"commitment": "finalized"}'})
+
+    async def test_cached_windows_are_left_unchanged(self):
+        """Test that joining windows does not change the cached result of the first one"""
+        set_rpc_client(mock_rpc_client(BlocksHandler(), self.requests, batch_window_ms=0))
+        blocks = await blocks_in_range(0, 2_999, window=1_000)
+        self.assertEqual(blocks, [slot for slot in range(3_000) if slot % 3])
+
+        first_window = await blocks_in_range(0, 999, window=1_000)
+        self.assertEqual(first_window, [slot for slot in range(1_000) if slot % 3])
+        self.assertEqual(self.ranges(), [[0, 999], [1_000, 1_999], [2_000, 2_999]])
+
+    async def test_short_spans_are_one_call(self):
+        """Test that spans within the limit are sent as they are"""
+        blocks = await blocks_in_range(0, MAX_BLOCKS_RANGE - 1)
+
+        self.assertEqual(len(blocks), len([slot for slot in range(MAX_BLOCKS_RANGE) if slot % 3]))
+        self.assertEqual(self.ranges(), [[0, MAX_BLOCKS_RANGE - 1]])
+
+    async def test_open_spans_end_at_the_current_slot(self):
+        """Test that a missing end slot is looked up before the span is split"""
+        result = await get_blocks(0)
+
+        self.assertEqual(self.requests[0]["method"], "getSlot")
+        self.assertEqual(result.blocks[-1], 1_700_000)
+        self.assertEqual(len(self.ranges()), 4)
+
+    async def test_large_limits_are_served_from_ranges(self):
+        """Test that a limit above the RPC maximum covers skipped slots with another round"""
+        result = await get_blocks_with_limit(10, 600_000)
+
+        self.assertEqual(result.status, "success")
+        self.assertEqual(len(result.blocks), 600_000)
+        self.assertEqual(result.blocks[:3], [10, 11, 13])
+        self.assertEqual(result.blocks[-1], 900_008)
+        self.assertNotIn("getBlocksWithLimit", {body["method"] for body in self.requests})
+
+    async def test_windows_are_fetched_in_parallel(self):
+        """Test that windows overlap in flight up to the concurrency limit"""
+        in_flight = 0
+        peak = 0
+
+        async def fake_request(method, params, timeout=None, cache=True):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(random.uniform(0, 0.005))
+            in_flight -= 1
+            return {"jsonrpc": "2.0", "result": list(range(params[0], params[1] + 1)), "id": 1}
+
+        with patch("app.services.blocks.rpc_request", fake_request):
+            blocks = await blocks_in_range(0, 999, concurrency=4, window=10)
+
+        self.assertEqual(blocks, list(range(1000)))
+        self.assertEqual(peak, 4)
+
+    async def test_a_failed_window_fails_the_request(self):
+        """Test that an error in any window is reported"""
+        def handler(payload):
+            if payload["params"][0] == 500_000:
+                return {"jsonrpc": "2.0", "error": {"code": -32602, "message": "Invalid param"}, "id": payload["id"]}
+            return BlocksHandler()(payload)
+
+        set_rpc_client(mock_rpc_client(handler, batch_window_ms=0, cache_max_bytes=0))
+        result = await get_blocks(0, 1_000_000)
+
+        self.assertEqual(result.status, "error")
+        self.assertEqual(result.error["code"], -32602)
+
+
+class TestScanBlocks(unittest.IsolatedAsyncioTestCase):
+    """Tests for scans into sinks, with checkpoints"""
+
+    async def asyncSetUp(self):
+        self.handler = BlocksHandler()
+        self.requests = []
+        set_rpc_client(mock_rpc_client(self.handler, self.requests, cache_max_bytes=0))
+        self.directory = tempfile.TemporaryDirectory()
+        patcher = patch("app.services.blocks.SOLANA_EXPORT_DIR", self.directory.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        set_rpc_client(None)
+        self.directory.cleanup()
+
+    def file_sink(self):
+        return FileSink("blocks.jsonl", ["slot", "transactionCount"], directory=self.directory.name, project=project_block)
+
+    async def test_response_sink_returns_block_summaries(self):
+        """Test a scan into the response sink"""
+        self.handler.gone.add(13)
+        sink = ResponseSink(5, ["slot", "blockhash", "transactionCount"], project_block, "blocks")
+        result = await scan_blocks(10, 30, sink, concurrency=4)
+
+        self.assertTrue(result.complete)
+        self.assertEqual(result.nextSlot, 31)
+        self.assertEqual(result.scanned, 13)
+        self.assertEqual(result.skipped, 1)
+        self.assertEqual(result.blocks[0], {"slot": 10, "blockhash": "hash10", "transactionCount": 2})
+        self.assertEqual([block["slot"] for block in result.blocks], [10, 11, 14, 16, 17])
+        self.assertTrue(result.truncated)
+
+    async def test_unknown_block_fields_are_reported(self):
+        """Test that fields outside BLOCK_FIELDS are named in the error"""
+        self.assertIsNone(unknown_fields(["slot", "transactionCount"], BLOCK_FIELDS, "block"))
+        self.assertEqual(
+            unknown_fields(["slot", "fee", "txs"], BLOCK_FIELDS, "block"),
+            f"Unknown block fields: fee, txs; expected any of {', '.join(BLOCK_FIELDS)}"
+        )
+
+    async def test_interrupted_file_scan_resumes_without_gaps_or_repeats(self):
+        """Test that a failed scan continues from its checkpoint and the file matches a full scan"""
+        self.handler.fail.add(50)
+        first = await scan_blocks(0, 99, self.file_sink(), checkpoint="scan.json", concurrency=3)
+        self.assertEqual(first.status, "error")
+        self.assertEqual(first.nextSlot, 50)
+
+        self.handler.fail.clear()
+        second = await scan_blocks(0, 99, self.file_sink(), checkpoint="scan.json", concurrency=3)
+        self.assertEqual(second.status, "success")
+        self.assertTrue(second.resumed)
+        self.assertTrue(second.complete)
+        self.assertEqual(second.totalScanned, 66)
+        self.assertLess(second.scanned, 66)
+
+        with open(second.path) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line["slot"] for line in lines], [slot for slot in range(100) if slot % 3])
+        self.assertEqual(lines[1], {"slot": 2, "transactionCount": 2})
+
+    async def test_limited_aggregate_scan_continues_with_totals(self):
+        """Test that max_blocks stops a scan and the aggregate carries over to the next call"""
+        first = await scan_blocks(1, 60, BlockAggregateSink(), max_blocks=15, checkpoint="agg.json")
+        self.assertFalse(first.complete)
+        self.assertEqual(first.aggregate["blocks"], 15)
+
+        second = await scan_blocks(1, 60, BlockAggregateSink(), max_blocks=1000, checkpoint="agg.json")
+        self.assertTrue(second.complete)
+        self.assertEqual(second.scanned, 25)
+
+        slots = [slot for slot in range(1, 61) if slot % 3]
+        self.assertEqual(second.aggregate["blocks"], 40)
+        self.assertEqual(second.aggregate["transactions"], sum(slot % 4 for slot in slots))
+        self.assertEqual(second.aggregate["failed_transactions"], sum(1 for slot in slots if slot % 4))
+        self.assertEqual(second.aggregate["first_block_time"], 1700000001)
+        self.assertEqual(second.aggregate["last_block_time"], 1700000059)
+
+        # A finished scan is not fetched again
+        fetched = len(self.handler.fetched)
+        again = await scan_blocks(1, 60, BlockAggregateSink(), checkpoint="agg.json")
+        self.assertEqual((again.scanned, again.aggregate["blocks"]), (0, 40))
+        self.assertEqual(len(self.handler.fetched), fetched)
+
+    async def test_checkpoint_of_another_scan_is_rejected(self):
+        """Test that a checkpoint only resumes the scan it was written for"""
+        await scan_blocks(1, 10, BlockAggregateSink(), checkpoint="scan.json")
+        result = await scan_blocks(1, 20, BlockAggregateSink(), checkpoint="scan.json")
+
+        self.assertEqual(result.status, "error")
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, "scan.json")))
+
+    async def test_rejected_checkpoint_keeps_the_export(self):
+        """Test that a scan that cannot resume leaves the file of the earlier scan untouched"""
+        first = await scan_blocks(0, 30, self.file_sink(), checkpoint="scan.json")
+        with open(first.path) as f:
+            exported = f.read()
+
+        result = await scan_blocks(0, 60, self.file_sink(), checkpoint="scan.json")
+        self.assertEqual(result.status, "error")
+        with open(first.path) as f:
+            self.assertEqual(f.read(), exported)
+        self.assertTrue(exported)
+
+    async def test_scanned_blocks_bypass_the_caches(self):
+        """Test that scans do not fill the response cache"""
+        client = mock_rpc_client(self.handler, cache_max_bytes=1024 * 1024)
+        set_rpc_client(client)
+        await scan_blocks(1, 30, BlockAggregateSink(), commitment="finalized")
+
+        self.assertEqual(client.stats()["cache"]["entries"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
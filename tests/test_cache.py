@@ -0,0 +1,139 @@
+"""
+Tests for the RPC response cache
+"""
+import asyncio
+import math
+import unittest
+from app.core.cache import ResponseCache
+from app.core.rpc import set_rpc_client
+from app.core.singleflight import canonical_key
+from app.services.solana import get_genesis_hash, get_solana_balance
+from tests.helpers import mock_rpc_client
+
+
+def handler(payload):
+    if payload["method"] == "getGenesisHash":
+        result = "5eykt4UsFv8P8NJdTREpY1vzqKqZKvdpKuc147dw2N9d"
+    else:
+        result = {"context": {"slot": 1}, "value": 1}
+    return {"jsonrpc": "2.0", "result": result, "id": payload["id"]}
+
+
+def response(n, size=0):
+    return {"jsonrpc": "2.0", "result": "x" * size, "id": n}
+
+
+class TestResponseCache(unittest.TestCase):
+    """Tests for TTL selection and LRU eviction"""
+
+    def test_ttl_depends_on_method_and_commitment(self):
+        """Test per-method and per-commitment TTLs"""
+        cache = ResponseCache(1 << 20, {"getBalance": 5.0})
+
+        self.assertEqual(cache.ttl("getGenesisHash", []), math.inf)
+        self.assertEqual(cache.ttl("getAccountInfo", ["a", {"commitment": "processed"}]), 0.4)
+        self.assertEqual(cache.ttl("getAccountInfo", ["a"]), 10.0)
+        self.assertEqual(cache.ttl("getBlock", [1, {"commitment": "finalized"}]), math.inf)
+        self.assertEqual(cache.ttl("getBlock", [1, {"commitment": "processed"}]), 0.0)
+        self.assertEqual(cache.ttl("getHealth", []), 0.0)
+        self.assertEqual(cache.ttl("getBalance", ["a"]), 5.0)
+
+    def test_block_times_are_kept_for_good_only_when_rooted(self):
+        """Test that times of slots above the rooted slot expire like confirmed data"""
+        cache = ResponseCache(1 << 20)
+
+        self.assertEqual(cache.ttl("getBlockTime", [100], rooted_slot=150), math.inf)
+        self.assertEqual(cache.ttl("getBlockTime", [200], rooted_slot=150), 60.0)
+        self.assertEqual(cache.ttl("getBlockTime", [100]), 60.0)
+        self.assertEqual(ResponseCache(1 << 20, {"getBlockTime": 0}).ttl("getBlockTime", [100], rooted_slot=150), 0)
+
+    def test_least_recently_used_entries_are_evicted_by_size(self):
+        """Test that the cache stays within its byte budget by evicting the oldest entries"""
+        cache = ResponseCache(2000)
+        for n in range(3):
+            cache.put(n, response(n, 200), 60)
+        cache.get(0)
+        for n in range(3, 10):
+            cache.put(n, response(n, 200), 60)
+
+        stats = cache.stats()
+        self.assertLessEqual(stats["bytes"], 2000)
+        self.assertGreater(stats["evictions"], 0)
+        self.assertIsNone(cache.get(1))
+        self.assertIsNotNone(cache.get(9))
+
+    def test_errors_null_results_and_huge_responses_are_not_cached(self):
+        """Test which responses are stored"""
+        cache = ResponseCache(8000)
+        cache.put("error", {"jsonrpc": "2.0", "error": {"code": -32005}, "id": 1}, 60)
+        cache.put("null", {"jsonrpc": "2.0", "result": None, "id": 1}, 60)
+        cache.put("huge", response(1, 2000), 60)
+
+        self.assertEqual(cache.stats()["entries"], 0)
+
+
+class TestCachedRequests(unittest.IsolatedAsyncioTestCase):
+    """Tests for cached requests through the RPC client"""
+
+    def tearDown(self):
+        set_rpc_client(None)
+
+    async def test_static_data_is_fetched_once(self):
+        """Test that the genesis hash is served from the cache after the first call"""
+        requests = []
+        client = mock_rpc_client(handler, requests)
+        set_rpc_client(client)
+
+        first = await get_genesis_hash()
+        second = await get_genesis_hash()
+
+        self.assertEqual(first.genesisHash, second.genesisHash)
+        self.assertEqual(len(requests), 1)
+        stats = client.stats()["cache"]
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    async def test_entries_expire(self):
+        """Test that a response is fetched again after its TTL"""
+        requests = []
+        client = mock_rpc_client(handler, requests, cache_ttls={"getBalance": 0.05}, batch_window_ms=0)
+        set_rpc_client(client)
+
+        await get_solana_balance("address")
+        await get_solana_balance("address")
+        self.assertEqual(len(requests), 1)
+
+        await asyncio.sleep(0.06)
+        await get_solana_balance("address")
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(client.stats()["cache"]["expirations"], 1)
+        self.assertIn(canonical_key("getBalance", ["address"]), client.cache._entries)
+
+    async def test_block_times_follow_the_rooted_slot(self):
+        """Test that the client caches block times for good only at or below the slot its endpoints report"""
+        client = mock_rpc_client(lambda payload: {"jsonrpc": "2.0", "result": 1700000000, "id": payload["id"]})
+        set_rpc_client(client)
+        client.pool.endpoints[0].slot = 150
+
+        await client.request("getBlockTime", [100])
+        await client.request("getBlockTime", [200])
+
+        entries = client.cache._entries
+        self.assertEqual(entries[canonical_key("getBlockTime", [100])][0], math.inf)
+        self.assertLess(entries[canonical_key("getBlockTime", [200])][0], math.inf)
+
+    async def test_cache_can_be_disabled(self):
+        """Test that a zero size disables caching"""
+        requests = []
+        client = mock_rpc_client(handler, requests, cache_max_bytes=0)
+        set_rpc_client(client)
+
+        await get_genesis_hash()
+        await get_genesis_hash()
+
+        self.assertEqual(len(requests), 2)
+        self.assertIsNone(client.stats()["cache"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Tests for compressed responses and transfer accounting
+"""
+import unittest
+from app.core.compression import TransferStats, accept_encoding
+from app.core.rpc import SolanaRpcClient, set_rpc_client
+from app.services.solana import get_program_accounts
+from tests.helpers import StandInRpcServer
+
+
+def program_accounts(payload):
+    account = {
+        "pubkey": "11111111111111111111111111111111",
+        "account": {
+            "data": ["AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA", "base64"],
+            "executable": False,
+            "lamports": 2039280,
+            "owner": "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA",
+            "rentEpoch": 361,
+            "space": 165
+        }
+    }
+    return {"jsonrpc": "2.0", "result": [account] * 500, "id": payload["id"]}
+
+
+class TestTransferStats(unittest.TestCase):
+    """Tests for per-method byte accounting"""
+
+    def test_batch_bytes_are_shared_between_methods(self):
+        """Test that batch responses are split evenly between their methods"""
+        transfer = TransferStats()
+        transfer.record(["getBalance", "getSlot"], 100, 400)
+        transfer.record(["getBalance"], 50, 50)
+
+        stats = transfer.stats()
+        self.assertEqual(stats["getBalance"], {"responses": 2, "wire_bytes": 100, "decoded_bytes": 250, "ratio": 2.5})
+        self.assertEqual(stats["getSlot"]["wire_bytes"], 50)
+
+    def test_accept_encoding(self):
+        """Test the negotiated encodings"""
+        self.assertTrue(accept_encoding().startswith("gzip, deflate"))
+        self.assertEqual(accept_encoding(False), "identity")
+
+
+class TestCompressedResponses(unittest.IsolatedAsyncioTestCase):
+    """Tests for compression against a local stand-in RPC server"""
+
+    async def asyncSetUp(self):
+        self.server = StandInRpcServer(0.0, program_accounts, compress=True).start()
+
+    async def asyncTearDown(self):
+        set_rpc_client(None)
+        self.server.stop()
+
+    async def fetch(self, compression):
+        client = SolanaRpcClient(url=self.server.url, health_interval=0, compression=compression)
+        set_rpc_client(client)
+        result = await get_program_accounts("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA", encoding="base64")
+        await client.aclose()
+        return result, client.stats()["transfer"]["getProgramAccounts"]
+
+    async def test_compressed_response_is_decoded_and_counted(self):
+        """Test that gzip responses decode correctly and cut wire bytes"""
+        result, transfer = await self.fetch(compression=True)
+
+        self.assertEqual(result.status, "success")
+        self.assertEqual(len(result.accounts), 500)
+        self.assertIn("gzip", self.server.accept_encoding)
+        self.assertGreater(transfer["ratio"], 10)
+
+    async def test_compression_can_be_disabled(self):
+        """Test that disabling compression asks for identity encoding"""
+        result, transfer = await self.fetch(compression=False)
+
+        self.assertEqual(result.status, "success")
+        self.assertEqual(self.server.accept_encoding, "identity")
+        self.assertEqual(transfer["wire_bytes"], transfer["decoded_bytes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
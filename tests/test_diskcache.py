@@ -0,0 +1,154 @@
+"""
+Tests for the permanent on-disk result store
+"""
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from app.core.diskcache import DiskStore
+from app.core.rpc import set_rpc_client
+from app.services.solana import get_block, get_block_time
+from tests.helpers import mock_rpc_client
+
+
+def handler(payload):
+    method = payload["method"]
+    if method == "getBlock":
+        result = {
+            "blockHeight": 1000,
+            "blockTime": 1700000000,
+            "blockhash": f"hash{payload['params'][0]}",
+            "parentSlot": payload["params"][0] - 1,
+            "previousBlockhash": "parent",
+            "transactions": [],
+            "rewards": []
+        }
+    elif method == "getBlockTime":
+        result = 1700000000
+    else:
+        result = [{"epoch": 500, "effectiveSlot": 216000000, "amount": 2500, "postBalance": 100, "commission": None}]
+    return {"jsonrpc": "2.0", "result": result, "id": payload["id"]}
+
+
+def ok(result):
+    return {"jsonrpc": "2.0", "result": result, "id": 1}
+
+
+class TestDiskStore(unittest.TestCase):
+    """Tests for which results are stored and how they are read back"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "store", "rpc.sqlite3")
+        self.store = DiskStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_only_immutable_results_are_stored(self):
+        """Test the permanence rules for blocks, block times and inflation rewards"""
+        self.assertTrue(self.store.put("getBlock", [100, {"encoding": "json"}], ok({"blockhash": "a"})))
+        self.assertFalse(self.store.put("getBlock", [101, {"commitment": "confirmed"}], ok({"blockhash": "b"})))
+        self.assertFalse(self.store.put("getBlock", [102], {"jsonrpc": "2.0", "error": {"code": -32004}, "id": 1}))
+
+        # Block times are stored only up to the highest rooted slot
+        self.assertEqual(self.store.rooted_slot, 100)
+        self.assertTrue(self.store.put("getBlockTime", [99], ok(1700000000)))
+        self.assertFalse(self.store.put("getBlockTime", [150], ok(1700000040)))
+
+        reward = {"epoch": 500, "amount": 1}
+        self.assertTrue(self.store.put("getInflationReward", [["a"], {"epoch": 500}], ok([reward])))
+        self.assertFalse(self.store.put("getInflationReward", [["a"]], ok([reward])))
+        self.assertFalse(self.store.put("getInflationReward", [["a", "b"], {"epoch": 500}], ok([reward, None])))
+
+        self.assertFalse(self.store.put("getBalance", ["a"], ok({"value": 1})))
+
+    def test_results_survive_reopening(self):
+        """Test that stored results and the rooted slot persist across restarts"""
+        self.store.put("getBlock", [100, {"encoding": "json", "maxSupportedTransactionVersion": 0}], ok({"blockhash": "a"}))
+        self.store.close()
+
+        self.store = DiskStore(self.path)
+        self.assertEqual(self.store.get("getBlock", [100, {"maxSupportedTransactionVersion": 0, "encoding": "json"}]), {"blockhash": "a"})
+        self.assertIsNone(self.store.get("getBlock", [100]))
+        self.assertEqual(self.store.rooted_slot, 100)
+
+    def test_identical_results_are_stored_once(self):
+        """Test content addressing of results"""
+        self.store.observe_rooted_slot(500)
+        for slot in range(10):
+            self.store.put("getBlockTime", [slot], ok(1700000000))
+
+        stats = self.store.stats()
+        self.assertEqual(stats["requests"], 10)
+        self.assertEqual(stats["results"], 1)
+
+
+class TestStoredRequests(unittest.IsolatedAsyncioTestCase):
+    """Tests for serving requests from the store through the RPC client"""
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "rpc.sqlite3")
+
+    async def asyncTearDown(self):
+        set_rpc_client(None)
+        self.directory.cleanup()
+
+    async def test_finalized_block_is_served_from_disk_after_restart(self):
+        """Test that a second client with an empty memory cache reads the block from disk"""
+        requests = []
+        set_rpc_client(mock_rpc_client(handler, requests, disk_cache=self.path))
+        first = await get_block(2000)
+
+        client = mock_rpc_client(handler, requests, disk_cache=self.path)
+        set_rpc_client(client)
+        second = await get_block(2000)
+        block_time = await get_block_time(1999)
+
+        self.assertEqual(first.blockhash, "hash2000")
+        self.assertEqual(second.blockhash, "hash2000")
+        self.assertEqual(block_time.blockTime, 1700000000)
+        methods = [item["method"] for body in requests for item in (body if isinstance(body, list) else [body])]
+        self.assertEqual(methods, ["getBlock", "getBlockTime"])
+        self.assertEqual(client.stats()["disk_cache"]["hits"], 1)
+
+    async def test_probed_finalized_slot_allows_block_times(self):
+        """Test that the endpoints' finalized slot marks block times as permanent"""
+        requests = []
+        client = mock_rpc_client(handler, requests, disk_cache=self.path)
+        client.pool.endpoints[0].slot = 5000
+        set_rpc_client(client)
+
+        await get_block_time(4000)
+        client.cache.clear()
+        await get_block_time(4000)
+
+        self.assertEqual(len(requests), 1)
+
+    async def test_store_is_used_off_the_event_loop(self):
+        """Test that reads and writes of the store run outside the event loop's thread"""
+        client = mock_rpc_client(handler, disk_cache=self.path, cache_max_bytes=0)
+        set_rpc_client(client)
+        threads = []
+        get, put = client.disk.get, client.disk.put
+
+        def record(call):
+            def wrapper(*args):
+                threads.append(threading.get_ident())
+                return call(*args)
+            return wrapper
+
+        with patch.object(client.disk, "get", record(get)), patch.object(client.disk, "put", record(put)):
+            await get_block(2000)
+            await get_block(2000)
+
+        # A miss, the write of the fetched block and a hit
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(threading.get_ident(), threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Tests for multi-endpoint routing
+"""
+import asyncio
+import random
+import unittest
+from unittest.mock import patch
+from app.core.endpoints import EndpointPool
+from app.core.rpc import SolanaRpcClient, set_rpc_client
+from app.services.solana import get_solana_balance
+from tests.helpers import StandInRpcServer
+
+
+class TestEndpointPool(unittest.TestCase):
+    """Tests for endpoint choice with fixed latencies"""
+
+    def test_fastest_endpoint_gets_most_traffic(self):
+        """Test that requests favour the endpoint with the lowest latency"""
+        latencies = {"slow": 0.1, "medium": 0.03, "fast": 0.002}
+        pool = EndpointPool(latencies)
+        traffic = dict.fromkeys(latencies, 0)
+
+        with patch("app.core.endpoints.random.sample", random.Random(7).sample):
+            for _ in range(900):
+                endpoint = pool.choose()
+                traffic[endpoint.url] += 1
+                pool.record_success(endpoint, latencies[endpoint.url])
+
+        # With two random candidates per request, the fastest wins every pair it
+        # is in (about two thirds) and the slowest none
+        self.assertGreater(traffic["fast"], 500)
+        self.assertGreater(traffic["medium"], 200)
+        self.assertLess(traffic["slow"], 20)
+
+
+class TestEndpointRouting(unittest.IsolatedAsyncioTestCase):
+    """Tests for latency-aware routing across local stand-in RPC servers"""
+
+    async def asyncSetUp(self):
+        self.servers = []
+
+    async def asyncTearDown(self):
+        set_rpc_client(None)
+        for server in self.servers:
+            server.stop()
+
+    def start_servers(self, *latencies):
+        self.servers = [StandInRpcServer(latency).start() for latency in latencies]
+        return self.servers
+
+    async def call_many(self, client, count):
+        set_rpc_client(client)
+        for n in range(count):
+            result = await get_solana_balance(f"address{n}")
+            self.assertEqual(result.status, "success")
+
+    async def call_many_allowing_errors(self, count):
+        for n in range(count):
+            await get_solana_balance(f"address{n}")
+
+    async def test_failing_endpoint_is_ejected_and_readmitted(self):
+        """Test that a failing endpoint leaves rotation and comes back after the ejection period"""
+        good, flaky = self.start_servers(0.1, 0.0)
+        flaky.status = 503
+        client = SolanaRpcClient(
+            urls=[good.url, flaky.url],
+            batch_window_ms=0,
+            health_interval=0,
+            eject_after_failures=1,
+            eject_seconds=1.0
+        )
+        set_rpc_client(client)
+
+        await self.call_many_allowing_errors(5)
+        self.assertEqual(flaky.requests, 1)
+        flaky_stats = client.stats()["endpoints"][1]
+        self.assertFalse(flaky_stats["available"])
+        self.assertEqual(flaky_stats["ejections"], 1)
+
+        # Once re-admitted, the now healthy and faster endpoint takes traffic again
+        flaky.status = 200
+        await asyncio.sleep(1.0)
+        await self.call_many(client, 10)
+        await client.aclose()
+
+        self.assertGreater(flaky.requests, 1)
+        self.assertTrue(client.stats()["endpoints"][1]["available"])
+
+    async def test_all_endpoints_ejected_still_routes(self):
+        """Test that a request is still attempted when every endpoint is ejected"""
+        (server,) = self.start_servers(0.0)
+        client = SolanaRpcClient(urls=[server.url], batch_window_ms=0, health_interval=0)
+        client.pool.eject(client.pool.endpoints[0], 60)
+
+        await self.call_many(client, 1)
+        await client.aclose()
+
+        self.assertEqual(server.requests, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
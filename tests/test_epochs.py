@@ -0,0 +1,90 @@
+"""
+Tests for local epoch and slot arithmetic
+"""
+import unittest
+from app.core.rpc import set_rpc_client
+from app.services.epochs import EpochCalculator
+from app.services.solana import get_epoch_for_slot, get_epoch_slot_range, get_inflation_reward
+from tests.helpers import mock_rpc_client
+
+MAINNET_SCHEDULE = {"slotsPerEpoch": 432000, "leaderScheduleSlotOffset": 432000, "warmup": False, "firstNormalEpoch": 0, "firstNormalSlot": 0}
+WARMUP_SCHEDULE = {"slotsPerEpoch": 8192, "leaderScheduleSlotOffset": 8192, "warmup": True, "firstNormalEpoch": 8, "firstNormalSlot": 8160}
+
+
+def handler(payload):
+    method = payload["method"]
+    if method == "getEpochSchedule":
+        result = MAINNET_SCHEDULE
+    elif method == "getSlot":
+        result = 312345678
+    elif method == "getInflationReward":
+        config = payload["params"][1] if len(payload["params"]) > 1 else {}
+        epoch = config.get("epoch", 722)
+        result = [{"epoch": epoch, "effectiveSlot": 311904000, "amount": 2500, "postBalance": 100, "commission": None}]
+    else:
+        result = None
+    return {"jsonrpc": "2.0", "result": result, "id": payload["id"]}
+
+
+class TestEpochCalculator(unittest.TestCase):
+    """Tests for slot and epoch conversions"""
+
+    def test_warmup_epochs_double_in_length(self):
+        """Test conversions during and after warmup against the cluster's EpochSchedule rules"""
+        calculator = EpochCalculator.from_schedule(WARMUP_SCHEDULE)
+
+        self.assertEqual(calculator.epoch_and_slot_index(0), (0, 0))
+        self.assertEqual(calculator.epoch_and_slot_index(31), (0, 31))
+        self.assertEqual(calculator.epoch_and_slot_index(32), (1, 0))
+        self.assertEqual(calculator.epoch_and_slot_index(95), (1, 63))
+        self.assertEqual(calculator.epoch_and_slot_index(8159), (7, 4095))
+        self.assertEqual(calculator.epoch_and_slot_index(8160), (8, 0))
+        self.assertEqual(calculator.epoch_and_slot_index(8160 + 8192 * 3 + 5), (11, 5))
+        self.assertEqual(calculator.slots_in_epoch(7), 4096)
+        self.assertEqual(calculator.first_slot(7), 4064)
+        self.assertEqual(calculator.first_slot(8), 8160)
+        self.assertEqual(calculator.last_slot(9), 8160 + 2 * 8192 - 1)
+
+    def test_conversions_round_trip(self):
+        """Test that every slot lies within the range of its epoch"""
+        for schedule in (MAINNET_SCHEDULE, WARMUP_SCHEDULE):
+            calculator = EpochCalculator.from_schedule(schedule)
+            for slot in list(range(0, 20000, 7)) + [312345678]:
+                epoch, index = calculator.epoch_and_slot_index(slot)
+                self.assertEqual(calculator.first_slot(epoch) + index, slot)
+                self.assertLessEqual(slot, calculator.last_slot(epoch))
+                self.assertEqual(calculator.last_slot(epoch) + 1, calculator.first_slot(epoch + 1))
+
+
+class TestEpochTools(unittest.IsolatedAsyncioTestCase):
+    """Tests for the tools built on the calculator"""
+
+    async def asyncSetUp(self):
+        self.requests = []
+        set_rpc_client(mock_rpc_client(handler, self.requests, batch_window_ms=0))
+
+    async def asyncTearDown(self):
+        set_rpc_client(None)
+
+    async def test_conversions_fetch_the_schedule_once(self):
+        """Test that conversions only need the cached epoch schedule"""
+        slot = await get_epoch_for_slot(312345678)
+        epoch = await get_epoch_slot_range(723)
+
+        self.assertEqual((slot.epoch, slot.slotIndex, slot.firstSlot), (723, 9678, 312336000))
+        self.assertEqual((epoch.firstSlot, epoch.lastSlot, epoch.slotsInEpoch), (312336000, 312767999, 432000))
+        self.assertEqual([body["method"] for body in self.requests], ["getEpochSchedule"])
+
+    async def test_inflation_reward_is_one_request(self):
+        """Test that rewards take a single request, with or without an explicit epoch"""
+        latest = await get_inflation_reward(["address"])
+        past = await get_inflation_reward(["address"], epoch=700)
+
+        self.assertEqual((latest.rewards[0].epoch, past.rewards[0].epoch), (722, 700))
+        self.assertEqual(
+            [(body["method"], body["params"]) for body in self.requests],
+            [("getInflationReward", [["address"]]), ("getInflationReward", [["address"], {"epoch": 700}])]
+        )
+
+if __name__ == "__main__":
+    unittest.main()
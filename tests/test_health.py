@@ -0,0 +1,174 @@
+"""
+Tests for health probing and circuit breakers
+"""
+import asyncio
+import time
+import json
+import unittest
+import httpx
+from app.core.health import LAST_ENDPOINT_PROBE_FAILURES, CircuitBreaker
+from app.core.rpc import SolanaRpcClient, set_rpc_client
+from app.services.solana import get_health, get_solana_balance
+from tests.helpers import StandInRpcServer
+
+
+class StandInNode:
+    """Answers getHealth and getSlot like a node at a given slot"""
+
+    def __init__(self, slot, healthy=True):
+        self.slot = slot
+        self.healthy = healthy
+        self.calls = 0
+
+    def __call__(self, payload):
+        if payload["method"] == "getHealth" and not self.healthy:
+            return {
+                "jsonrpc": "2.0",
+                "error": {"code": -32005, "message": "Node is unhealthy"},
+                "id": payload["id"]
+            }
+        if payload["method"] == "getHealth":
+            result = "ok"
+        elif payload["method"] == "getSlot":
+            result = self.slot
+        else:
+            self.calls += 1
+            result = {"context": {"slot": self.slot}, "value": 1}
+        return {"jsonrpc": "2.0", "result": result, "id": payload["id"]}
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Tests for circuit breaker state changes"""
+
+    def test_open_breaker_half_opens_after_cooldown(self):
+        """Test that an open breaker lets a trial through after the cooldown"""
+        breaker = CircuitBreaker(cooldown=10)
+        breaker.trip("Node is unhealthy")
+        self.assertFalse(breaker.allows(time.monotonic()))
+        self.assertTrue(breaker.allows(time.monotonic() + 11))
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        breaker.allows(time.monotonic() + 11)
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(breaker.trips, 2)
+
+
+class TestHealthProber(unittest.IsolatedAsyncioTestCase):
+    """Tests for background probing against local stand-in RPC servers"""
+
+    async def asyncSetUp(self):
+        self.nodes = [StandInNode(1000), StandInNode(1000), StandInNode(1000)]
+        self.servers = [StandInRpcServer(0.0, node).start() for node in self.nodes]
+        self.client = SolanaRpcClient(
+            urls=[server.url for server in self.servers],
+            batch_window_ms=0,
+            health_interval=0.05,
+            max_slot_lag=50
+        )
+        set_rpc_client(self.client)
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+        set_rpc_client(None)
+        for server in self.servers:
+            server.stop()
+
+    def breaker_states(self):
+        return [endpoint["breaker"]["state"] for endpoint in self.client.stats()["endpoints"]]
+
+    async def test_unhealthy_and_lagging_nodes_are_skipped(self):
+        """Test that requests avoid nodes that are unhealthy or behind"""
+        self.nodes[1].healthy = False
+        self.nodes[2].slot = 900
+        await self.client.prober.probe_all()
+
+        self.assertEqual(self.breaker_states(), ["closed", "open", "open"])
+        self.assertIn("100 slots behind", self.client.stats()["endpoints"][2]["breaker"]["reason"])
+
+        for n in range(10):
+            await get_solana_balance(f"address{n}")
+        self.assertEqual([node.calls for node in self.nodes], [10, 0, 0])
+
+    async def test_all_nodes_unhealthy_fails_fast(self):
+        """Test that calls fail immediately when no endpoint is healthy"""
+        for node in self.nodes:
+            node.healthy = False
+        await self.client.prober.probe_all()
+
+        start = time.monotonic()
+        result = await get_solana_balance("address")
+
+        self.assertEqual(result.status, "error")
+        self.assertIn("No healthy RPC endpoint", result.message)
+        self.assertLess(time.monotonic() - start, 0.05)
+
+        health = await get_health()
+        self.assertEqual(health.status, "success")
+        self.assertFalse(health.healthy)
+
+    async def test_background_probe_closes_breaker_after_recovery(self):
+        """Test that the background prober starts on first use and re-admits recovered nodes"""
+        self.nodes[0].slot = 800
+        await get_solana_balance("address")
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.breaker_states(), ["open", "closed", "closed"])
+
+        self.nodes[0].slot = 1000
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.breaker_states(), ["closed", "closed", "closed"])
+        self.assertGreaterEqual(self.client.prober.rounds, 2)
+
+
+class TestProbeRequests(unittest.IsolatedAsyncioTestCase):
+    """Tests for probes of a single endpoint whose provider rejects batch requests"""
+
+    async def asyncSetUp(self):
+        self.node = StandInNode(1000)
+        self.bodies = []
+        self.down = False
+
+        def respond(request):
+            body = json.loads(request.content)
+            self.bodies.append(body)
+            if self.down:
+                raise httpx.ConnectError("Connection refused")
+            if isinstance(body, list):
+                return httpx.Response(200, json={"jsonrpc": "2.0", "error": {"code": -32600, "message": "Batch requests are not supported"}, "id": None})
+            return httpx.Response(200, json=self.node(body))
+
+        self.client = SolanaRpcClient(url="http://rpc.test", batch_window_ms=0, health_interval=60, transport=httpx.MockTransport(respond))
+        self.endpoint = self.client.pool.endpoints[0]
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    async def test_rejected_batches_fall_back_to_single_requests(self):
+        """Test that a provider without batch support is probed with single requests"""
+        await self.client.prober.probe_all()
+        self.assertEqual(self.endpoint.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.endpoint.slot, 1000)
+
+        # Later rounds skip the batch
+        del self.bodies[:]
+        self.node.healthy = False
+        await self.client.prober.probe_all()
+        self.assertEqual([body["method"] for body in self.bodies], ["getHealth", "getSlot"])
+        self.assertEqual(self.endpoint.breaker.state, CircuitBreaker.OPEN)
+
+    async def test_last_endpoint_survives_lost_probes(self):
+        """Test that the only endpoint is taken out after several probes without an answer, not one"""
+        self.down = True
+        for _ in range(LAST_ENDPOINT_PROBE_FAILURES - 1):
+            await self.client.prober.probe_all()
+            self.assertEqual(self.endpoint.breaker.state, CircuitBreaker.CLOSED)
+
+        await self.client.prober.probe_all()
+        self.assertEqual(self.endpoint.breaker.state, CircuitBreaker.OPEN)
+        self.assertIn("Health probe failed", self.endpoint.breaker.reason)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Tests for hedged requests
+"""
+import time
+import unittest
+from unittest.mock import patch
+from app.core.hedging import HedgeBudget, HedgePolicy
+from app.core.rpc import SolanaRpcClient, set_rpc_client
+from app.services.solana import get_latest_blockhash, get_solana_balance
+from tests.helpers import StandInRpcServer
+
+
+def blockhash_handler(payload):
+    return {
+        "jsonrpc": "2.0",
+        "result": {"context": {"slot": 1}, "value": {"blockhash": "abc", "lastValidBlockHeight": 10}},
+        "id": payload["id"]
+    }
+
+
+class TestHedgePolicy(unittest.TestCase):
+    """Tests for hedge delay and budget bookkeeping"""
+
+    def test_delay_follows_latency_percentile(self):
+        """Test that the hedge delay is the configured percentile of recent latencies"""
+        policy = HedgePolicy(["getLatestBlockhash"], percentile=90, min_delay=0.001, initial_delay=0.5)
+        self.assertEqual(policy.delay("getLatestBlockhash"), 0.5)
+
+        for n in range(1, 101):
+            policy.record_latency("getLatestBlockhash", n / 1000)
+
+        self.assertAlmostEqual(policy.delay("getLatestBlockhash"), 0.091)
+
+    def test_budget_limits_hedge_ratio(self):
+        """Test that hedges stay within the budget fraction of requests"""
+        budget = HedgeBudget(0.1, burst=1)
+        budget.tokens = 0
+        granted = 0
+        for _ in range(100):
+            budget.deposit()
+            granted += budget.withdraw()
+        self.assertLessEqual(granted, 10)
+        self.assertGreaterEqual(granted, 9)
+
+
+class TestHedgedRequests(unittest.IsolatedAsyncioTestCase):
+    """Tests for hedging against local stand-in RPC servers"""
+
+    async def asyncSetUp(self):
+        self.slow = StandInRpcServer(0.5, blockhash_handler).start()
+        self.fast = StandInRpcServer(0.0, blockhash_handler).start()
+
+    async def asyncTearDown(self):
+        set_rpc_client(None)
+        self.slow.stop()
+        self.fast.stop()
+
+    def make_client(self, **kwargs):
+        client = SolanaRpcClient(urls=[self.slow.url, self.fast.url], batch_window_ms=0, health_interval=0, **kwargs)
+        client.hedging.initial_delay = 0.05
+        set_rpc_client(client)
+        slow_endpoint, fast_endpoint = client.pool.endpoints
+        return client, patch.object(client.pool, "choose", side_effect=[slow_endpoint, fast_endpoint])
+
+    async def test_slow_primary_is_hedged(self):
+        """Test that a duplicate to a second endpoint answers when the first is slow"""
+        client, slow_first = self.make_client()
+
+        start = time.monotonic()
+        with slow_first:
+            result = await get_latest_blockhash()
+        elapsed = time.monotonic() - start
+        await client.aclose()
+
+        self.assertEqual(result.value.blockhash, "abc")
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(self.fast.requests, 1)
+        stats = client.stats()["hedging"]
+        self.assertEqual(stats["hedges"], 1)
+        self.assertEqual(stats["won"], 1)
+
+    async def test_exhausted_budget_waits_for_primary(self):
+        """Test that no hedge is sent once the budget is spent"""
+        client, slow_first = self.make_client(hedge_budget=0)
+
+        with slow_first:
+            result = await get_latest_blockhash()
+        await client.aclose()
+
+        self.assertEqual(result.value.blockhash, "abc")
+        self.assertEqual(self.fast.requests, 0)
+        self.assertEqual(client.stats()["hedging"]["denied"], 1)
+
+    async def test_methods_not_opted_in_are_not_hedged(self):
+        """Test that only opted-in methods are hedged"""
+        client, slow_first = self.make_client(hedge_methods=["getLatestBlockhash"])
+
+        with slow_first:
+            await get_solana_balance("address")
+        await client.aclose()
+
+        self.assertEqual(self.slow.requests, 1)
+        self.assertEqual(self.fast.requests, 0)
+        self.assertEqual(client.stats()["hedging"]["hedges"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
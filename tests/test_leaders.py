@@ -0,0 +1,128 @@
+"""
+Tests for the cached, indexed leader schedule
+"""
+import asyncio
+import unittest
+from app.core.rpc import set_rpc_client
+from app.services.leaders import LeaderIndex, leader_schedules
+from app.services.solana import get_leader_schedule, get_slot_leaders
+from tests.helpers import mock_rpc_client
+
+SCHEDULE = {"slotsPerEpoch": 100, "leaderScheduleSlotOffset": 100, "warmup": False, "firstNormalEpoch": 0, "firstNormalSlot": 0}
+
+
+def leader_schedule(epoch):
+    """Four consecutive slots per leader, rotating between three validators"""
+    schedule = {}
+    for index in range(100):
+        schedule.setdefault(f"validator{epoch}-{index // 4 % 3}", []).append(index)
+    return schedule
+
+
+def handler(payload):
+    method = payload["method"]
+    if method == "getEpochSchedule":
+        result = SCHEDULE
+    elif method == "getSlot":
+        result = 150
+    elif method == "getLeaderSchedule":
+        first_slot = payload["params"][0]
+        result = leader_schedule(first_slot // 100) if first_slot < 300 else None
+    else:
+        result = None
+    return {"jsonrpc": "2.0", "result": result, "id": payload["id"]}
+
+
+class TestLeaderIndex(unittest.TestCase):
+    """Tests for the per-slot leader index"""
+
+    def test_index_round_trip(self):
+        """Test that the index answers lookups and rebuilds the original schedule"""
+        index = LeaderIndex(2, 200, 100, leader_schedule(2))
+
+        self.assertEqual(index.leader(200), "validator2-0")
+        self.assertEqual(index.leader(213), "validator2-0")
+        self.assertEqual(index.leader(205), "validator2-1")
+        self.assertEqual(index.slots_of("validator2-2")[:5], [8, 9, 10, 11, 20])
+        self.assertEqual(index.schedule(), leader_schedule(2))
+        self.assertEqual(index._leaders.itemsize, 2)
+
+
+class TestLeaderLookups(unittest.IsolatedAsyncioTestCase):
+    """Tests for lookups against a mocked RPC node"""
+
+    async def asyncSetUp(self):
+        leader_schedules.clear()
+        leader_schedules.prefetch_slots = 10
+        self.requests = []
+        set_rpc_client(mock_rpc_client(handler, self.requests, batch_window_ms=0))
+
+    async def asyncTearDown(self):
+        leader_schedules.clear()
+        set_rpc_client(None)
+
+    def schedule_fetches(self):
+        return [body["params"][0] for body in self.requests if body["method"] == "getLeaderSchedule"]
+
+    async def test_schedule_is_fetched_once_per_epoch(self):
+        """Test that repeated lookups in an epoch are answered locally"""
+        first = await get_slot_leaders(120, 4)
+        second = await get_slot_leaders(150)
+        schedule = await get_leader_schedule(130, identity="validator1-1")
+
+        self.assertEqual(first.epoch, 1)
+        self.assertEqual([leader.leader for leader in first.leaders], ["validator1-2"] * 4)
+        self.assertEqual(second.leaders[0].leader, "validator1-0")
+        self.assertEqual(schedule.schedule["validator1-1"][:4], [4, 5, 6, 7])
+        self.assertEqual(self.schedule_fetches(), [100])
+
+    async def test_lookups_cross_epoch_boundaries(self):
+        """Test that a range of slots spanning two epochs uses both indexes"""
+        result = await get_slot_leaders(98, 4)
+
+        self.assertEqual([(leader.slot, leader.leader) for leader in result.leaders], [
+            (98, "validator0-0"),
+            (99, "validator0-0"),
+            (100, "validator1-0"),
+            (101, "validator1-0")
+        ])
+
+    async def test_next_epoch_is_prefetched_near_the_boundary(self):
+        """Test that a lookup close to the end of an epoch fetches the next schedule in the background"""
+        await get_slot_leaders(50)
+        self.assertEqual(self.schedule_fetches(), [0])
+
+        await get_slot_leaders(95)
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.schedule_fetches(), [0, 100])
+        self.assertEqual(leader_schedules.stats()["prefetches"], 1)
+
+    async def test_least_recently_used_epoch_is_evicted(self):
+        """Test that looking up a slot keeps its epoch cached over epochs not used since"""
+        max_epochs, leader_schedules.max_epochs = leader_schedules.max_epochs, 2
+        try:
+            await get_slot_leaders(10)
+            await get_slot_leaders(110)
+            await get_slot_leaders(20)
+            await get_slot_leaders(210)
+        finally:
+            leader_schedules.max_epochs = max_epochs
+        self.assertEqual(leader_schedules.stats()["epochs"], [0, 2])
+
+        await get_slot_leaders(30)
+        self.assertEqual(self.schedule_fetches(), [0, 100, 200])
+
+    async def test_current_slot_and_missing_schedule(self):
+        """Test defaults to the current slot and reports schedules that are not available"""
+        current = await get_leader_schedule()
+        missing = await get_leader_schedule(350)
+        invalid = await get_slot_leaders(0, 0)
+
+        self.assertEqual(sorted(current.schedule), ["validator1-0", "validator1-1", "validator1-2"])
+        self.assertEqual(missing.status, "success")
+        self.assertIsNone(missing.schedule)
+        self.assertEqual(invalid.status, "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Tests for the indexed cluster-node directory
+"""
+import asyncio
+import unittest
+from app.core.rpc import set_rpc_client
+from app.services.nodes import NodeDirectory, node_directory
+from app.services.solana import find_cluster_nodes, get_cluster_node_changes, get_cluster_node_versions, get_cluster_nodes
+from tests.helpers import mock_rpc_client
+
+
+def make_node(n, version="2.0.15", feature_set=607245837):
+    return {
+        "pubkey": f"node{n}",
+        "gossip": f"10.0.0.{n}:8001",
+        "tpu": f"10.0.0.{n}:8003",
+        "rpc": f"10.0.0.{n}:8899" if n % 2 == 0 else None,
+        "version": version,
+        "featureSet": feature_set,
+        "shredVersion": 50093
+    }
+
+
+class ClusterNodesHandler:
+    """Answers getClusterNodes with whatever node list the test has set"""
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    def __call__(self, payload):
+        return {"jsonrpc": "2.0", "result": self.nodes, "id": payload["id"]}
+
+
+class TestNodeDirectory(unittest.IsolatedAsyncioTestCase):
+    """Tests for lookups, counts and incremental changes"""
+
+    async def asyncSetUp(self):
+        node_directory.clear()
+        node_directory.interval = 10
+        self.requests = []
+        nodes = [make_node(n) for n in range(6)] + [make_node(n, "1.18.26", 3469865029) for n in range(6, 10)]
+        nodes.append(make_node(10, None, None))
+        self.handler = ClusterNodesHandler(nodes)
+        set_rpc_client(mock_rpc_client(self.handler, self.requests))
+
+    async def asyncTearDown(self):
+        node_directory.clear()
+        set_rpc_client(None)
+
+    async def test_lookups_are_served_from_the_indexes(self):
+        """Test lookups by pubkey, version and feature set without refetching"""
+        by_pubkey = await find_cluster_nodes(["node3", "missing"], fields=["tpu"])
+        by_version = await find_cluster_nodes(version="1.18.26", limit=3)
+        combined = await find_cluster_nodes(version="2.0.15", feature_set=3469865029)
+        everything = await get_cluster_nodes()
+
+        self.assertEqual(by_pubkey.nodes[0].model_dump(exclude_none=True), {"pubkey": "node3", "tpu": "10.0.0.3:8003"})
+        self.assertEqual(by_pubkey.missing, ["missing"])
+        self.assertEqual([node.pubkey for node in by_version.nodes], ["node6", "node7", "node8"])
+        self.assertEqual(combined.nodes, [])
+        self.assertEqual(len(everything.nodes), 11)
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_versions_are_counted(self):
+        """Test version and feature set histograms, largest group first"""
+        versions = await get_cluster_node_versions()
+        feature_sets = await get_cluster_node_versions("featureSet")
+
+        self.assertEqual(versions.total, 11)
+        self.assertEqual([(g.version, g.count) for g in versions.groups], [("2.0.15", 6), ("1.18.26", 4), (None, 1)])
+        self.assertEqual([(g.featureSet, g.count) for g in feature_sets.groups], [(607245837, 6), (3469865029, 4), (None, 1)])
+        self.assertEqual((await get_cluster_node_versions("rpc")).status, "error")
+
+    async def test_refreshes_report_only_changes(self):
+        """Test that consumers holding a revision receive only the nodes that changed"""
+        first = await get_cluster_node_changes()
+        self.assertTrue(first.resync)
+        self.assertEqual(len(first.nodes), 11)
+
+        upgraded = make_node(7, "2.0.15", 607245837)
+        self.handler.nodes = [node for node in self.handler.nodes if node["pubkey"] not in ("node1", "node7")]
+        self.handler.nodes += [upgraded, make_node(11)]
+        diff = await node_directory.refresh()
+        self.assertEqual(sorted(diff["added"]), ["node11"])
+        self.assertEqual(diff["removed"], ["node1"])
+        self.assertEqual(diff["changed"], ["node7"])
+
+        changes = await get_cluster_node_changes(first.revision)
+        self.assertFalse(changes.resync)
+        self.assertEqual([node.pubkey for node in changes.nodes], ["node11", "node7"])
+        self.assertEqual(changes.removed, ["node1"])
+        self.assertEqual(changes.revision, first.revision + 1)
+
+        # An unchanged refresh does not create a revision
+        await node_directory.refresh()
+        unchanged = await get_cluster_node_changes(changes.revision)
+        self.assertEqual((unchanged.revision, unchanged.nodes, unchanged.removed), (changes.revision, [], []))
+
+        counts = dict((g.version, g.count) for g in (await get_cluster_node_versions()).groups)
+        self.assertEqual(counts, {"2.0.15": 7, "1.18.26": 3, None: 1})
+
+    async def test_old_revisions_resync(self):
+        """Test that revisions beyond the kept history return the full directory"""
+        await get_cluster_nodes()
+        for n in range(100):
+            self.handler.nodes = self.handler.nodes + [make_node(100 + n)]
+            await node_directory.refresh()
+
+        changes = await get_cluster_node_changes(1)
+        self.assertTrue(changes.resync)
+        self.assertEqual(len(changes.nodes), 111)
+
+    async def test_without_history_every_revision_resyncs(self):
+        """Test that a directory keeping no history answers older revisions with a resync"""
+        directory = NodeDirectory(interval=10, history=0)
+        await directory.refresh()
+        self.handler.nodes = self.handler.nodes + [make_node(11)]
+        await directory.refresh()
+
+        self.assertEqual(directory.revision, 2)
+        self.assertIsNone(directory.changes_since(1))
+        self.assertEqual(directory.changes_since(2), ([], []))
+        directory.clear()
+
+    async def test_directory_is_refreshed_in_the_background(self):
+        """Test that the background refresh picks up changes without a read"""
+        node_directory.interval = 0.03
+        await get_cluster_nodes()
+        self.handler.nodes = self.handler.nodes + [make_node(11)]
+
+        await asyncio.sleep(0.1)
+        self.assertIsNotNone(node_directory.node("node11"))
+        self.assertGreaterEqual(len(self.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
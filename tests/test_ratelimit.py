@@ -0,0 +1,143 @@
+"""
+Tests for client-side rate limiting and adaptive concurrency
+"""
+import asyncio
+import time
+import unittest
+import httpx
+from app.core.ratelimit import AdaptiveConcurrencyLimit, TokenBucket, method_class
+from app.core.rpc import SolanaRpcClient, set_rpc_client
+from app.services.solana import get_program_accounts, get_solana_balance
+from tests.helpers import mock_rpc_client
+
+
+def handler(payload):
+    return {"jsonrpc": "2.0", "result": {"context": {"slot": 1}, "value": 1}, "id": payload["id"]}
+
+
+class TestTokenBucket(unittest.IsolatedAsyncioTestCase):
+    """Tests for token bucket pacing"""
+
+    async def test_acquire_paces_to_rate(self):
+        """Test that requests beyond the burst are spread out at the configured rate"""
+        bucket = TokenBucket(rate=100, burst=1)
+
+        start = time.monotonic()
+        for _ in range(11):
+            await bucket.acquire()
+        elapsed = time.monotonic() - start
+
+        self.assertGreaterEqual(elapsed, 0.09)
+        self.assertLess(elapsed, 0.3)
+
+
+class TestAdaptiveConcurrencyLimit(unittest.IsolatedAsyncioTestCase):
+    """Tests for AIMD concurrency adjustment"""
+
+    async def test_throttling_halves_limit_and_success_grows_it(self):
+        """Test multiplicative decrease on 429 and additive increase on success"""
+        limit = AdaptiveConcurrencyLimit(initial=8)
+
+        await limit.acquire()
+        limit.release(throttled=True)
+        self.assertEqual(limit.limit, 4)
+
+        for _ in range(4):
+            await limit.acquire()
+            limit.release(0.01)
+        self.assertAlmostEqual(limit.limit, 5, delta=0.1)
+
+    async def test_rising_latency_reduces_limit(self):
+        """Test that a sustained latency increase counts as overload"""
+        limit = AdaptiveConcurrencyLimit(initial=16)
+        for _ in range(50):
+            await limit.acquire()
+            limit.release(0.01)
+        grown = limit.limit
+
+        for _ in range(10):
+            await limit.acquire()
+            limit.release(0.2)
+
+        self.assertLess(limit.limit, grown / 2 + 1)
+        self.assertGreaterEqual(limit.decreases, 1)
+
+    async def test_acquire_waits_for_a_free_slot(self):
+        """Test that callers beyond the limit wait until a slot is released"""
+        limit = AdaptiveConcurrencyLimit(initial=1)
+        await limit.acquire()
+
+        waiter = asyncio.ensure_future(limit.acquire())
+        await asyncio.sleep(0.01)
+        self.assertFalse(waiter.done())
+
+        limit.release(0.01)
+        await asyncio.wait_for(waiter, 1)
+        self.assertEqual(limit.inflight, 1)
+
+
+class TestClientLimits(unittest.IsolatedAsyncioTestCase):
+    """Tests for limits applied by the RPC client"""
+
+    def tearDown(self):
+        set_rpc_client(None)
+
+    def test_heavy_methods_are_classified(self):
+        """Test that expensive methods get their own budget"""
+        self.assertEqual(method_class("getProgramAccounts"), "heavy")
+        self.assertEqual(method_class("getBlock"), "heavy")
+        self.assertEqual(method_class("getBalance"), "light")
+
+    async def test_heavy_budget_does_not_slow_light_calls(self):
+        """Test that a tight heavy-method rate limit leaves light methods unaffected"""
+        client = mock_rpc_client(handler, heavy_rate_limit=2, batch_window_ms=0)
+        set_rpc_client(client)
+
+        await get_program_accounts("program1")
+        await get_program_accounts("program2")
+        heavy = asyncio.ensure_future(get_program_accounts("program3"))
+
+        start = time.monotonic()
+        for n in range(20):
+            await get_solana_balance(f"address{n}")
+        self.assertLess(time.monotonic() - start, 0.2)
+        self.assertFalse(heavy.done())
+
+        await heavy
+        self.assertGreaterEqual(time.monotonic() - start, 0.4)
+
+    async def test_429_backs_off(self):
+        """Test that throttled responses shrink the concurrency limit and honour Retry-After"""
+        throttle = True
+
+        def respond(request):
+            if throttle:
+                return httpx.Response(429, headers={"Retry-After": "0.2"})
+            return httpx.Response(200, json=handler({"id": 1}))
+
+        client = SolanaRpcClient(
+            url="http://rpc.test",
+            health_interval=0,
+            batch_window_ms=0,
+            rate_limit=50,
+            initial_concurrency=8,
+            max_retries=0,
+            transport=httpx.MockTransport(respond)
+        )
+        set_rpc_client(client)
+
+        result = await get_solana_balance("address")
+        self.assertEqual(result.status, "error")
+        limits = client.stats()["limits"]["http://rpc.test"]
+        self.assertEqual(limits["throttled"], 1)
+        self.assertEqual(limits["light"]["limit"], 4)
+
+        throttle = False
+        start = time.monotonic()
+        result = await get_solana_balance("address2")
+        self.assertEqual(result.status, "success")
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Tests for the offline rent-exemption calculator
+"""
+import asyncio
+import unittest
+from unittest.mock import patch
+from app.core.rpc import set_rpc_client
+from app.services.rent import RENT_SYSVAR_ID, rent_cache
+from app.services.solana import get_minimum_balance_for_rent_exemption, get_rent_exempt_minimums
+from tests.helpers import mock_rpc_client
+
+# Rent sysvar data on mainnet-beta: 3480 lamports per byte-year, threshold 2.0, 50% burned
+RENT_DATA = "mA0AAAAAAAAAAAAAAAAAQDI="
+
+# Well-known getMinimumBalanceForRentExemption results on mainnet-beta
+# (system account, SPL mint, SPL token account and a 200 byte account)
+RPC_MINIMUMS = {0: 890880, 82: 1461600, 165: 2039280, 200: 2282880}
+
+SIZES = list(RPC_MINIMUMS) + list(range(1, 10 * 1024 * 1024, 104729))
+
+
+def rpc_minimum(size):
+    """The RPC node's answer: recorded where known, otherwise the exact integer formula"""
+    return RPC_MINIMUMS.get(size, (128 + size) * 3480 * 2)
+
+
+def handler(payload, slot=1000):
+    method = payload["method"]
+    if method == "getAccountInfo":
+        assert payload["params"][0] == RENT_SYSVAR_ID
+        result = {
+            "context": {"slot": slot},
+            "value": {"data": [RENT_DATA, "base64"], "executable": False, "lamports": 1009200, "owner": "Sysvar1111111111111111111111111111111111111", "rentEpoch": 0, "space": 17}
+        }
+    elif method == "getEpochSchedule":
+        result = {"slotsPerEpoch": 432000, "leaderScheduleSlotOffset": 432000, "warmup": False, "firstNormalEpoch": 0, "firstNormalSlot": 0}
+    elif method == "getMinimumBalanceForRentExemption":
+        result = rpc_minimum(payload["params"][0])
+    else:
+        result = None
+    return {"jsonrpc": "2.0", "result": result, "id": payload["id"]}
+
+
+class TestRentCalculator(unittest.IsolatedAsyncioTestCase):
+    """Tests for rent-exempt minimums computed from the Rent sysvar"""
+
+    async def asyncSetUp(self):
+        rent_cache.clear()
+        self.requests = []
+
+    async def asyncTearDown(self):
+        rent_cache.clear()
+        set_rpc_client(None)
+
+    def methods(self):
+        return [item["method"] for body in self.requests for item in (body if isinstance(body, list) else [body])]
+
+    async def test_local_minimums_match_rpc(self):
+        """Test that local results equal the RPC node's across a range of sizes"""
+        client = mock_rpc_client(handler, self.requests)
+        set_rpc_client(client)
+
+        local = await get_rent_exempt_minimums(SIZES)
+        for minimum in local.minimums:
+            remote = await client.request("getMinimumBalanceForRentExemption", [minimum.dataSize])
+            self.assertEqual(minimum.lamports, remote["result"], minimum.dataSize)
+        self.assertEqual(local.rent, {"lamportsPerByteYear": 3480, "exemptionThreshold": 2.0, "burnPercent": 50})
+
+    async def test_sysvar_is_read_once_for_many_sizes(self):
+        """Test that single and batch lookups share one read of the sysvar"""
+        set_rpc_client(mock_rpc_client(handler, self.requests, cache_max_bytes=0))
+
+        single = await get_minimum_balance_for_rent_exemption(165)
+        batch = await get_rent_exempt_minimums(list(range(0, 10000, 10)))
+
+        self.assertEqual(single.lamports, 2039280)
+        self.assertEqual(len(batch.minimums), 1000)
+        self.assertEqual(self.methods().count("getAccountInfo"), 1)
+        self.assertEqual(rent_cache.fetches, 1)
+
+    async def test_sysvar_is_read_again_after_the_epoch_ends(self):
+        """Test that the parameters expire at the estimated epoch boundary"""
+        set_rpc_client(mock_rpc_client(lambda payload: handler(payload, slot=431998), self.requests, cache_max_bytes=0))
+
+        with patch("app.services.rent.SLOT_SECONDS", 0.01):
+            await get_minimum_balance_for_rent_exemption(0)
+            await get_minimum_balance_for_rent_exemption(0)
+            self.assertEqual(rent_cache.fetches, 1)
+            await asyncio.sleep(0.03)
+            await get_minimum_balance_for_rent_exemption(0)
+        self.assertEqual(rent_cache.fetches, 2)
+
+    async def test_negative_size_is_rejected(self):
+        """Test input validation"""
+        result = await get_rent_exempt_minimums([10, -1])
+        self.assertEqual(result.status, "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
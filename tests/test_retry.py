@@ -0,0 +1,159 @@
+"""
+Tests for deadlines, per-method timeouts and retries
+"""
+import asyncio
+import time
+import unittest
+import httpx
+from app.core.retry import RetryPolicy, rpc_deadline
+from app.core.rpc import SolanaRpcClient, set_rpc_client
+from app.services.solana import get_solana_balance
+from tests.helpers import StandInRpcServer
+
+
+def balance(payload):
+    return {"jsonrpc": "2.0", "result": {"context": {"slot": 1}, "value": 1}, "id": payload["id"]}
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Tests for retry classification and backoff"""
+
+    def test_only_transient_failures_are_retryable(self):
+        """Test that connection resets, 429, 5xx and node-behind errors are retried"""
+        request = httpx.Request("POST", "http://rpc.test")
+        policy = RetryPolicy()
+
+        def status_error(status):
+            return httpx.HTTPStatusError("", request=request, response=httpx.Response(status, request=request))
+
+        self.assertTrue(policy.retryable_error(httpx.ConnectError("reset", request=request)))
+        self.assertTrue(policy.retryable_error(status_error(429)))
+        self.assertTrue(policy.retryable_error(status_error(503)))
+        self.assertFalse(policy.retryable_error(status_error(400)))
+        self.assertFalse(policy.retryable_error(httpx.ReadTimeout("slow", request=request)))
+        self.assertTrue(policy.retryable_response({"error": {"code": -32005, "message": "Node is behind"}}))
+        self.assertFalse(policy.retryable_response({"error": {"code": -32602, "message": "Invalid params"}}))
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test that backoff stays below an exponentially growing cap"""
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.5)
+        delays = [policy.backoff(3) for _ in range(200)]
+        self.assertTrue(all(0 <= d <= 0.4 for d in delays))
+        self.assertGreater(len(set(delays)), 100)
+        self.assertTrue(all(policy.backoff(10) <= 0.5 for _ in range(50)))
+
+
+class TestRetries(unittest.IsolatedAsyncioTestCase):
+    """Tests for retries and deadlines in the RPC client"""
+
+    def tearDown(self):
+        set_rpc_client(None)
+
+    def make_client(self, respond, **kwargs):
+        kwargs.setdefault("url", "http://rpc.test")
+        client = SolanaRpcClient(
+            health_interval=0,
+            batch_window_ms=0,
+            retry_base_delay=0.01,
+            transport=httpx.MockTransport(respond),
+            **kwargs
+        )
+        set_rpc_client(client)
+        return client
+
+    async def test_server_error_is_retried(self):
+        """Test that a 5xx response is retried until it succeeds"""
+        attempts = []
+
+        def respond(request):
+            attempts.append(request)
+            if len(attempts) < 3:
+                return httpx.Response(503)
+            return httpx.Response(200, json=balance({"id": 1}))
+
+        client = self.make_client(respond)
+        result = await get_solana_balance("address")
+
+        self.assertEqual(result.status, "success")
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(client.stats()["retries"]["retries"], 2)
+
+    async def test_client_error_is_not_retried(self):
+        """Test that non-retryable failures are reported immediately"""
+        attempts = []
+
+        def respond(request):
+            attempts.append(request)
+            return httpx.Response(400)
+
+        self.make_client(respond)
+        result = await get_solana_balance("address")
+
+        self.assertEqual(result.status, "error")
+        self.assertEqual(len(attempts), 1)
+
+    async def test_node_behind_fails_over_to_another_endpoint(self):
+        """Test that a node-behind error is retried on a different endpoint"""
+        hosts = []
+
+        def respond(request):
+            hosts.append(request.url.host)
+            if request.url.host == "behind.test":
+                return httpx.Response(200, json={
+                    "jsonrpc": "2.0",
+                    "error": {"code": -32005, "message": "Node is behind by 120 slots"},
+                    "id": 1
+                })
+            return httpx.Response(200, json=balance({"id": 1}))
+
+        self.make_client(respond, url=None, urls=["http://behind.test", "http://ok.test"], hedge_methods=[])
+        for n in range(5):
+            result = await get_solana_balance(f"address{n}")
+            self.assertEqual(result.status, "success")
+
+        self.assertEqual(hosts.count("ok.test"), 5)
+        self.assertLessEqual(hosts.count("behind.test"), 5)
+
+    async def test_caller_deadline_bounds_the_request(self):
+        """Test that a caller deadline cuts a hung request short"""
+        async def respond(request):
+            await asyncio.sleep(1)
+            return httpx.Response(200, json=balance({"id": 1}))
+
+        self.make_client(respond)
+        start = time.monotonic()
+        with rpc_deadline(0.1):
+            result = await get_solana_balance("address")
+
+        self.assertEqual(result.status, "error")
+        self.assertIn("deadline", result.message)
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    async def test_method_timeout_applies_to_transport(self):
+        """Test that per-method timeouts reach the HTTP request"""
+        server = StandInRpcServer(0.5, balance).start()
+        try:
+            client = SolanaRpcClient(
+                url=server.url,
+                health_interval=0,
+                batch_window_ms=0,
+                method_timeouts={"getBalance": 0.05}
+            )
+            set_rpc_client(client)
+            self.assertEqual(client.method_timeout("getBalance"), 0.05)
+            self.assertEqual(client.method_timeout("getEpochInfo"), client.timeout)
+
+            start = time.monotonic()
+            result = await get_solana_balance("address")
+            elapsed = time.monotonic() - start
+            await client.aclose()
+        finally:
+            server.stop()
+
+        self.assertEqual(result.status, "error")
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(server.requests, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
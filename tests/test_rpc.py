@@ -0,0 +1,188 @@
+"""
+Tests for the Solana RPC transport
+"""
+import asyncio
+import unittest
+import httpx
+from app.core.rpc import SolanaRpcClient, set_rpc_client
+from app.core.singleflight import SingleFlight, canonical_key
+from app.services.solana import get_solana_balance, get_block_time, get_block, get_epoch_info, get_rpc_stats
+from tests.helpers import mock_rpc_client
+
+
+class TestSolanaRpcClient(unittest.IsolatedAsyncioTestCase):
+    """Tests for the shared RPC transport"""
+
+    def tearDown(self):
+        set_rpc_client(None)
+
+    async def test_requests_share_one_client_with_unique_ids(self):
+        """Test that calls reuse the pooled client and get distinct request ids"""
+        seen_ids = []
+
+        def handler(payload):
+            seen_ids.append(payload["id"])
+            return {"jsonrpc": "2.0", "result": {"value": 1}, "id": payload["id"]}
+
+        client = mock_rpc_client(handler)
+        set_rpc_client(client)
+
+        await get_solana_balance("a")
+        pooled = client.client
+        await get_solana_balance("b")
+
+        self.assertIs(client.client, pooled)
+        self.assertEqual(len(set(seen_ids)), 2)
+
+    async def test_http_error_is_reported(self):
+        """Test that HTTP failures surface as error responses"""
+        client = SolanaRpcClient(
+            url="http://rpc.test",
+            health_interval=0,
+            transport=httpx.MockTransport(lambda request: httpx.Response(503))
+        )
+        set_rpc_client(client)
+
+        result = await get_solana_balance("test_address")
+
+        self.assertEqual(result.status, "error")
+        self.assertIn("503", result.message)
+
+
+class TestRpcBatching(unittest.IsolatedAsyncioTestCase):
+    """Tests for JSON-RPC micro-batching"""
+
+    def tearDown(self):
+        set_rpc_client(None)
+
+    @staticmethod
+    def handler(payload):
+        if payload["method"] == "getBalance":
+            # Echo the address length so each caller can check it got its own answer
+            result = {"context": {"slot": 1}, "value": len(payload["params"][0])}
+        elif payload["method"] == "getBlockTime":
+            result = 1700000000 + payload["params"][0]
+        else:
+            result = None
+        return {"jsonrpc": "2.0", "result": result, "id": payload["id"]}
+
+    async def test_concurrent_calls_share_one_batch(self):
+        """Test that concurrent calls are sent as one batch and routed back by id"""
+        requests = []
+        set_rpc_client(mock_rpc_client(self.handler, requests, batch_window_ms=5))
+
+        addresses = ["a" * n for n in range(1, 21)]
+        results = await asyncio.gather(
+            *(get_solana_balance(address) for address in addresses),
+            get_block_time(7)
+        )
+
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(len(requests[0]), 21)
+        self.assertEqual(len({payload["id"] for payload in requests[0]}), 21)
+        self.assertEqual([r.balance_lamports for r in results[:20]], list(range(1, 21)))
+        self.assertEqual(results[20].blockTime, 1700000007)
+
+    async def test_batch_is_split_at_max_size(self):
+        """Test that a full batch is sent without waiting for the window"""
+        requests = []
+        set_rpc_client(mock_rpc_client(self.handler, requests, batch_window_ms=5, batch_max_size=8))
+
+        await asyncio.gather(*(get_solana_balance(f"address{n}") for n in range(20)))
+
+        self.assertEqual([len(batch) for batch in requests], [8, 8, 4])
+
+    async def test_heavy_methods_are_not_batched(self):
+        """Test that methods outside the batch set are posted on their own"""
+        requests = []
+        set_rpc_client(mock_rpc_client(self.handler, requests, batch_window_ms=5))
+
+        await asyncio.gather(get_block(1), get_block(2))
+
+        self.assertEqual(len(requests), 2)
+        self.assertTrue(all(isinstance(body, dict) for body in requests))
+
+    async def test_batch_rejected_as_a_whole(self):
+        """Test that a single error object for a batch is delivered to every caller"""
+        client = SolanaRpcClient(
+            url="http://rpc.test",
+            health_interval=0,
+            batch_window_ms=5,
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json={
+                "jsonrpc": "2.0",
+                "error": {"code": -32600, "message": "Invalid request"},
+                "id": None
+            }))
+        )
+        set_rpc_client(client)
+
+        results = await asyncio.gather(get_solana_balance("a"), get_solana_balance("b"))
+
+        self.assertTrue(all(r.status == "error" for r in results))
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    """Tests for coalescing of identical in-flight requests"""
+
+    def tearDown(self):
+        set_rpc_client(None)
+
+    def test_canonical_key_ignores_config_key_order(self):
+        """Test that config objects with reordered keys produce the same key"""
+        a = canonical_key("getBlock", [1, {"encoding": "json", "rewards": False}])
+        b = canonical_key("getBlock", [1, {"rewards": False, "encoding": "json"}])
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, canonical_key("getBlock", [2, {"encoding": "json", "rewards": False}]))
+
+    async def test_identical_calls_share_one_request(self):
+        """Test that concurrent identical calls are sent upstream once"""
+        requests = []
+        set_rpc_client(mock_rpc_client(lambda payload: {
+            "jsonrpc": "2.0",
+            "result": {"blockhash": "abc", "parentSlot": 1, "transactions": []},
+            "id": payload["id"]
+        }, requests))
+
+        results = await asyncio.gather(*(get_block(42) for _ in range(10)), get_block(43))
+
+        self.assertEqual(len(requests), 2)
+        self.assertTrue(all(r.blockhash == "abc" for r in results))
+        stats = (await get_rpc_stats()).stats["singleflight"]
+        self.assertEqual(stats["calls"], 11)
+        self.assertEqual(stats["saved"], 9)
+
+    async def test_errors_are_shared_and_not_remembered(self):
+        """Test that a failure reaches every waiter and the next call goes upstream again"""
+        requests = []
+        set_rpc_client(mock_rpc_client(lambda payload: {
+            "jsonrpc": "2.0",
+            "error": {"code": -32602, "message": "Invalid params"},
+            "id": payload["id"]
+        }, requests, batch_window_ms=0))
+
+        results = await asyncio.gather(*(get_epoch_info() for _ in range(5)))
+        await get_epoch_info()
+
+        self.assertTrue(all(r.status == "error" for r in results))
+        self.assertEqual(len(requests), 2)
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test that cancelling one waiter leaves the shared call running"""
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("key", call))
+        second = asyncio.ensure_future(flight.do("key", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        self.assertEqual(await second, "done")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,246 @@
+"""
+Tests for the index of slots with a finalized block
+"""
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from app.core.rpc import set_rpc_client
+from app.services.slots import PAGE_SLOTS, SlotIndex, skipped_slots, slot_index, slot_runs
+from app.services.solana import get_blocks, get_blocks_with_limit, get_skip_rate, is_slot_skipped
+from tests.helpers import mock_rpc_client
+
+FINALIZED_SLOT = 3_000_000
+
+
+def has_block(slot):
+    """Slots divisible by 5 are skipped, and so is every slot from 1,000 to 1,019"""
+    return slot % 5 != 0 and not 1000 <= slot < 1020
+
+
+class SlotsHandler:
+    """Answers getBlocks up to the finalized slot, or up to its own when it is behind, and from its first available block on"""
+
+    def __init__(self):
+        self.finalized = FINALIZED_SLOT
+        self.behind = None
+        self.first_available = 0
+
+    def __call__(self, payload):
+        method = payload["method"]
+        if method == "getSlot":
+            result = self.finalized
+        elif method == "getFirstAvailableBlock":
+            result = self.first_available
+        elif method == "getBlocks":
+            start, end = payload["params"][:2]
+            start = max(start, self.first_available)
+            end = min(end, self.behind if self.behind is not None else end)
+            result = [slot for slot in range(start, end + 1) if has_block(slot)]
+        else:
+            start, limit = payload["params"][:2]
+            start = max(start, self.first_available)
+            result = []
+            slot = start
+            while len(result) < limit:
+                if has_block(slot):
+                    result.append(slot)
+                slot += 1
+        return {"jsonrpc": "2.0", "result": result, "id": payload["id"]}
+
+
+class TestSlotIndex(unittest.IsolatedAsyncioTestCase):
+    """Tests for the bitset, its spans and its persistence"""
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "slots.sqlite3")
+
+    async def asyncTearDown(self):
+        self.directory.cleanup()
+
+    async def test_spans_merge_and_gaps_are_reported(self):
+        """Test that overlapping and adjacent spans merge and the rest is missing"""
+        index = SlotIndex("")
+        await index.record(100, 199, [])
+        await index.record(300, 399, [])
+        self.assertEqual(index.missing(0, 500), [(0, 99), (200, 299), (400, 500)])
+
+        await index.record(200, 299, [])
+        await index.record(390, 450, [])
+        self.assertEqual(index.missing(0, 500), [(0, 99), (451, 500)])
+        self.assertEqual(index.indexed_through(150), 450)
+        self.assertEqual(index.stats()["spans"], 1)
+
+    async def test_blocks_and_counts_across_pages(self):
+        """Test reads of ranges that cross page boundaries and start mid-byte"""
+        first, last = PAGE_SLOTS - 1003, 2 * PAGE_SLOTS + 997
+        blocks = [slot for slot in range(first, last + 1) if has_block(slot)]
+        index = SlotIndex("")
+        await index.record(first, last, blocks)
+
+        for start, end in [(first, last), (PAGE_SLOTS - 3, PAGE_SLOTS + 3), (first + 5, first + 5), (2 * PAGE_SLOTS + 1, last)]:
+            expected = [slot for slot in blocks if start <= slot <= end]
+            self.assertEqual(index.blocks(start, end), expected)
+            self.assertEqual(index.count(start, end), len(expected))
+        self.assertEqual(index.has_block(PAGE_SLOTS + 1), True)
+        self.assertEqual(index.has_block(PAGE_SLOTS + 4), False)
+        self.assertIsNone(index.has_block(last + 1))
+
+    async def test_index_survives_a_restart(self):
+        """Test that spans and bits are read back from the database"""
+        index = SlotIndex(self.path)
+        await index.record(10, 2000, [slot for slot in range(10, 2001) if has_block(slot)])
+        index.close()
+
+        reopened = SlotIndex(self.path)
+        self.assertEqual(reopened.missing(0, 3000), [(0, 9), (2001, 3000)])
+        self.assertEqual(reopened.count(10, 2000), len([slot for slot in range(10, 2001) if has_block(slot)]))
+        self.assertFalse(reopened.has_block(1005))
+
+    async def test_database_is_used_off_the_event_loop(self):
+        """Test that pages and spans are read and written on the worker thread"""
+        index = SlotIndex(self.path)
+        await index.record(10, 2000, [slot for slot in range(10, 2001) if has_block(slot)])
+        index.close()
+
+        threads = []
+        reopened = SlotIndex(self.path)
+
+        def record(call):
+            def wrapper(*args):
+                threads.append(threading.current_thread())
+                return call(*args)
+            return wrapper
+
+        with patch.object(reopened, "_read_pages", record(reopened._read_pages)), \
+                patch.object(reopened, "_save", record(reopened._save)):
+            await reopened.load(10, 2000)
+            await reopened.record(2001, 3000, [slot for slot in range(2001, 3001) if has_block(slot)])
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.current_thread(), threads)
+        self.assertEqual(reopened.missing(0, 3000), [(0, 9)])
+        self.assertEqual(reopened.count(10, 3000), len([slot for slot in range(10, 3001) if has_block(slot)]))
+        reopened.close()
+
+    def test_runs_and_skipped_slots(self):
+        """Test the compact description of a slot list"""
+        runs = slot_runs([3, 4, 5, 7, 10, 11])
+        self.assertEqual(runs, [[3, 5], [7, 7], [10, 11]])
+        self.assertEqual(skipped_slots(runs), [6, 8, 9])
+        self.assertEqual(slot_runs([]), [])
+
+
+class TestIndexedBlocks(unittest.IsolatedAsyncioTestCase):
+    """Tests for the services answered from the slot index"""
+
+    async def asyncSetUp(self):
+        self.handler = SlotsHandler()
+        self.requests = []
+        set_rpc_client(mock_rpc_client(self.handler, self.requests, batch_window_ms=0, cache_max_bytes=0))
+        self.directory = tempfile.TemporaryDirectory()
+        slot_index.open(os.path.join(self.directory.name, "slots.sqlite3"))
+
+    async def asyncTearDown(self):
+        set_rpc_client(None)
+        slot_index.close()
+        self.directory.cleanup()
+
+    def getblocks(self):
+        return [body["params"][:2] for body in self.requests if body["method"] == "getBlocks"]
+
+    async def test_repeat_queries_are_answered_locally(self):
+        """Test that ranges are fetched once and then served from the index, also after a restart"""
+        first = await get_blocks(500, 5000)
+        self.assertEqual(first.blocks, [slot for slot in range(500, 5001) if has_block(slot)])
+        self.assertEqual(self.getblocks(), [[500, 5064]])
+
+        inner = await get_blocks(900, 1100, "confirmed")
+        slot_index.close()
+        again = await get_blocks(500, 5000)
+        self.assertEqual(inner.blocks, [slot for slot in range(900, 1101) if has_block(slot)])
+        self.assertEqual(again.blocks, first.blocks)
+        self.assertEqual(len(self.getblocks()), 1)
+
+        # Only the part that is not indexed yet is fetched
+        await get_blocks(4000, 6000)
+        self.assertEqual(self.getblocks()[-1], [5065, 6064])
+
+    async def test_compact_output(self):
+        """Test runs of consecutive blocks with the skipped slots between them"""
+        result = await get_blocks(996, 1026, compact=True)
+
+        self.assertIsNone(result.blocks)
+        self.assertEqual(result.runs, [[996, 999], [1021, 1024], [1026, 1026]])
+        self.assertEqual(result.skipped, list(range(1000, 1021)) + [1025])
+        self.assertEqual(result.blockCount, 9)
+
+    async def test_slots_above_the_finalized_slot_are_not_indexed(self):
+        """Test that confirmed slots, and finalized ones after the last finalized block, are fetched on every call"""
+        await get_blocks(FINALIZED_SLOT - 100, FINALIZED_SLOT + 100, "confirmed")
+        await get_blocks(FINALIZED_SLOT - 100, FINALIZED_SLOT + 100, "confirmed")
+
+        # The finalized slot itself is skipped, so nothing after 2,999,999 is certain yet
+        self.assertEqual(self.getblocks(), [
+            [FINALIZED_SLOT - 100, FINALIZED_SLOT],
+            [FINALIZED_SLOT, FINALIZED_SLOT + 100],
+            [FINALIZED_SLOT, FINALIZED_SLOT],
+            [FINALIZED_SLOT, FINALIZED_SLOT + 100]
+        ])
+        self.assertEqual(slot_index.indexed_through(FINALIZED_SLOT - 100), FINALIZED_SLOT - 1)
+
+    async def test_a_node_that_is_behind_is_trusted_up_to_its_last_block(self):
+        """Test that slots after the last block a lagging node returned stay unindexed"""
+        self.handler.behind = 2000
+        await get_blocks(0, 3000)
+        self.assertEqual(slot_index.indexed_through(0), 1999)
+
+        self.handler.behind = None
+        result = await get_skip_rate(1000, 2999)
+        self.assertEqual(self.getblocks()[-1], [2000, 3063])
+        self.assertEqual((result.slots, result.skipped), (2000, 20 + 396))
+
+    async def test_slots_before_a_pruned_ledger_are_not_indexed(self):
+        """Test that the slots before a node's first available block are not recorded as skipped"""
+        self.handler.first_available = 2001
+        await get_blocks(1500, 3000)
+        await get_blocks_with_limit(1200, 10)
+        self.assertIsNone(slot_index.has_block(1501))
+        self.assertIsNone(slot_index.has_block(1201))
+        self.assertEqual(slot_index.missing(1000, 3000), [(1000, 2000)])
+
+        # A node with the full history fills the rest in
+        self.handler.first_available = 0
+        result = await get_skip_rate(1500, 3000)
+        self.assertEqual(self.getblocks()[-1], [1500, 2064])
+        self.assertEqual(result.blocks, len([slot for slot in range(1500, 3001) if has_block(slot)]))
+
+    async def test_skipped_slot_lookups(self):
+        """Test skipped-slot lookups and skip rates"""
+        self.assertTrue((await is_slot_skipped(1010)).skipped)
+        self.assertFalse((await is_slot_skipped(1021)).skipped)
+        self.assertTrue((await is_slot_skipped(1025)).skipped)
+        self.assertEqual(len(self.getblocks()), 1)
+
+        result = await get_skip_rate(1000, 1099)
+        self.assertEqual((result.blocks, result.skipped, result.skipRate), (64, 36, 0.36))
+
+        unknown = await is_slot_skipped(FINALIZED_SLOT + 10)
+        self.assertIsNone(unknown.skipped)
+        self.assertIn("not finalized", unknown.message)
+
+    async def test_limits_are_served_from_the_index(self):
+        """Test that finalized getBlocksWithLimit results are indexed and reused"""
+        first = await get_blocks_with_limit(990, 50)
+        second = await get_blocks_with_limit(995, 20, compact=True)
+
+        # Slot 990 is skipped, so the node's ledger start is checked before it is recorded
+        self.assertEqual([body["method"] for body in self.requests], ["getBlocksWithLimit", "getFirstAvailableBlock"])
+        self.assertEqual(second.runs[0], [996, 999])
+        self.assertEqual(second.blockCount, 20)
+        self.assertEqual(first.blocks[-1], slot_index.indexed_through(990))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,60 +1,116 @@
 """
 Tests for Solana service
 """
+import json
 import unittest
-from unittest.mock import patch, MagicMock
-from app.services.solana import get_solana_balance
+from app.core.rpc import set_rpc_client
+from app.services.solana import get_block, get_multiple_accounts, get_program_accounts, get_solana_balance
+from tests.helpers import mock_rpc_client
 
 
-class TestSolanaService(unittest.TestCase):
+class TestSolanaService(unittest.IsolatedAsyncioTestCase):
     """Tests for the Solana blockchain service"""
-    
-    @patch('app.services.solana.requests.post')
-    def test_get_solana_balance_success(self, mock_post):
+
+    def tearDown(self):
+        set_rpc_client(None)
+
+    async def test_get_solana_balance_success(self):
         """Test successful balance retrieval"""
         # Mock the response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
+        set_rpc_client(mock_rpc_client(lambda payload: {
             "jsonrpc": "2.0",
             "result": {
                 "context": {"slot": 123456789},
                 "value": 123000000000  # 123 SOL in lamports
             },
-            "id": 1
-        }
-        mock_post.return_value = mock_response
-        
+            "id": payload["id"]
+        }))
+
         # Call the function
-        result = get_solana_balance("test_address")
-        
+        result = await get_solana_balance("test_address")
+
         # Assertions
         self.assertEqual(result.status, "success")
         self.assertEqual(result.address, "test_address")
         self.assertEqual(result.balance_lamports, 123000000000)
         self.assertEqual(result.balance_sol, 123.0)
-    
-    @patch('app.services.solana.requests.post')
-    def test_get_solana_balance_error(self, mock_post):
+
+    async def test_get_solana_balance_error(self):
         """Test error handling in balance retrieval"""
         # Mock the response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
+        set_rpc_client(mock_rpc_client(lambda payload: {
             "jsonrpc": "2.0",
             "error": {
                 "code": -32602,
                 "message": "Invalid param: Invalid"
             },
-            "id": 1
-        }
-        mock_post.return_value = mock_response
-        
+            "id": payload["id"]
+        }))
+
         # Call the function
-        result = get_solana_balance("invalid_address")
-        
+        result = await get_solana_balance("invalid_address")
+
         # Assertions
         self.assertEqual(result.status, "error")
         self.assertTrue("RPC error" in result.message)
 
 
+def program_account(n):
+    account = {"data": ["AAAA", "base64"], "executable": False, "lamports": n, "owner": "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA", "rentEpoch": 18446744073709551615}
+    if n % 2:
+        account["space"] = 3
+    return {"pubkey": f"account{n}", "account": account}
+
+
+class TestLargeResponses(unittest.IsolatedAsyncioTestCase):
+    """Tests for responses built from whole result lists"""
+
+    def tearDown(self):
+        set_rpc_client(None)
+
+    def answer(self, result):
+        set_rpc_client(mock_rpc_client(lambda payload: {"jsonrpc": "2.0", "result": result, "id": payload["id"]}, cache_max_bytes=0))
+
+    async def test_program_accounts_are_validated_as_a_list(self):
+        """Test that every account is validated, with a missing size read as 0"""
+        self.answer([program_account(n) for n in range(50)])
+        result = await get_program_accounts("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA")
+
+        self.assertEqual(result.status, "success")
+        self.assertEqual(len(result.accounts), 50)
+        self.assertEqual((result.accounts[7].pubkey, result.accounts[7].account.lamports), ("account7", 7))
+        self.assertEqual([result.accounts[n].account.space for n in (0, 1)], [0, 3])
+
+        # JSON text from the compiled serializer carries the same data as the dict
+        self.assertEqual(json.loads(result.model_dump_json(exclude_none=True)), result.model_dump(exclude_none=True))
+
+    async def test_malformed_accounts_are_rejected(self):
+        """Test that validation still catches a malformed result"""
+        accounts = [program_account(n) for n in range(5)]
+        accounts[3]["account"]["lamports"] = "many"
+        self.answer(accounts)
+        result = await get_program_accounts("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA")
+
+        self.assertEqual(result.status, "error")
+        self.assertIn("3.account.lamports", result.message)
+
+    async def test_missing_accounts_stay_null(self):
+        """Test that accounts that do not exist are returned as null"""
+        self.answer({"context": {"slot": 10}, "value": [None, program_account(1)["account"]]})
+        result = await get_multiple_accounts(["missing", "account1"])
+
+        self.assertIsNone(result.value[0])
+        self.assertEqual(result.value[1].space, 3)
+
+    async def test_legacy_transactions_are_accepted(self):
+        """Test that blocks with legacy and versioned transactions both parse"""
+        transaction = {"meta": {"err": None, "fee": 5000, "preBalances": [1], "postBalances": [1]}, "transaction": {"signatures": ["sig"]}}
+        self.answer({"blockhash": "hash", "transactions": [dict(transaction, version="legacy"), dict(transaction, version=0)]})
+        result = await get_block(100, max_supported_transaction_version=0)
+
+        self.assertEqual(result.status, "success")
+        self.assertEqual([tx.version for tx in result.transactions], ["legacy", 0])
+
+
 if __name__ == "__main__":
-    unittest.main() 
\ No newline at end of file
+    unittest.main()
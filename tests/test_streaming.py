@@ -0,0 +1,268 @@
+"""
+Tests for streamed program account scans
+"""
+import json
+import os
+import random
+import tempfile
+import tracemalloc
+import unittest
+import httpx
+from unittest.mock import patch
+from app.core.jsonstream import JsonArrayStream
+from app.core.rpc import SolanaRpcClient, set_rpc_client
+from app.models.solana import SolanaTransactionInBlock
+from app.services.solana import get_block, stream_program_accounts
+from app.services.streaming import (
+    ACCOUNT_FIELDS,
+    VOTE_PROGRAM_ID,
+    AggregateSink,
+    FileSink,
+    ResponseSink,
+    account_predicate,
+    is_failed_transaction,
+    is_vote_transaction,
+    unknown_fields,
+    untouched_by
+)
+from tests.helpers import StandInRpcServer
+
+
+def make_account(n):
+    return {
+        "pubkey": f"account{n}",
+        "account": {
+            "data": ["AQIDBAUGBwgJ" * 8, "base64"],
+            "executable": False,
+            "lamports": n * 1000,
+            "owner": "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA",
+            "rentEpoch": 361,
+            "space": 165
+        }
+    }
+
+
+def program_accounts(payload):
+    return {"jsonrpc": "2.0", "result": [make_account(n) for n in range(1, 201)], "id": payload["id"]}
+
+
+def make_transaction(n, program, err=None):
+    return {
+        "meta": {"err": err, "fee": 5000, "preBalances": [10, 0], "postBalances": [5, 5]},
+        "transaction": {
+            "signatures": [f"signature{n}"],
+            "message": {
+                "accountKeys": [f"payer{n}", program],
+                "instructions": [{"programIdIndex": 1, "accounts": [0], "data": "3Bxs"}]
+            }
+        }
+    }
+
+
+def block(payload):
+    transactions = [make_transaction(n, VOTE_PROGRAM_ID) for n in range(90)]
+    transactions += [make_transaction(n, "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA") for n in range(90, 97)]
+    transactions += [make_transaction(n, "ComputeBudget111111111111111111111111111111", err={"InstructionError": [0, "Custom"]}) for n in range(97, 100)]
+    return {
+        "jsonrpc": "2.0",
+        "result": {
+            "blockHeight": 1000,
+            "blockTime": 1700000000,
+            "blockhash": "hash",
+            "parentSlot": 1999,
+            "previousBlockhash": "parent",
+            "transactions": transactions,
+            "rewards": []
+        },
+        "id": payload["id"]
+    }
+
+
+class TestJsonArrayStream(unittest.TestCase):
+    """Tests for the incremental JSON parser"""
+
+    def parse(self, document, chunk_size):
+        raw = json.dumps(document).encode()
+        parser = JsonArrayStream([("result",), ("result", "value")])
+        items = []
+        for start in range(0, len(raw), chunk_size):
+            items.extend(parser.feed(raw[start:start + chunk_size]))
+        items.extend(parser.finish())
+        return items, parser.close()
+
+    def test_elements_match_full_parse_for_any_chunking(self):
+        """Test that elements and the remaining document survive arbitrary chunk boundaries"""
+        accounts = [make_account(1), 12.5e-3, {"pubkey": 'quote " and \\\\ [brackets] {braces},', "account": {"data": {"parsed": [1, [2]]}}}]
+        document = {"jsonrpc": "2.0", "result": {"context": {"slot": 5}, "value": accounts}, "id": 7}
+        for chunk_size in (1, 2, 3, 7, 64, 100000):
+            items, rest = self.parse(document, chunk_size)
+            self.assertEqual(items, accounts)
+            self.assertEqual(rest, {"jsonrpc": "2.0", "result": {"context": {"slot": 5}, "value": []}, "id": 7})
+
+    def test_error_response_has_no_elements(self):
+        """Test that an error response is returned whole"""
+        document = {"jsonrpc": "2.0", "error": {"code": -32010, "message": "excluded from secondary indexes"}, "id": 1}
+        items, rest = self.parse(document, random.randint(1, 10))
+        self.assertEqual(items, [])
+        self.assertEqual(rest, document)
+
+    def test_incomplete_document_is_rejected(self):
+        """Test that a truncated body is reported on close"""
+        parser = JsonArrayStream([("result",)])
+        parser.feed(b'{"jsonrpc":"2.0","result":[{"a":1},{"b":')
+        parser.finish()
+        with self.assertRaises(ValueError):
+            parser.close()
+
+
+class TestStreamProgramAccounts(unittest.IsolatedAsyncioTestCase):
+    """Tests for streaming into sinks against a local stand-in RPC server"""
+
+    async def asyncSetUp(self):
+        self.server = StandInRpcServer(0.0, program_accounts, compress=True).start()
+        self.client = SolanaRpcClient(url=self.server.url, health_interval=0)
+        set_rpc_client(self.client)
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+        set_rpc_client(None)
+        self.server.stop()
+
+    async def test_response_sink_filters_projects_and_truncates(self):
+        """Test that the response sink keeps projected matches up to its limit"""
+        sink = ResponseSink(limit=10, fields=["pubkey", "lamports"])
+        result = await stream_program_accounts("program", sink, predicate=account_predicate(min_lamports=150000))
+
+        self.assertEqual(result.status, "success")
+        self.assertEqual(result.scanned, 200)
+        self.assertEqual(result.matched, 51)
+        self.assertTrue(result.truncated)
+        self.assertEqual(result.accounts[0], {"pubkey": "account150", "lamports": 150000})
+        self.assertEqual(len(result.accounts), 10)
+
+    async def test_file_sink_writes_json_lines(self):
+        """Test that the file sink writes one projected account per line"""
+        with tempfile.TemporaryDirectory() as directory:
+            sink = FileSink("../accounts.jsonl", ["pubkey"], directory=directory)
+            result = await stream_program_accounts("program", sink)
+
+            self.assertEqual(result.path, os.path.join(directory, "accounts.jsonl"))
+            with open(result.path) as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 200)
+        self.assertEqual(lines[-1], {"pubkey": "account200"})
+
+    async def test_unknown_account_fields_are_reported(self):
+        """Test that fields outside ACCOUNT_FIELDS are named in the error"""
+        self.assertIsNone(unknown_fields(["pubkey", "lamports"], ACCOUNT_FIELDS, "account"))
+        self.assertIsNone(unknown_fields(None, ACCOUNT_FIELDS, "account"))
+        self.assertEqual(
+            unknown_fields(["pubkey", "balance"], ACCOUNT_FIELDS, "account"),
+            f"Unknown account fields: balance; expected any of {', '.join(ACCOUNT_FIELDS)}"
+        )
+
+    async def test_aggregate_sink_totals(self):
+        """Test that the aggregate sink sums matching accounts"""
+        result = await stream_program_accounts("program", AggregateSink(), predicate=account_predicate(max_lamports=10000))
+
+        self.assertEqual(result.aggregate, {
+            "count": 10,
+            "total_lamports": 55000,
+            "total_space": 1650,
+            "min_lamports": 1000,
+            "max_lamports": 10000
+        })
+
+
+class TestFilteredBlocks(unittest.IsolatedAsyncioTestCase):
+    """Tests for dropping block transactions while the block is streamed"""
+
+    async def asyncSetUp(self):
+        self.server = StandInRpcServer(0.0, block).start()
+        self.client = SolanaRpcClient(url=self.server.url, health_interval=0)
+        set_rpc_client(self.client)
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+        set_rpc_client(None)
+        self.server.stop()
+
+    def test_vote_detection_across_encodings(self):
+        """Test vote detection for json, jsonParsed and accounts transaction forms"""
+        self.assertTrue(is_vote_transaction(make_transaction(1, VOTE_PROGRAM_ID)))
+        self.assertFalse(is_vote_transaction(make_transaction(1, "Other111")))
+        parsed = {"transaction": {"message": {
+            "accountKeys": [{"pubkey": "payer"}, {"pubkey": VOTE_PROGRAM_ID}],
+            "instructions": [{"programId": VOTE_PROGRAM_ID, "parsed": {}}]
+        }}}
+        self.assertTrue(is_vote_transaction(parsed))
+        accounts = {"transaction": {"signatures": ["s"], "accountKeys": [{"pubkey": VOTE_PROGRAM_ID}]}}
+        self.assertTrue(is_vote_transaction(accounts))
+        self.assertFalse(is_vote_transaction({"transaction": ["AAAA", "base64"]}))
+
+    async def test_votes_are_dropped_before_models_are_built(self):
+        """Test that only kept transactions become models"""
+        with patch("app.services.solana.SolanaTransactionInBlock", wraps=SolanaTransactionInBlock) as model:
+            result = await get_block(2000, exclude_votes=True)
+
+        self.assertEqual(result.status, "success")
+        self.assertEqual(result.blockhash, "hash")
+        self.assertEqual(result.transactionCount, 100)
+        self.assertEqual(result.droppedTransactions, 90)
+        self.assertEqual(len(result.transactions), 10)
+        self.assertEqual(model.call_count, 10)
+
+    async def test_caller_predicates_drop_transactions(self):
+        """Test that caller-supplied predicates drop matching transactions"""
+        result = await get_block(
+            2000,
+            exclude_votes=True,
+            exclude=[is_failed_transaction, untouched_by(["TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"])]
+        )
+
+        self.assertEqual(len(result.transactions), 7)
+        self.assertEqual(result.transactions[0].transaction["signatures"], ["signature90"])
+
+    async def test_unfiltered_block_is_unchanged(self):
+        """Test that get_block without filters returns every transaction"""
+        result = await get_block(2000)
+
+        self.assertEqual(len(result.transactions), 100)
+        self.assertIsNone(result.droppedTransactions)
+
+
+class TestStreamingMemory(unittest.IsolatedAsyncioTestCase):
+    """Tests that peak memory does not grow with the result size"""
+
+    async def test_peak_memory_is_bounded(self):
+        """Test that a large response is scanned without holding it in memory"""
+        count = 20000
+
+        async def body():
+            yield b'{"jsonrpc":"2.0","result":['
+            for n in range(count):
+                yield (b"," if n else b"") + json.dumps(make_account(n)).encode()
+            yield b'],"id":1}'
+
+        client = SolanaRpcClient(
+            url="http://rpc.test",
+            health_interval=0,
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body()))
+        )
+        set_rpc_client(client)
+        try:
+            tracemalloc.start()
+            result = await stream_program_accounts("program", AggregateSink())
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            await client.aclose()
+            set_rpc_client(None)
+
+        size = len(json.dumps(make_account(0))) * count
+        self.assertEqual(result.aggregate["count"], count)
+        self.assertLess(peak, size / 10)
+
+
+if __name__ == "__main__":
+    unittest.main()